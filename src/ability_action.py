@@ -4,9 +4,9 @@ from tools.ability_names import AbilityTypeName
 from tools.custom_exceptions import AbstractMethodCallError
 from tools.decision_tools import *
 
-@dataclass
+@dataclass(frozen=True)
 class AbilityAction():
-  """Abstract base class for all ability actions.
+  """Abstract base class for all ability actions. Ability actions are immutable, so the same instance can be shared between every entity using the ability (see `GameData.get_ability_actions`).
   
   Subclasses of `ParryAction`, `IgniteAction`, `DefendAction`, `WeakenAction`, `HealAction` and `PierceAction`."""
   initial_duration: Optional[int]
@@ -31,7 +31,7 @@ class AbilityAction():
 
   def calculate_offensiveness(self) -> float: raise AbstractMethodCallError(AbilityAction.__name__, self.calculate_offensiveness.__name__)
 
-@dataclass
+@dataclass(frozen=True)
 class IgniteAction(AbilityAction):
   """Ignites the target, dealing a set amount of damage for a set amount of turns."""
   is_unique: bool = True
@@ -42,7 +42,7 @@ class IgniteAction(AbilityAction):
   def calculate_offensiveness(self) -> float:
     return DecisionMakingConstants.IGNITE_OFFENSIVENESS
 
-@dataclass
+@dataclass(frozen=True)
 class PierceAction(AbilityAction):
   """Pierce attacks will ignore parries."""
   is_unique: bool = True
@@ -53,7 +53,7 @@ class PierceAction(AbilityAction):
   def calculate_offensiveness(self) -> float:
     return DecisionMakingConstants.PIERCE_OFFENSIVENESS
 
-@dataclass
+@dataclass(frozen=True)
 class ParryAction(AbilityAction):
   damage_threshold: float = 0
   reflection_proportion: float = 0
@@ -85,7 +85,7 @@ class ParryAction(AbilityAction):
 
     return (target_damage, reflected_damage)
 
-@dataclass
+@dataclass(frozen=True)
 class DefendAction(AbilityAction):
   """Increases damage resistance."""
   resistance: float = 0
@@ -98,7 +98,7 @@ class DefendAction(AbilityAction):
   def calculate_offensiveness(self) -> float:
     return calculate_damage_resistance_aggressiveness(-1*self.resistance, False)
 
-@dataclass
+@dataclass(frozen=True)
 class WeakenAction(AbilityAction):
   """Increases damage vulnerability (inverse of `DefendAction`)."""
   vulnerability: float = 0
@@ -111,7 +111,7 @@ class WeakenAction(AbilityAction):
   def calculate_offensiveness(self) -> float:
     return calculate_damage_resistance_aggressiveness(self.vulnerability, False)
 
-@dataclass
+@dataclass(frozen=True)
 class HealAction(AbilityAction):
   initial_duration: Optional[int] = 1
   is_unique: bool = False
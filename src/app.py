@@ -6,7 +6,7 @@ from tools.custom_exceptions import QuitInterrupt
 
 from tools.logging_tools import * # required for `Loggable`
 
-from database.condition import Condition
+from database.condition import *
 
 from interface.interface import Interface
 from interface.combat_screen import CombatScreen
@@ -17,7 +17,17 @@ from combat_management.combat_manager import CombatManager
 from stored.world import World
 from stored.entities.character import Character
 from stored.items.storage import Storage
+from stored.items.storage_item import StorageItem
 from stored.items.inventory_item import InventoryItem
+from stored.items.item import Item
+from stored.items.weapon import Weapon
+from stored.items.equipable import Equipable
+from stored.entities.enemy import Enemy
+from stored.abilities.ability import Ability
+from stored.abilities.parry_ability import ParryAbility
+from stored.abilities.statistic_ability import StatisticAbility
+from stored.abilities.item_ability import ItemAbility
+from stored.abilities.enemy_ability import EnemyAbility
 
 class App(Loggable):
   def __init__(self, is_dev_mode_enabled: bool = Constants.IS_DEV_MODE, is_logging_enabled: bool = False, tag: Optional[str] = "App", include_call_stack: bool = False) -> None:
@@ -63,6 +73,7 @@ class App(Loggable):
     character_name: str = self.game_data.get_active_character_name()
     self.game_data.equipped_weapon_identifiers = []
     self.interface.update_character_name(character_name)
+    self.game_data.prefetch([World, Storage, StorageItem, InventoryItem, Item, Weapon, Equipable]) # needed once a world is selected
     self.show_screen(ScreenName.WORLD_SELECTION)
 
   def initialise_new_character_items(self) -> None:
@@ -91,7 +102,7 @@ class App(Loggable):
   def select_world(self, world_identifier: int) -> None:
     self.game_data.active_world_id = world_identifier
     # selecting relevant storages (1 for home, 1 for away)
-    find_world_storages: Callable[[StorageType], Condition] = lambda storage_type: lambda _, row: row[0] == world_identifier and row[1] == storage_type
+    find_world_storages: Callable[[StorageType], Condition] = lambda storage_type: Eq("WorldID", world_identifier) & Eq("StorageType", storage_type)
     # storage at home
     home_storages: dict[int, Storage] = self.game_data.select_from_storage(self.game_data.storages, find_world_storages(StorageType.HOME))
     if len(home_storages) != 1: raise Exception(f"{home_storages=} should have 1 element; {len(home_storages)} were found.")
@@ -102,6 +113,7 @@ class App(Loggable):
     self.game_data.away_storage = list(away_storages.keys())[0]
     world_name: str = self.game_data.get_active_world_name()
     self.interface.update_world_name(world_name)
+    self.game_data.prefetch([Enemy, EnemyAbility, Ability, ParryAbility, StatisticAbility, ItemAbility]) # needed for combat
     self.go_home()
 
   def go_home(self, screen_name: ScreenName = ScreenName.HOME, **kwargs) -> None:
@@ -168,6 +180,7 @@ class App(Loggable):
 
   def leave_structure(self, screen_name: ScreenName = ScreenName.EXPLORATION) -> None:
     self.game_data.finish_structure_encounter()
+    self.game_data.save(checkpoint=False) # autosave; cheap, as only the journal is written
     self.show_screen(screen_name)
 
   def save(self) -> None:
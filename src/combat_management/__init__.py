@@ -1,5 +1,10 @@
-__all__ = ["active_effect", "combat_manager", "effect_manager"]
+__all__ = ["active_effect", "balance_simulation", "combat_engine", "combat_manager", "combat_observer", "effect_manager", "effect_store", "player_policy"]
 
 from . import active_effect
+from . import balance_simulation
+from . import combat_engine
 from . import combat_manager
-from . import effect_manager
\ No newline at end of file
+from . import combat_observer
+from . import effect_manager
+from . import effect_store
+from . import player_policy
\ No newline at end of file
@@ -13,13 +13,18 @@ def is_turns_valid(turns_remaining: Optional[int]) -> bool:
 @dataclass
 class ActiveEffect:
   """
-  :param turns_remaining: `None` if permanent, otherwise is a non-negative integer.
-  :type turns_remaining: Optional[int]
+  An effect applied to a fighting entity, held in the entity's `EffectStore`. Rather than counting down its remaining turns, the turn of the store at which it finishes is kept, so that none of the effects have to be changed as the turns pass.
+
+  :param expiry_turn: The turn of its `EffectStore` at which the effect finishes. `None` if permanent.
+  :type expiry_turn: Optional[int]
   :param effect_ability: The ability which is being applied.
   :type effect_ability: AbilityAction
+  :param number: Identifies the effect within its `EffectStore`, counting up in the order the effects were added. Defaults to `0`.
+  :type number: int
   """
-  turns_remaining: Optional[int]
+  expiry_turn: Optional[int]
   effect_ability: AbilityAction
+  number: int = 0
 
   # built-in methods
 
@@ -28,16 +33,17 @@ class ActiveEffect:
 
   # other
 
-  def is_no_turns_remaining(self) -> bool:
-    if self.turns_remaining == 0: return True
-    return False
-  
   def is_permanent(self) -> bool:
-    if self.turns_remaining == None: return True
+    if self.expiry_turn == None: return True
     return False
 
-  def decrement_remaining_turns(self) -> None:
-    if self.turns_remaining == None: raise ValueError(f"Cannot decrement `self.turns_remaining` when it is `None`.")
-    decremented_turns_remaining: int = self.turns_remaining - 1
-    if not is_turns_valid(decremented_turns_remaining): raise InvalidTurnsError(decremented_turns_remaining)
-    self.turns_remaining = decremented_turns_remaining
+  def get_turns_remaining(self, turn: int) -> Optional[int]:
+    """`None` if permanent."""
+    if self.expiry_turn == None: return None
+    turns_remaining: int = self.expiry_turn - turn
+    if not is_turns_valid(turns_remaining): raise InvalidTurnsError(turns_remaining)
+    return turns_remaining
+
+  def is_finished(self, turn: int) -> bool:
+    if self.expiry_turn == None: return False
+    return self.expiry_turn <= turn
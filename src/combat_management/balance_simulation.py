@@ -0,0 +1,265 @@
+from tools.constants import *
+from tools.typing_tools import *
+from tools.generation_tools import random
+
+import csv
+import json
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
+import game_data as gd
+
+from stored.entities.character import Character
+from stored.items.inventory_item import InventoryItem
+
+from data_structures.action_type import *
+from combat_action import CombatAction
+
+from combat_management.combat_engine import CombatEngine
+from combat_management.combat_observer import CombatObserver
+from combat_management.player_policy import GreedyPlayerPolicy
+
+@dataclass(frozen=True)
+class Loadout:
+  """
+  What the character takes into each simulated combat, and who they fight.
+
+  :param weapon_ids: The `WeaponID` of each equipped weapon.
+  :type weapon_ids: tuple[int, ...]
+  :param equipable_ids: The `EquipableID` of each equipped equipable.
+  :type equipable_ids: tuple[int, ...]
+  :param enemy_ids: The `EnemyID` of each enemy fought, which may repeat. Defaults to `None`, in which case each combat is a random encounter, as generated in the game.
+  :type enemy_ids: Optional[tuple[int, ...]]
+  """
+  weapon_ids: tuple[int, ...]
+  equipable_ids: tuple[int, ...] = ()
+  enemy_ids: Optional[tuple[int, ...]] = None
+
+@dataclass
+class LoadoutStatistics:
+  """
+  The totals of the combats simulated with a `Loadout`. Totals, rather than means, are kept so that the statistics of separately simulated combats can be combined with `merge`.
+
+  :param loadout: The loadout the combats were simulated with.
+  :type loadout: Loadout
+  :param name: A readable description of the loadout, using the names of the items and enemies.
+  :type name: str
+  :param total_health_lost: The sum of the character's net health lost over each round (after any healing in the same round).
+  :type total_health_lost: float
+  :param action_counts: How many times the character chose each type of action, by class name.
+  :type action_counts: dict[str, int]
+  :param ability_counts: How many times each type of ability was used in the character's attacks, by class name.
+  :type ability_counts: dict[str, int]
+  """
+  loadout: Loadout
+  name: str
+  combat_count: int = 0
+  win_count: int = 0
+  total_rounds: int = 0
+  total_health_lost: float = 0
+  action_counts: dict[str, int] = field(default_factory=dict)
+  ability_counts: dict[str, int] = field(default_factory=dict)
+
+  @property
+  def win_rate(self) -> float:
+    if self.combat_count == 0: return 0
+    return self.win_count / self.combat_count
+
+  @property
+  def mean_rounds(self) -> float:
+    if self.combat_count == 0: return 0
+    return self.total_rounds / self.combat_count
+
+  @property
+  def mean_health_lost(self) -> float:
+    if self.combat_count == 0: return 0
+    return self.total_health_lost / self.combat_count
+
+  def record_combat(self, character_won: bool, round_count: int) -> None:
+    self.combat_count += 1
+    if character_won: self.win_count += 1
+    self.total_rounds += round_count
+
+  def merge(self, other: "LoadoutStatistics") -> None:
+    """Adds the totals of `other`, which must have been simulated with the same loadout."""
+    if other.loadout != self.loadout: raise ValueError(f"Cannot merge the statistics of different loadouts ({self.loadout=}, {other.loadout=}).")
+    self.combat_count += other.combat_count
+    self.win_count += other.win_count
+    self.total_rounds += other.total_rounds
+    self.total_health_lost += other.total_health_lost
+    for (action_name, count) in other.action_counts.items(): self.action_counts[action_name] = self.action_counts.get(action_name, 0) + count
+    for (ability_name, count) in other.ability_counts.items(): self.ability_counts[ability_name] = self.ability_counts.get(ability_name, 0) + count
+
+  def to_row(self) -> dict[str, Any]:
+    """The statistics as a mapping, written as a single row (or line) of the output. The action and ability counts are mappings themselves, which are written as JSON within CSV."""
+    return {
+      "loadout": self.name,
+      "weapon_ids": " ".join(map(str, self.loadout.weapon_ids)),
+      "equipable_ids": " ".join(map(str, self.loadout.equipable_ids)),
+      "enemy_ids": "random" if self.loadout.enemy_ids == None else " ".join(map(str, self.loadout.enemy_ids)),
+      "combats": self.combat_count,
+      "win_rate": round(self.win_rate, 4),
+      "mean_rounds": round(self.mean_rounds, 3),
+      "mean_health_lost": round(self.mean_health_lost, 3),
+      "actions": dict(sorted(self.action_counts.items())),
+      "abilities": dict(sorted(self.ability_counts.items())),
+    }
+
+class SimulationObserver(CombatObserver):
+  """Adds the health lost and the actions chosen in each observed combat to `statistics`."""
+  def __init__(self, game_data: gd.GameData, statistics: LoadoutStatistics) -> None:
+    self.game_data = game_data
+    self.statistics: LoadoutStatistics = statistics
+    self.previous_health: Optional[float] = None
+
+  def on_combat_begin(self) -> None:
+    self.previous_health = None
+
+  def on_character_state_changed(self) -> None:
+    health: float = self.game_data.get_active_character().health
+    if self.previous_health != None and health < self.previous_health:
+      self.statistics.total_health_lost += self.previous_health - health
+    self.previous_health = health
+
+  def on_character_action_chosen(self, action: CombatAction) -> None:
+    action_counts: dict[str, int] = self.statistics.action_counts
+    action_name: str = type(action.action_type).__name__
+    action_counts[action_name] = action_counts.get(action_name, 0) + 1
+    if not isinstance(action.action_type, Attack): return None
+    ability_counts: dict[str, int] = self.statistics.ability_counts
+    for ability_action in action.action_type.effects:
+      ability_name: str = type(ability_action).__name__
+      ability_counts[ability_name] = ability_counts.get(ability_name, 0) + 1
+
+# setting up the game data
+
+worker_game_data: Optional[gd.GameData] = None
+"The game data of the current process, created once by `init_worker` and reused for every combat it simulates."
+
+def create_simulation_game_data() -> gd.GameData:
+  """Creates game data holding the default data and a single character, in memory only: nothing is read from or written to the save data."""
+  game_data = gd.GameData()
+  game_data.save_on_delete = False
+  game_data.database.save_on_delete = False
+  game_data.database.init_tables(game_data.table_templates)
+  game_data.load_default_data()
+  max_health: float = Character.get_default_max_health()
+  (character_id, _) = game_data.insert_stored(Character, [0, "Simulated Character", max_health, max_health], StorageAttrName.CHARACTERS)
+  game_data.active_character_id = character_id
+  return game_data
+
+def init_worker() -> None:
+  """Loads the static tables once for each process of the pool, rather than once for each task."""
+  global worker_game_data
+  worker_game_data = create_simulation_game_data()
+
+def get_worker_game_data() -> gd.GameData:
+  if worker_game_data == None: init_worker()
+  return unpack_optional(worker_game_data)
+
+def describe_loadout(game_data: gd.GameData, loadout: Loadout) -> str:
+  item_names: list[str] = [game_data.items[game_data.weapons[weapon_id].item_id].name for weapon_id in loadout.weapon_ids]
+  item_names += [game_data.items[game_data.equipables[equipable_id].item_id].name for equipable_id in loadout.equipable_ids]
+  if loadout.enemy_ids == None: return f"{', '.join(item_names)} vs random encounters"
+  enemy_names: list[str] = [game_data.enemies[enemy_id].name for enemy_id in loadout.enemy_ids]
+  return f"{', '.join(item_names)} vs {', '.join(enemy_names)}"
+
+def equip_loadout(game_data: gd.GameData, loadout: Loadout) -> None:
+  """Replaces the active character's inventory with the items of `loadout`, all equipped."""
+  character_id: int = unpack_optional(game_data.active_character_id)
+  game_data.delete_many_stored(InventoryItem, list(game_data.get_character_inventory_items(character_id).keys()), StorageAttrName.INVENTORY_ITEMS)
+  item_ids: list[int] = [game_data.weapons[weapon_id].item_id for weapon_id in loadout.weapon_ids]
+  item_ids += [game_data.equipables[equipable_id].item_id for equipable_id in loadout.equipable_ids]
+  game_data.insert_many_stored(InventoryItem, [[character_id, item_id, 1, True] for item_id in item_ids], StorageAttrName.INVENTORY_ITEMS)
+  game_data.equipped_weapon_identifiers = list(loadout.weapon_ids)
+
+# simulating combats
+
+def simulate_combats(loadout: Loadout, combat_indexes: range, seed: int, max_rounds: int) -> LoadoutStatistics:
+  """
+  Simulates the combats of `loadout` numbered `combat_indexes`, with the character's actions chosen by `GreedyPlayerPolicy`. Run within the processes of the pool.
+
+  The random state is seeded from `seed`, the loadout and the index before each combat, so each combat plays out the same regardless of which process simulates it or what it simulated beforehand.
+  """
+  game_data: gd.GameData = get_worker_game_data()
+  equip_loadout(game_data, loadout)
+  statistics = LoadoutStatistics(loadout, describe_loadout(game_data, loadout))
+  engine = CombatEngine(game_data, GreedyPlayerPolicy(), SimulationObserver(game_data, statistics), max_rounds)
+  for combat_index in combat_indexes:
+    random.seed(f"{seed}:{loadout}:{combat_index}")
+    game_data.fighting_enemy_graph.init_storage() # the order of the free positions depends on the previous combats, so is reset for them to be placed the same
+    if loadout.enemy_ids == None: game_data.generate_fighting_enemies()
+    else: game_data.add_fighting_enemies(list(loadout.enemy_ids))
+    character_won: bool = engine.run()
+    statistics.record_combat(character_won, engine.round_number - Constants.MIN_ROUND_NUMBER)
+    game_data.finish_combat_encounter()
+  return statistics
+
+def get_loadouts(game_data: gd.GameData, enemy_compositions: list[Optional[tuple[int, ...]]] = [None]) -> list[Loadout]:
+  """
+  Every loadout of a single weapon with at most one equipable, against each of `enemy_compositions`.
+
+  :param enemy_compositions: Each tuple holds the `EnemyID` of every enemy in the combat; `None` stands for random encounters. Defaults to `[None]`.
+  :type enemy_compositions: list[Optional[tuple[int, ...]]]
+  """
+  equipable_options: list[tuple[int, ...]] = [()] + [(equipable_id,) for equipable_id in game_data.equipables.keys()]
+  return [Loadout((weapon_id,), equipable_ids, enemy_ids) for weapon_id in game_data.weapons.keys() for equipable_ids in equipable_options for enemy_ids in enemy_compositions]
+
+def run_simulation(loadouts: list[Loadout], combat_count: int, seed: int = 0, worker_count: Optional[int] = None, chunk_size: int = 100, max_rounds: int = 100) -> Iterator[LoadoutStatistics]:
+  """
+  Simulates `combat_count` combats of each loadout across a pool of `worker_count` processes. Each loadout's combats are split into chunks of at most `chunk_size`, so that the work stays balanced across the pool.
+
+  The statistics of each loadout are yielded as soon as all of its chunks have finished, so they can be written out while the rest are still being simulated; the loadouts may therefore be yielded out of order. The chunks of each loadout are merged in order, so the results only depend on `seed`.
+
+  :param worker_count: The number of processes. Defaults to `None`, in which case there is one for each CPU. If `1`, the combats are simulated in this process instead.
+  :type worker_count: Optional[int]
+  :param max_rounds: The number of rounds after which a combat is counted as a loss. Defaults to `100`.
+  :type max_rounds: int
+  """
+  chunks: list[range] = [range(start, min(start+chunk_size, combat_count)) for start in range(0, combat_count, chunk_size)]
+  if worker_count == 1:
+    for loadout in loadouts:
+      statistics = LoadoutStatistics(loadout, "")
+      for chunk in chunks:
+        chunk_statistics: LoadoutStatistics = simulate_combats(loadout, chunk, seed, max_rounds)
+        statistics.name = chunk_statistics.name
+        statistics.merge(chunk_statistics)
+      yield statistics
+    return None
+  with ProcessPoolExecutor(worker_count, initializer=init_worker) as executor:
+    futures: dict[Future[LoadoutStatistics], tuple[Loadout, int]] = {}
+    for loadout in loadouts:
+      for (chunk_index, chunk) in enumerate(chunks):
+        futures[executor.submit(simulate_combats, loadout, chunk, seed, max_rounds)] = (loadout, chunk_index)
+    finished_chunks: dict[Loadout, dict[int, LoadoutStatistics]] = {}
+    for future in as_completed(futures):
+      (loadout, chunk_index) = futures[future]
+      loadout_chunks: dict[int, LoadoutStatistics] = finished_chunks.setdefault(loadout, {})
+      loadout_chunks[chunk_index] = future.result()
+      if len(loadout_chunks) < len(chunks): continue
+      del finished_chunks[loadout]
+      statistics = LoadoutStatistics(loadout, loadout_chunks[0].name)
+      for chunk_index in range(len(chunks)): statistics.merge(loadout_chunks[chunk_index])
+      yield statistics
+
+def write_statistics(statistics: Iterable[LoadoutStatistics], path: str) -> int:
+  """
+  Writes each loadout's statistics to `path` as it arrives: as CSV, or as JSON Lines if `path` ends with `.json` or `.jsonl`.
+
+  :return: The number of loadouts written.
+  :rtype: int
+  """
+  is_json: bool = path.endswith(".json") or path.endswith(".jsonl")
+  count: int = 0
+  with open(path, "w", newline="") as file:
+    writer: Optional[csv.DictWriter] = None
+    for loadout_statistics in statistics:
+      row: dict[str, Any] = loadout_statistics.to_row()
+      if is_json: file.write(json.dumps(row) + "\n")
+      else:
+        if writer == None:
+          writer = csv.DictWriter(file, fieldnames=list(row.keys()))
+          writer.writeheader()
+        writer.writerow({key: json.dumps(value) if isinstance(value, dict) else value for (key, value) in row.items()})
+      file.flush()
+      count += 1
+  return count
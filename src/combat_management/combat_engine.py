@@ -0,0 +1,421 @@
+from tools.constants import *
+from tools.typing_tools import *
+from tools.custom_exceptions import *
+
+import game_data as gd
+
+from stored.entities.character import Character
+from stored.entities.fighting_enemy import FightingEnemy, choose_wave_action_names
+from stored.entities.fighting_entity import FightingEntity
+
+from stored.items.weapon import Weapon
+from stored.abilities.ability import Ability
+from stored.abilities.parry_ability import ParryAbility
+
+from data_structures.action_type import *
+from combat_action import CombatAction
+from data_structures.entity_type import *
+from data_structures.queue import Queue
+
+from combat_management.effect_manager import EffectManager
+from combat_management.combat_observer import CombatObserver
+from combat_management.player_policy import PlayerPolicy
+
+class CombatEngine:
+  """
+  Runs a combat between the active character and the fighting enemies of `game_data`, without depending on any interface. The character's actions are chosen by `player_policy` and every event is reported to `observer`, so the same engine drives both the combat screen (see `CombatManager`) and simulated combats.
+
+  :param game_data: Holds the active character, their equipped weapons, and the fighting enemies on the grid.
+  :type game_data: GameData
+  :param player_policy: Chooses each of the character's actions.
+  :type player_policy: PlayerPolicy
+  :param observer: Receives the events of the combat. Defaults to `None`, in which case the events are ignored.
+  :type observer: Optional[CombatObserver]
+  :param max_rounds: The number of rounds after which the combat is stopped and counted as a loss, so that simulated combats which neither side can win still end. Defaults to `None`, in which case there is no limit.
+  :type max_rounds: Optional[int]
+  """
+  def __init__(self, game_data: gd.GameData, player_policy: PlayerPolicy, observer: Optional[CombatObserver] = None, max_rounds: Optional[int] = None) -> None:
+    self.game_data = game_data
+    self.player_policy: PlayerPolicy = player_policy
+    if observer == None: observer = CombatObserver()
+    self.observer: CombatObserver = observer
+    self.max_rounds: Optional[int] = max_rounds
+
+    self.effect_manager = EffectManager(self.game_data)
+
+    self.actions: Queue[CombatAction] = Queue()
+
+    self.__remaining_actions: int = 0
+    self.__round_number: int = 1
+
+    self.is_character_turn: bool = True
+
+  # getter and setter methods
+  @property
+  def remaining_actions(self) -> int:
+    """Getter method for `__remaining_actions`"""
+    return self.__remaining_actions
+
+  @remaining_actions.setter
+  def remaining_actions(self, value: int) -> None:
+    """Setter method for `__remaining_actions`"""
+    if value > Constants.MAX_REMAINING_PLAYER_ACTIONS:
+      raise ValueError(f"Cannot set \'__remaining_actions\' to value=`{value}` greater than \'Constants.MAX_REMAINING_PLAYER_ACTIONS\' (`{value}` > `{Constants.MAX_REMAINING_PLAYER_ACTIONS}`)")
+    if value < Constants.MIN_REMAINING_ACTIONS:
+      raise ValueError(f"Cannot set \'__remaining_actions\' to value=`{value}` less than \'Constants.MIN_REMAINING_ACTIONS\' (`{value}` < `{Constants.MIN_REMAINING_ACTIONS}`)")
+    self.__remaining_actions = value
+
+  @property
+  def round_number(self) -> int:
+    """Getter method for `__round_number`"""
+    return self.__round_number
+
+  @round_number.setter
+  def round_number(self, value: int) -> None:
+    """Setter method for `__round_number`"""
+    if value < Constants.MIN_ROUND_NUMBER:
+      raise ValueError(f"Cannot set \'__round_number\' to value=`{value}` less than \'Constants.MIN_ROUND_NUMBER\' (`{value}` < `{Constants.MIN_ROUND_NUMBER}`)")
+    self.__round_number = value
+
+  @property
+  def active_character_id(self) -> int:
+    if self.game_data.active_character_id == None: raise NoCharacterSelectedError()
+    return self.game_data.active_character_id
+
+  # basic methods for operating on some numeric values
+
+  def reset_remaining_actions(self) -> None:
+    self.remaining_actions = Constants.MAX_REMAINING_PLAYER_ACTIONS
+
+  def decrement_remaining_actions(self) -> None:
+    self.remaining_actions -= 1
+
+  def is_remaining_actions_zero(self) -> bool:
+    return self.remaining_actions == 0
+
+  def reset_round_number(self) -> None:
+    self.round_number = Constants.MIN_ROUND_NUMBER
+
+  def increment_round_number(self) -> None:
+    self.round_number += 1
+
+  # methods for reporting information to `self.observer`
+
+  def add_info(self, message: Optional[str] = "") -> None:
+    if message == None: return
+    self.observer.on_info(message)
+
+  def add_newline_info(self) -> None:
+    self.add_info()
+
+  def add_remaining_actions_info(self) -> None:
+    self.add_info(f" > Remaining actions: {self.remaining_actions}")
+
+  def add_round_start_info(self, round: int) -> None:
+    self.add_info(f" --- ROUND {round} --- ")
+
+  def add_entity_turn_begin_info(self, character_turn: bool) -> None:
+    message: str
+    if character_turn: message = "Character's turn:"
+    else: message = "Enemies' turn:"
+    self.add_info(message)
+
+  def add_error_info(self, action_descriptor: str, error_message: str) -> None:
+    message: str = f"{action_descriptor.upper()} ERROR: {error_message}"
+    self.add_info(message)
+
+  def add_action_input_error_info(self, error_type: str, error_message: Optional[str] = None) -> None:
+    error_description: str = ""
+    if error_message == None: error_description = f"{error_type}"
+    else: error_description = f"{error_message} (`{error_type=}`)"
+    self.add_error_info("ACTION INPUT", error_description)
+
+  def add_info_list(self, messages: list[Optional[str]], apply_formatting: bool = True) -> None:
+    for message in messages:
+      if apply_formatting and message != None:
+        message = f" > {message}"
+      self.add_info(message)
+
+  # creating the character's actions
+
+  def create_weapon_attack(self, weapon_id: int) -> Attack:
+    """An attack with a weapon, carrying the actions of its abilities (other than its parry)."""
+    weapon: Weapon = self.game_data.weapons[weapon_id]
+    attack_effects: Queue[AbilityAction] = Queue[AbilityAction]()
+    for (ability_id, ability) in self.game_data.get_non_parry_weapon_abilities(weapon).items():
+      attack_effects.put(self.game_data.get_ability_action(ability_id, ability))
+    return Attack(weapon.damage, attack_effects)
+
+  def create_weapon_parry(self, weapon_id: int) -> Optional[Parry]:
+    """The parry of a weapon, or `None` if it can't parry."""
+    weapon_parry: Optional[ParryAbility] = self.game_data.get_weapon_parry(self.game_data.weapons[weapon_id])
+    if weapon_parry == None: return None
+    return Parry(weapon_parry.damage_threshold, weapon_parry.reflection_proportion)
+
+  # actual combat stuff
+  def run(self) -> bool:
+    """
+    Plays the combat until either the character or every fighting enemy is dead.
+
+    :return: `True` if the character won, `False` if not.
+    :rtype: bool
+    """
+    self.observer.on_combat_begin()
+    self.reset_round_number()
+
+    self.fetch_active_character().reset_state()
+
+    equipables_messages: list[Optional[str]] = self.effect_manager.apply_equipped_equipables_effects()
+    self.add_info_list(equipables_messages)
+
+    self.effect_manager.init_fighting_enemy_effects()
+
+    self.observer.on_character_state_changed()
+
+    is_character_winner: Optional[bool] = self.has_character_won_combat()
+    while is_character_winner == None:
+      self.play_round()
+      is_character_winner = self.has_character_won_combat()
+
+    self.observer.on_combat_end(is_character_winner)
+    self.effect_manager.remove_all_effects_from_active_character()
+    self.fetch_active_character().reset_state()
+    return is_character_winner
+
+  def play_round(self) -> None:
+    """Plays a single round, being the character's turn followed by the enemies' turn."""
+    self.add_round_start_info(self.round_number)
+
+    self.start_character_turn()
+    self.end_character_turn()
+
+    self.start_enemies_turn()
+    self.end_enemies_turn()
+
+    self.increment_round_number()
+
+    self.add_newline_info()
+
+  ## character turn
+  def start_character_turn(self) -> None:
+    self.is_character_turn = True
+    self.reset_remaining_actions()
+    self.add_entity_turn_begin_info(character_turn=self.is_character_turn)
+
+    self.add_info_list(self.effect_manager.remove_finished_effects_from_active_character())
+
+    self.observer.on_character_turn_begin()
+    self.player_policy.begin_turn(self)
+
+    for action in self.get_character_actions():
+      self.actions.put(action)
+
+  def get_character_actions(self) -> list[CombatAction]:
+    character_actions: list[CombatAction] = []
+    while not self.is_remaining_actions_zero():
+      self.add_remaining_actions_info()
+      character_action: CombatAction = self.input_character_action()
+      character_actions.append(character_action)
+      self.decrement_remaining_actions()
+    return character_actions
+
+  def input_character_action(self) -> CombatAction:
+    """Asks `player_policy` for actions until it chooses a valid one. Errors from invalid choices are reported as information, other than `UnknownActionError`, `AbstractMethodCallError` (from a policy which doesn't define `choose_action`) and `QuitInterrupt`, which are raised."""
+    while True:
+      try:
+        character_action: CombatAction = self.player_policy.choose_action(self)
+      except UnknownActionError as e:
+        raise e # this should never occur. If it does, then the program should properly raise the error
+      except AbstractMethodCallError as e:
+        raise e # asking again would never end
+      except AbstractError as e:
+        (error_type, error_message) = e.info()
+        self.add_action_input_error_info(error_type, error_message)
+        continue
+      self.observer.on_character_action_chosen(character_action)
+      return character_action
+
+  def end_character_turn(self) -> None:
+    self.is_character_turn = False
+
+  ## enemies turn
+  def start_enemies_turn(self) -> None:
+    self.observer.on_enemies_turn_begin()
+    self.add_entity_turn_begin_info(character_turn=self.is_character_turn)
+
+    self.add_info_list(self.effect_manager.remove_finished_effects_from_all_fighting_enemies())
+
+    for action in self.get_enemies_actions():
+      self.actions.put(action)
+
+  def get_enemies_actions(self) -> list[CombatAction]:
+    """The actions of every living fighting enemy, in the order of their positions. The actions of the whole wave are decided at once (see `choose_wave_action_names`)."""
+    character: Character = self.fetch_active_character()
+    character_remaining_ignition_duration: Optional[int] = self.effect_manager.get_entity_remaining_ignition_duration()
+    (positive_character_total, character_n) = character.calculate_aggressiveness_info(character_remaining_ignition_duration)
+    negative_character_value: float = -1*(positive_character_total/character_n)
+
+    living_fighting_enemies: list[tuple[Position, int, FightingEnemy]] = []
+    for (position, fighting_enemy_id) in self.game_data.fighting_enemy_graph.items():
+      if self.is_fighting_enemy_dead(fighting_enemy_id): continue # dead fighting enemies can't act, so aren't decided for
+      living_fighting_enemies.append((position, fighting_enemy_id, self.game_data.fighting_enemies[fighting_enemy_id]))
+    fighting_enemies: list[FightingEnemy] = [fighting_enemy for (_, _, fighting_enemy) in living_fighting_enemies]
+    remaining_ignition_durations: list[Optional[int]] = [self.effect_manager.get_entity_remaining_ignition_duration(fighting_enemy_id) for (_, fighting_enemy_id, _) in living_fighting_enemies]
+    action_names: list[ActionName] = choose_wave_action_names(fighting_enemies, remaining_ignition_durations, character.parry_damage_threshold, character.parry_reflection_proportion, negative_character_value)
+
+    enemies_actions: list[CombatAction] = []
+    for ((position, fighting_enemy_id, fighting_enemy), action_name) in zip(living_fighting_enemies, action_names):
+      sender = EnemyType(fighting_enemy_id, position)
+      target = self.get_enemy_target(fighting_enemy_id, position, action_name)
+      action: ActionType = self.get_enemy_action_type(fighting_enemy, action_name)
+      enemies_actions.append(CombatAction(sender, target, action))
+    return enemies_actions
+
+  def get_enemy_target(self, fighting_enemy_id: int, position: Position, action_name: ActionName) -> Optional[EntityType]:
+    if action_name == ActionName.ATTACK: return CharacterType()
+    elif action_name == ActionName.HEAL: return EnemyType(fighting_enemy_id, position)
+    raise ValueError(f"`{action_name=}` not recognised.")
+
+  def get_enemy_action_type(self, fighting_enemy: FightingEnemy, action_name: ActionName) -> ActionType:
+    """
+    For a specific action name, the given fighting enemy's `ActionType` is returned, containing all required information for that action.
+
+    :param fighting_enemy: The fighting enemy being operated on.
+    :type fighting_enemy: FightingEnemy
+    :param action_name: The name of the action being used. Must be one of `ATTACK` or `HEAL`.
+    :type action_name: ActionName
+    :return: The action information. Always one of `Attack` and `Heal`.
+    :rtype: ActionType
+    """
+    # attacking
+    if action_name == ActionName.ATTACK:
+      # initialising attack
+      attack_damage: float = fighting_enemy.attack_damage
+      attack = Attack(attack_damage, Queue[AbilityAction]())
+      # adding abilities
+      attack_ability_ids: Optional[Union[int, list[int]]] = fighting_enemy.ability_id_table[ActionName.ATTACK]
+      if attack_ability_ids == None: return attack
+      if type(attack_ability_ids) == int: attack_ability_ids = [attack_ability_ids]
+      attack_ability_ids = cast(list[int], attack_ability_ids)
+      for attack_ability_id in attack_ability_ids:
+        attack_ability: Ability = self.game_data.abilities[attack_ability_id]
+        attack_ability_action: AbilityAction = self.game_data.get_ability_action(attack_ability_id, attack_ability)
+        attack.add_ability_action(attack_ability_action)
+      return attack
+    # healing
+    if action_name == ActionName.HEAL:
+      # initialising
+      heal_ability_id: Optional[int] = cast(Optional[int], fighting_enemy.ability_id_table.get(ActionName.HEAL))
+      if heal_ability_id == None: raise ValueError(f"Tried to get {action_name=} for {fighting_enemy=} when no healing ability exists.")
+      # adding ability
+      heal_ability: Ability = self.game_data.abilities[heal_ability_id]
+      heal_ability_action: AbilityAction = self.game_data.get_ability_action(heal_ability_id, heal_ability)
+      if type(heal_ability_action) != HealAction: raise TypeError(f"{heal_ability_action=} not of type `HealAction`.")
+      heal_amount: float = heal_ability_action.heal_amount
+      return Heal(heal_amount)
+    raise UnknownActionError(f"Unknown {action_name=} for {fighting_enemy=}.") # enemies can only use healing or attacking actions; anything else is erroneous
+
+  def end_enemies_turn(self) -> None:
+    self.execute_all_actions()
+    effect_inflict_messages: list[Optional[str]] = self.effect_manager.inflict_active_effects_to_all_fighting_entities()
+    self.add_info_list(effect_inflict_messages)
+    self.remove_dead_fighting_enemies()
+    self.observer.on_enemies_turn_end()
+    self.observer.on_character_state_changed()
+
+  def has_character_won_combat(self) -> Optional[bool]:
+    """`None` while the combat is still being played."""
+    if self.is_character_dead():
+      return False
+    if self.is_all_enemies_dead():
+      return True
+    if self.max_rounds != None and self.round_number > self.max_rounds:
+      return False
+    return None
+
+  def is_character_dead(self) -> bool:
+    character: Character = self.fetch_active_character()
+    if character.health <= 0: return True
+    return False
+
+  def is_all_enemies_dead(self) -> bool: return self.game_data.is_all_fighting_enemies_dead()
+  def is_fighting_enemy_dead(self, identifier: int) -> bool: return self.game_data.is_fighting_enemy_dead(identifier)
+
+  def remove_fighting_enemy_at(self, position: Position) -> None:
+    fighting_enemy_id: Optional[int] = self.game_data.fighting_enemy_graph[position]
+    if fighting_enemy_id == None: raise ValueError(f"Cannot remove fighting enemy at {position=} when no fighting enemy exists there.")
+    self.game_data.fighting_enemy_graph.clear_fighting_enemy_id(position)
+    del self.game_data.fighting_enemies[fighting_enemy_id]
+    del self.effect_manager.fighting_enemy_effects[fighting_enemy_id]
+
+  def remove_dead_fighting_enemies(self) -> None:
+    for (position, fighting_enemy_id) in self.game_data.fighting_enemy_graph.items():
+      fighting_enemy: FightingEnemy = self.game_data.fighting_enemies[fighting_enemy_id]
+      if fighting_enemy.health > 0: continue
+      self.remove_fighting_enemy_at(position)
+
+  # action execution
+
+  def get_next_action(self) -> CombatAction:
+    return self.actions.get()
+
+  def execute_next_action(self) -> list[Optional[str]]:
+    """
+    Pops the next action from `self.actions` and executes it.
+
+    :returns: The information from the action to be reported to `observer`.
+    :rtype: list[Optional[str]]
+    """
+    next_action: CombatAction = self.get_next_action()
+    sender_type: EntityType = next_action.sender_type
+    sender: FightingEntity = unpack_optional(self.fetch_referenced_entity(sender_type))
+    target_type: Optional[EntityType] = next_action.target_type
+    target: Optional[FightingEntity] = self.fetch_referenced_entity(target_type)
+
+    if type(sender_type) == EnemyType:
+      enemy_id: int = sender_type.identifier
+      if self.is_fighting_enemy_dead(enemy_id): return []
+    elif type(target_type) == EnemyType:
+      enemy_id: int = target_type.identifier
+      if self.is_fighting_enemy_dead(enemy_id):
+        target_position: Position = target_type.position
+        target_type = EmptyType(target_position)
+
+    (action_information, applied_effects) = next_action(sender, target) # action function is executed here
+
+    if target_type != None and applied_effects != None: # applying effects to enemies and character, if there are any
+      if type(target_type) == CharacterType:
+        action_information += self.effect_manager.apply_ability_action_queue_to_active_character(applied_effects)
+      elif type(target_type) == EnemyType and target != None:
+        enemy_target_type = cast(EnemyType, target_type)
+        enemy_id: int = enemy_target_type.identifier
+        action_information += self.effect_manager.apply_ability_action_queue_to_fighting_enemy_with_identifier(enemy_id, applied_effects)
+
+    action_type: ActionType = next_action.action_type
+    if type(action_type) == Parry: # applying parry ability
+      damage_threshold: float = action_type.quantity
+      reflection_proportion: float = action_type.reflect_proportion
+      parry_action = ParryAction(damage_threshold=damage_threshold, reflection_proportion=reflection_proportion)
+      if type(sender) == Character:
+        action_information.append(self.effect_manager.apply_ability_action_to_active_character(parry_action))
+      # no parry branch for enemies as they cannot parry
+    return action_information
+
+  def execute_all_actions(self) -> None:
+    """Gets and inflicts all actions in `self.actions`, both to the player and active fighting enemies. Doesn't decrement active effects."""
+    while not self.actions.empty():
+      action_information: list[Optional[str]] = self.execute_next_action()
+      self.add_info_list(action_information)
+
+  def fetch_referenced_entity(self, entity_type: Optional[EntityType]) -> Optional[FightingEntity]:
+    if entity_type == None: return entity_type
+    if type(entity_type) == CharacterType: return self.fetch_active_character()
+    enemy_type = cast(EnemyType, entity_type)
+    fighting_enemy_position: Position = enemy_type.position
+    return self.fetch_fighting_enemy_at(fighting_enemy_position)
+
+  def fetch_active_character(self) -> Character:
+    return self.game_data.get_active_character()
+
+  def fetch_fighting_enemy_at(self, position: Position) -> Optional[FightingEnemy]:
+    return self.game_data.get_fighting_enemy_at(position)
@@ -0,0 +1,38 @@
+from tools.typing_tools import *
+
+from combat_action import CombatAction
+
+class CombatObserver:
+  """
+  Receives the events of a combat run by `CombatEngine`, e.g. to display them (see `CombatManager`) or to record statistics. Every method does nothing by default, so subclasses only override the events they need; `CombatObserver` itself can be used when nothing needs to observe the combat.
+  """
+  def on_info(self, message: str) -> None:
+    """Called with each line of information about the combat (e.g. the outcome of an action)."""
+    pass
+
+  def on_combat_begin(self) -> None:
+    """Called before anything else, including any information about the combat."""
+    pass
+
+  def on_character_state_changed(self) -> None:
+    """Called whenever the active character's health or damage resistance may have changed."""
+    pass
+
+  def on_character_turn_begin(self) -> None:
+    """Called at the start of each of the character's turns, before their first action is chosen."""
+    pass
+
+  def on_character_action_chosen(self, action: CombatAction) -> None:
+    """Called each time the player policy chooses a valid action."""
+    pass
+
+  def on_enemies_turn_begin(self) -> None:
+    pass
+
+  def on_enemies_turn_end(self) -> None:
+    """Called once every action of the round has been executed and the dead fighting enemies have been removed."""
+    pass
+
+  def on_combat_end(self, character_won: bool) -> None:
+    """Called once a winner has been decided, before the active character's effects are removed."""
+    pass
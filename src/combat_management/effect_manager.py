@@ -1,7 +1,6 @@
 from tools.typing_tools import *
 from tools.ability_names import AbilityTypeName
 from tools.constants import ItemType
-from tools.dictionary_tools import filter_dictionary
 from tools.custom_exceptions import *
 from tools.logging_tools import *
 
@@ -17,39 +16,37 @@ from stored.items.weapon import Weapon
 from stored.items.equipable import Equipable
 
 from stored.abilities.ability import Ability
-from stored.abilities.item_ability import ItemAbility
-from stored.abilities.parry_ability import ParryAbility
-from stored.abilities.statistic_ability import StatisticAbility
 
 from ability_action import *
 
 from data_structures.queue import Queue
 
 from combat_management.active_effect import ActiveEffect
+from combat_management.effect_store import EffectStore
 
 class EffectManager(Loggable):
   def __init__(self, game_data: GameData, is_logging_enabled: bool = False, tag: Optional[str] = "EffectManager", include_call_stack: bool = False) -> None:
     super().__init__(is_logging_enabled, tag, include_call_stack)
     self.game_data = game_data
-    self.__character_effects: list[ActiveEffect] = []
-    self.__fighting_enemy_effects: dict[int, list[ActiveEffect]] = {} # maps FightingEnemyID to the effects applied to them
+    self.__character_effects: EffectStore = EffectStore()
+    self.__fighting_enemy_effects: dict[int, EffectStore] = {} # maps FightingEnemyID to the effects applied to them
 
   # getter and setter methods
 
   @property
-  def character_effects(self) -> list[ActiveEffect]:
+  def character_effects(self) -> EffectStore:
     return self.__character_effects
   
   @character_effects.setter
-  def character_effects(self, character_effects: list[ActiveEffect]) -> None:
+  def character_effects(self, character_effects: EffectStore) -> None:
     self.__character_effects = character_effects
 
   @property
-  def fighting_enemy_effects(self) -> dict[int, list[ActiveEffect]]:
+  def fighting_enemy_effects(self) -> dict[int, EffectStore]:
     return self.__fighting_enemy_effects
   
   @fighting_enemy_effects.setter
-  def fighting_enemy_effects(self, fighting_enemy_effects: dict[int, list[ActiveEffect]]) -> None:
+  def fighting_enemy_effects(self, fighting_enemy_effects: dict[int, EffectStore]) -> None:
     self.__fighting_enemy_effects = fighting_enemy_effects
 
   # preparations made at the start of combat
@@ -57,59 +54,21 @@ class EffectManager(Loggable):
   def init_fighting_enemy_effects(self) -> None:
     self.fighting_enemy_effects.clear()
     for identifier in list(self.game_data.fighting_enemies.keys()):
-      self.fighting_enemy_effects[identifier] = []
+      self.fighting_enemy_effects[identifier] = EffectStore()
 
   # getting abilities
 
   def get_ability_identifiers_for(self, item_id: int) -> list[int]:
-    item_abilities: dict[int, ItemAbility] = filter_dictionary(self.game_data.item_abilities, lambda _, item_ability: item_ability.item_id == item_id)
-    ability_identifiers: list[int] = []
-    for item_ability in list(item_abilities.values()):
-      ability_identifiers.append(item_ability.ability_id)
-    return ability_identifiers
+    return self.game_data.get_ability_identifiers_from_item_id(item_id)
 
   def get_abilities_for(self, item_id: int) -> list[Ability]:
     ability_identifiers: list[int] = self.get_ability_identifiers_for(item_id)
-    abilities: dict[int, Ability] = filter_dictionary(self.game_data.abilities, lambda identifier, _: identifier in ability_identifiers)
-    return list(abilities.values())
-  
-  def get_parry_ability(self, ability_id: int) -> ParryAbility:
-    parry_abilities: dict[int, ParryAbility] = filter_dictionary(self.game_data.parry_abilities, lambda _, parry_ability: parry_ability.ability_id == ability_id)
-    if len(parry_abilities) == 0 or len(parry_abilities) > 1: raise ValueError(f"Multiple or no parry abilities ({parry_abilities=}) found for {ability_id=}.")
-    return list(parry_abilities.values())[0]
-  
-  def get_defend_ability(self, ability_id: int) -> StatisticAbility:
-    defend_abilities: dict[int, StatisticAbility] = filter_dictionary(self.game_data.statistic_abilities, lambda _, statistic_ability: statistic_ability.ability_id == ability_id and statistic_ability.ability_type == AbilityTypeName.DEFEND)
-    if len(defend_abilities) == 0 or len(defend_abilities) > 1: raise ValueError(f"Multiple or no defend abilities ({defend_abilities=}) found for {ability_id=}.")
-    return list(defend_abilities.values())[0]
-
-  def get_weaken_ability(self, ability_id: int) -> StatisticAbility:
-    weaken_abilities: dict[int, StatisticAbility] = filter_dictionary(self.game_data.statistic_abilities, lambda _, statistic_ability: statistic_ability.ability_id == ability_id and statistic_ability.ability_type == AbilityTypeName.WEAKEN)
-    if len(weaken_abilities) == 0 or len(weaken_abilities) > 1: raise ValueError(f"Multiple or no weaken abilities ({weaken_abilities=}) found for {ability_id=}.")
-    return list(weaken_abilities.values())[0]
+    return [self.game_data.abilities[ability_id] for ability_id in ability_identifiers]
   
   def ability_id_to_ability_action(self, ability_id: int) -> AbilityAction:
-    ability_action: AbilityAction
     ability: Ability = self.game_data.abilities[ability_id]
-    ability_type: AbilityTypeName = ability.ability_type
-    match ability_type:
-      case AbilityTypeName.IGNITE:
-        ability_action = IgniteAction()
-      case AbilityTypeName.PIERCE:
-        ability_action = PierceAction()
-      case AbilityTypeName.PARRY:
-        parry: ParryAbility = self.get_parry_ability(ability_id)
-        ability_action = ParryAction(damage_threshold=parry.damage_threshold, reflection_proportion=parry.reflection_proportion)
-      case AbilityTypeName.DEFEND:
-        defend: StatisticAbility = self.get_defend_ability(ability_id)
-        is_unique: bool = self.game_data.is_statistic_ability_unique(ability_id)
-        ability_action = DefendAction(initial_duration=defend.initial_duration, is_unique=is_unique, resistance=defend.amount)
-      case AbilityTypeName.WEAKEN:
-        weaken: StatisticAbility = self.get_weaken_ability(ability_id)
-        is_unique: bool = self.game_data.is_statistic_ability_unique(ability_id)
-        ability_action = WeakenAction(initial_duration=weaken.initial_duration, is_unique=is_unique, vulnerability=weaken.amount)
-      case _: raise ValueError(f"Unknown value for {ability_type=} ({ability=}).")
-    return ability_action
+    if ability.ability_type == AbilityTypeName.HEAL: raise ValueError(f"Unknown value for {ability.ability_type=} ({ability=}).") # heals are only used by enemies
+    return self.game_data.get_ability_action_by_identifier(ability_id)
   
   def get_ability_actions_for(self, item_id: int) -> list[AbilityAction]: 
     ability_identifiers: list[int] = self.get_ability_identifiers_for(item_id)
@@ -161,36 +120,12 @@ class EffectManager(Loggable):
 
   # inflicting effects
   
-  def generate_active_effect(self, ability_action: AbilityAction) -> ActiveEffect:
-    duration: Optional[int] = ability_action.initial_duration
-    new_effect = ActiveEffect(duration, ability_action)
-    return new_effect
-  
-  def find_effect(self, effect: ActiveEffect, effect_list: list[ActiveEffect]) -> Optional[int]:
-    """
-    :return: Returns the index it is first found at. If it's not in the list, returns `None`.
-    :rtype: Optional[int]
-    """
-    for (i, selected_effect) in enumerate(effect_list):
-      if effect == selected_effect: return i
-    return None
-  
-  def add_effect_to_list(self, effect: ActiveEffect, effect_list: list[ActiveEffect]) -> tuple[list[ActiveEffect], Optional[ActiveEffect]]:
-    """Assumes the effect being added has already been applied to the entity. Removes colliding effects from the effect list."""
-    effect_location: Optional[int] = self.find_effect(effect, effect_list)
-    effect_to_be_removed: Optional[ActiveEffect] = None
-    effect_list.append(effect)
-    if effect_location != None and effect.effect_ability.is_unique: # what to do if the effect is not found in the list
-      effect_to_be_removed = effect_list.pop(effect_location)
-    return (effect_list, effect_to_be_removed)
-  
-  def apply_ability_action_to_fighting_entity(self, ability_action: AbilityAction, fighting_entity: FightingEntity, effect_list: list[ActiveEffect]) -> tuple[Optional[str], list[ActiveEffect]]:
-    new_effect: ActiveEffect = self.generate_active_effect(ability_action)
-    (effect_list, effect_to_be_removed_from_fighting_entity) = self.add_effect_to_list(new_effect, effect_list)
+  def apply_ability_action_to_fighting_entity(self, ability_action: AbilityAction, fighting_entity: FightingEntity, effect_store: EffectStore) -> Optional[str]:
+    """Adds the effect to `effect_store` before applying it to the entity. If the effect is unique, the colliding effect it replaces is removed from the entity first."""
+    (_, effect_to_be_removed_from_fighting_entity) = effect_store.add(ability_action)
     if effect_to_be_removed_from_fighting_entity != None:
       fighting_entity.remove_ability_action(effect_to_be_removed_from_fighting_entity.effect_ability)
-    message: Optional[str] = fighting_entity.apply_ability_action(ability_action)
-    return (message, effect_list)
+    return fighting_entity.apply_ability_action(ability_action)
 
   ## character
   def apply_ability_action_to_active_character(self, ability_action: AbilityAction) -> Optional[str]:
@@ -199,8 +134,7 @@ class EffectManager(Loggable):
     :rtype: str
     """
     character: Character = self.get_active_character()
-    (message, self.character_effects) = self.apply_ability_action_to_fighting_entity(ability_action, character, self.character_effects)
-    return message
+    return self.apply_ability_action_to_fighting_entity(ability_action, character, self.character_effects)
 
   def apply_ability_action_list_to_active_character(self, ability_actions: list[AbilityAction]) -> list[Optional[str]]:
     messages: list[Optional[str]] = []
@@ -231,8 +165,7 @@ class EffectManager(Loggable):
   ## fighting enemies
   def apply_ability_action_to_fighting_enemy_with_identifier(self, fighting_enemy_id: int, ability_action: AbilityAction) -> Optional[str]:
     fighting_enemy: FightingEnemy = self.get_fighting_enemy(fighting_enemy_id)
-    (message, self.fighting_enemy_effects[fighting_enemy_id]) = self.apply_ability_action_to_fighting_entity(ability_action, fighting_enemy, self.fighting_enemy_effects[fighting_enemy_id])
-    return message
+    return self.apply_ability_action_to_fighting_entity(ability_action, fighting_enemy, self.fighting_enemy_effects[fighting_enemy_id])
   
   def apply_ability_action_list_to_fighting_enemy_with_identifier(self, fighting_enemy_id: int, ability_actions: list[AbilityAction]) -> list[Optional[str]]:
     messages: list[Optional[str]] = []
@@ -265,73 +198,46 @@ class EffectManager(Loggable):
 
   ## character
   def decrement_character_effects_durations(self) -> None:
-    for active_effect in self.character_effects:
-      if active_effect.is_permanent(): continue
-      active_effect.decrement_remaining_turns()
+    self.character_effects.advance_turn()
   
   ## fighting enemies
   def decrement_fighting_enemy_effects_durations(self, fighting_enemy_id: int) -> None:
-    specific_fighting_enemy_effects: list[ActiveEffect] = self.fighting_enemy_effects[fighting_enemy_id]
-    for active_effect in specific_fighting_enemy_effects:
-      if active_effect.is_permanent(): continue
-      active_effect.decrement_remaining_turns()
+    self.fighting_enemy_effects[fighting_enemy_id].advance_turn()
 
   def decrement_all_fighting_enemy_effects_durations(self) -> None:
-    for fighting_enemy_id in list(self.fighting_enemy_effects.keys()):
-      self.decrement_fighting_enemy_effects_durations(fighting_enemy_id)
+    for effect_store in self.fighting_enemy_effects.values():
+      effect_store.advance_turn()
 
   # removing effects
 
-  def remove_effect_from_effect_list(self, effect: ActiveEffect, effect_list: list[ActiveEffect]) -> list[ActiveEffect]:
-    index: Optional[int] = self.find_effect(effect, effect_list)
-    if index == None: raise BufferError(f"Tried to remove effect {effect} not found in effect list ({effect_list=}).")
-    effect_list.pop(index)
-    return effect_list
-
-  def remove_effect_from_fighting_entity(self, active_effect: ActiveEffect, fighting_entity: FightingEntity, effect_list: list[ActiveEffect]) -> tuple[Optional[str], list[ActiveEffect]]:
-    """Removes both the status effect applied to the enemy as well as the effect from the specific list."""
-    ability_action: AbilityAction = active_effect.effect_ability
-    effect_list = self.remove_effect_from_effect_list(active_effect, effect_list)
-    return (fighting_entity.remove_ability_action(ability_action), effect_list)
-  
-  def clear_effects(self, fighting_entity: FightingEntity, effect_list: list[ActiveEffect]) -> list[ActiveEffect]:
-    fighting_entity.reset_state()
-    effect_list = []
-    return effect_list
+  def remove_effect_from_fighting_entity(self, active_effect: ActiveEffect, fighting_entity: FightingEntity, effect_store: EffectStore) -> Optional[str]:
+    """Removes both the status effect applied to the entity as well as the effect from its store."""
+    effect_store.remove(active_effect)
+    return fighting_entity.remove_ability_action(active_effect.effect_ability)
+
+  def remove_finished_effects_from_fighting_entity(self, fighting_entity: FightingEntity, effect_store: EffectStore) -> list[Optional[str]]:
+    """The finished effects are taken from the store before any are removed from the entity, so nothing is removed from the store while it is being iterated over."""
+    return [fighting_entity.remove_ability_action(active_effect.effect_ability) for active_effect in effect_store.pop_finished_effects()]
 
   ## character
   def remove_effect_from_active_character(self, active_effect: ActiveEffect) -> Optional[str]:
     """Removes the effect from `self.character_effects`."""
-    character: Character = self.get_active_character()
-    (message, self.character_effects) = self.remove_effect_from_fighting_entity(active_effect, character, self.character_effects)
-    return message
+    return self.remove_effect_from_fighting_entity(active_effect, self.get_active_character(), self.character_effects)
 
   def remove_finished_effects_from_active_character(self) -> list[Optional[str]]:
-    messages: list[Optional[str]] = []
-    for active_effect in self.character_effects:
-      if active_effect.is_no_turns_remaining():
-        message: Optional[str] = self.remove_effect_from_active_character(active_effect)
-        messages.append(message)
-    return messages
+    return self.remove_finished_effects_from_fighting_entity(self.get_active_character(), self.character_effects)
 
   def remove_all_effects_from_active_character(self) -> None:
-    self.character_effects = self.clear_effects(self.get_active_character(), self.character_effects)
+    self.get_active_character().reset_state()
+    self.character_effects = EffectStore()
 
   ## fighting enemies
   def remove_effect_from_fighting_enemy_with_identifier(self, fighting_enemy_id: int, active_effect: ActiveEffect) -> Optional[str]:
     """Removes the effect from `self.fighting_enemy_effects`."""
-    fighting_enemy: FightingEnemy = self.get_fighting_enemy(fighting_enemy_id)
-    (message, self.fighting_enemy_effects[fighting_enemy_id]) = self.remove_effect_from_fighting_entity(active_effect, fighting_enemy, self.fighting_enemy_effects[fighting_enemy_id])
-    return message
+    return self.remove_effect_from_fighting_entity(active_effect, self.get_fighting_enemy(fighting_enemy_id), self.fighting_enemy_effects[fighting_enemy_id])
 
   def remove_finished_effects_from_fighting_enemy_with_identifier(self, fighting_enemy_id: int) -> list[Optional[str]]:
-    messages: list[Optional[str]] = []
-    specific_fighting_enemy_effects: list[ActiveEffect] = self.fighting_enemy_effects[fighting_enemy_id]
-    for (i, active_effect) in enumerate(specific_fighting_enemy_effects):
-      if active_effect.is_no_turns_remaining():
-        message: Optional[str] = self.remove_effect_from_fighting_enemy_with_identifier(fighting_enemy_id, active_effect)
-        messages.append(message)
-    return messages
+    return self.remove_finished_effects_from_fighting_entity(self.get_fighting_enemy(fighting_enemy_id), self.fighting_enemy_effects[fighting_enemy_id])
 
   def remove_finished_effects_from_all_fighting_enemies(self) -> list[Optional[str]]:
     messages: list[Optional[str]] = []
@@ -342,14 +248,11 @@ class EffectManager(Loggable):
   # getting effects
 
   def get_entity_remaining_ignition_duration(self, fighting_enemy_id: Optional[int] = None) -> Optional[int]:
-    effects: list[ActiveEffect] = []
-    if fighting_enemy_id == None: effects = self.character_effects
-    else: effects = self.fighting_enemy_effects[fighting_enemy_id]
-    is_ignite_ability: Callable[[ActiveEffect], bool] = lambda effect: effect.effect_ability.get_ability_type_name() == AbilityTypeName.IGNITE
-    ignition_effects: list[ActiveEffect] = list(filter(lambda effect: is_ignite_ability(effect), effects))
+    effect_store: EffectStore = self.character_effects if fighting_enemy_id == None else self.fighting_enemy_effects[fighting_enemy_id]
+    ignition_effects: list[ActiveEffect] = effect_store.get_effects_of_type(AbilityTypeName.IGNITE)
     if len(ignition_effects) == 0: return None
     elif len(ignition_effects) == 1:
-      ignition_duration: Optional[int] = ignition_effects[0].turns_remaining
+      ignition_duration: Optional[int] = effect_store.get_turns_remaining(ignition_effects[0])
       if ignition_duration == None: raise ValueError(f"{ignition_effects[0]=} has {ignition_duration=}, which cannot be `None`.")
       return ignition_duration
-    raise MultipleIgnitionEffectsError(ignition_effects)
\ No newline at end of file
+    raise MultipleIgnitionEffectsError(ignition_effects)
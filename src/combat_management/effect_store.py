@@ -0,0 +1,102 @@
+import heapq
+
+from tools.typing_tools import *
+from tools.ability_names import AbilityTypeName
+
+from ability_action import AbilityAction
+
+from combat_management.active_effect import ActiveEffect
+
+class EffectStore(Sized):
+  """
+  Holds the active effects of a single fighting entity for `EffectManager`. The effects are indexed by their ability action (which identifies colliding unique effects, see `AbilityAction.__eq__`) and by their ability type, so neither has to be found by searching every effect.
+
+  Time is counted in turns of the store, which only move forward with `advance_turn`. Each effect keeps the turn at which it finishes, and the finite ones are held in a min-heap of those turns, so passing a turn doesn't change any effects and `pop_finished_effects` only looks at the effects which have finished. Effects removed early stay in the heap until their turn passes, and are skipped then.
+  """
+  def __init__(self) -> None:
+    self.turn: int = 0
+    self.__effects: dict[int, ActiveEffect] = {} # maps the number of each effect to the effect, in the order they were added
+    self.__numbers_by_ability: dict[AbilityAction, dict[int, None]] = {} # dictionaries are used as ordered sets
+    self.__numbers_by_type: dict[AbilityTypeName, dict[int, None]] = {}
+    self.__expiries: list[tuple[int, int]] = [] # heap of `(expiry_turn, number)`
+    self.__next_number: int = 0
+
+  # built-in methods
+
+  def __len__(self) -> int:
+    return len(self.__effects)
+
+  def __iter__(self) -> Iterator[ActiveEffect]:
+    """Iterates over the effects in the order they were added."""
+    return iter(list(self.__effects.values()))
+
+  def __repr__(self) -> str:
+    return f"EffectStore({self.turn=}, effects={list(self.__effects.values())})"
+
+  # finding effects
+
+  def find(self, ability_action: AbilityAction) -> Optional[ActiveEffect]:
+    """The earliest added effect equal to `ability_action`, or `None` if there isn't one."""
+    for number in self.__numbers_by_ability.get(ability_action, {}):
+      return self.__effects[number]
+    return None
+
+  def get_effects_of_type(self, ability_type_name: AbilityTypeName) -> list[ActiveEffect]:
+    return [self.__effects[number] for number in self.__numbers_by_type.get(ability_type_name, {})]
+
+  def get_turns_remaining(self, effect: ActiveEffect) -> Optional[int]:
+    """`None` if the effect is permanent."""
+    return effect.get_turns_remaining(self.turn)
+
+  # adding and removing effects
+
+  def add(self, ability_action: AbilityAction) -> tuple[ActiveEffect, Optional[ActiveEffect]]:
+    """
+    Adds an effect lasting for the initial duration of `ability_action`. If the ability is unique, the earliest added effect equal to it is removed.
+
+    :return: The new effect, followed by the effect it replaced (`None` if it didn't replace one).
+    :rtype: tuple[ActiveEffect, Optional[ActiveEffect]]
+    """
+    replaced_effect: Optional[ActiveEffect] = None
+    if ability_action.is_unique:
+      replaced_effect = self.find(ability_action)
+      if replaced_effect != None: self.remove(replaced_effect)
+    initial_duration: Optional[int] = ability_action.initial_duration
+    expiry_turn: Optional[int] = None if initial_duration == None else self.turn + initial_duration
+    effect = ActiveEffect(expiry_turn, ability_action, self.__next_number)
+    self.__next_number += 1
+    self.__effects[effect.number] = effect
+    self.__numbers_by_ability.setdefault(ability_action, {})[effect.number] = None
+    self.__numbers_by_type.setdefault(ability_action.get_ability_type_name(), {})[effect.number] = None
+    if expiry_turn != None: heapq.heappush(self.__expiries, (expiry_turn, effect.number))
+    return (effect, replaced_effect)
+
+  def remove(self, effect: ActiveEffect) -> None:
+    """Raises a `BufferError` if the effect isn't in the store."""
+    if self.__effects.get(effect.number) is not effect: raise BufferError(f"Tried to remove effect {effect} not found in effect store ({self}).")
+    del self.__effects[effect.number]
+    self.__discard_number(self.__numbers_by_ability, effect.effect_ability, effect.number)
+    self.__discard_number(self.__numbers_by_type, effect.effect_ability.get_ability_type_name(), effect.number)
+
+  def __discard_number[KeyType](self, numbers_by_key: dict[KeyType, dict[int, None]], key: KeyType, number: int) -> None:
+    numbers: dict[int, None] = numbers_by_key[key]
+    del numbers[number]
+    if len(numbers) == 0: del numbers_by_key[key]
+
+  # passing turns
+
+  def advance_turn(self) -> None:
+    """Takes a turn off the remaining turns of every effect which isn't permanent."""
+    self.turn += 1
+
+  def pop_finished_effects(self) -> list[ActiveEffect]:
+    """Removes every effect with no turns remaining, returning them in the order they were added."""
+    finished_effects: list[ActiveEffect] = []
+    while len(self.__expiries) > 0 and self.__expiries[0][0] <= self.turn:
+      (_, number) = heapq.heappop(self.__expiries)
+      effect: Optional[ActiveEffect] = self.__effects.get(number)
+      if effect == None: continue # already removed
+      self.remove(effect)
+      finished_effects.append(effect)
+    finished_effects.sort(key=lambda effect: effect.number)
+    return finished_effects
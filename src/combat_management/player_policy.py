@@ -0,0 +1,69 @@
+from tools.constants import *
+from tools.typing_tools import *
+from tools.custom_exceptions import AbstractMethodCallError
+
+import combat_management.combat_engine as ce
+
+from stored.entities.character import Character
+from stored.entities.fighting_enemy import FightingEnemy
+
+from data_structures.action_type import *
+from combat_action import CombatAction
+from data_structures.entity_type import *
+
+class PlayerPolicy:
+  """
+  Chooses the character's actions for a `CombatEngine`. `choose_action` must be defined by subclasses.
+  """
+  def begin_turn(self, engine: "ce.CombatEngine") -> None:
+    """Called at the start of each of the character's turns, before `choose_action`. Does nothing by default."""
+    pass
+
+  def choose_action(self, engine: "ce.CombatEngine") -> CombatAction:
+    """
+    Chooses the character's next action. Called once for each of the character's remaining actions in a turn (see `CombatEngine.remaining_actions`).
+
+    Raising an `AbstractError` (e.g. `NoEnemiesSelectedError`) rejects the choice; the error is reported and `choose_action` is called again. `QuitInterrupt` stops the combat.
+    """
+    raise AbstractMethodCallError(PlayerPolicy.__name__, self.choose_action.__name__)
+
+class GreedyPlayerPolicy(PlayerPolicy):
+  """
+  Plays without any input, e.g. for simulating combats. Drinks a health potion when the character's health is at or below `heal_threshold` of their maximum, and otherwise attacks the fighting enemy with the least health using the most damaging weapon which hasn't been used this turn. If every weapon has been used, a health potion is drunk instead.
+
+  :param heal_threshold: The proportion of the character's maximum health at or below which they heal. Defaults to `0.35`.
+  :type heal_threshold: float
+  """
+  def __init__(self, heal_threshold: float = 0.35) -> None:
+    self.heal_threshold: float = heal_threshold
+    self.used_weapon_ids: set[int] = set()
+
+  def begin_turn(self, engine: "ce.CombatEngine") -> None:
+    self.used_weapon_ids = set()
+
+  def choose_action(self, engine: "ce.CombatEngine") -> CombatAction:
+    character: Character = engine.fetch_active_character()
+    target: Optional[EnemyType] = self.choose_target(engine)
+    weapon_id: Optional[int] = self.choose_weapon_id(engine)
+    if target == None or weapon_id == None or character.health <= self.heal_threshold*character.max_health:
+      return CombatAction(CharacterType(), CharacterType(), Heal(Constants.HEALTH_POTION_AMOUNT))
+    self.used_weapon_ids.add(weapon_id)
+    return CombatAction(CharacterType(), target, engine.create_weapon_attack(weapon_id))
+
+  def choose_target(self, engine: "ce.CombatEngine") -> Optional[EnemyType]:
+    """The living fighting enemy with the least health, or `None` if there isn't one."""
+    target: Optional[EnemyType] = None
+    target_health: float = 0
+    for (position, fighting_enemy_id) in engine.game_data.fighting_enemy_graph.items():
+      fighting_enemy: FightingEnemy = engine.game_data.fighting_enemies[fighting_enemy_id]
+      if fighting_enemy.health <= 0: continue
+      if target == None or fighting_enemy.health < target_health:
+        target = EnemyType(fighting_enemy_id, position)
+        target_health = fighting_enemy.health
+    return target
+
+  def choose_weapon_id(self, engine: "ce.CombatEngine") -> Optional[int]:
+    """The most damaging equipped weapon which hasn't been used this turn, or `None` if there isn't one."""
+    unused_weapon_ids: list[int] = [weapon_id for weapon_id in engine.game_data.equipped_weapon_identifiers if not weapon_id in self.used_weapon_ids]
+    if len(unused_weapon_ids) == 0: return None
+    return max(unused_weapon_ids, key=lambda weapon_id: engine.game_data.weapons[weapon_id].damage)
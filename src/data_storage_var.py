@@ -3,12 +3,19 @@ from tools.dictionary_tools import *
 from tools.constants import StorageAttrName
 from tools.logging_tools import *
 
+from data_structures.identifier_allocator import IdentifierAllocator
+from data_structures.storage_index import StorageIndex
+
 class DataStorageVar[DataStorageType](dict, Loggable):
   def __init__(self, storage_type: Type[DataStorageType], data: dict[int, DataStorageType] = {}, is_logging_enabled: bool = False, label: Optional[StorageAttrName] = None, include_call_stack: bool = False) -> None:
     Loggable.__init__(self, is_logging_enabled, label, include_call_stack)
     self.STORAGE_TYPE = storage_type
     self.__data: dict[int, DataStorageType] = {}
     if data != {}: self.__data = data
+    self.__identifier_allocator = IdentifierAllocator(self.__data.keys())
+    self.__indexes: dict[str, StorageIndex] = {}
+    self.__loader: Optional[Callable[[], dict[int, DataStorageType]]] = None
+    self.__undo_log: Optional[dict[int, Optional[DataStorageType]]] = None # the value each changed key had before `start_undo_log` (`None` if it had none); see `rollback_undo_log`
 
   # built-in methods
   def __repr__(self) -> str: return f"DataStorageVar[{self.STORAGE_TYPE}]({self.data})"
@@ -18,19 +25,37 @@ class DataStorageVar[DataStorageType](dict, Loggable):
   
   def __setitem__(self, key: int, value: DataStorageType) -> None:
     if type(value) != self.STORAGE_TYPE: raise TypeError(f"Value type of {value=} doesn't match with value type of {self.STORAGE_TYPE=}.")
-    self.data[key] = value
-
-  def __delitem__(self, key: int) -> None: del self.data[key]
+    data: dict[int, DataStorageType] = self.data
+    self.__log_undo(key)
+    for index in self.__indexes.values():
+      if not index.is_built: continue
+      if key in data: index.replace(key, data[key], value)
+      else: index.add(key, value)
+    data[key] = value
+    self.__identifier_allocator.add(key)
+
+  def __delitem__(self, key: int) -> None:
+    self.__log_undo(key)
+    value: DataStorageType = self.data.pop(key)
+    self.__identifier_allocator.remove(key)
+    for index in self.__indexes.values():
+      if index.is_built: index.remove(key, value)
 
   def __len__(self) -> int: return len(self.data)
 
-  def clear(self): return self.data.clear()
+  def clear(self):
+    self.data.clear()
+    self.__identifier_allocator.rebuild([])
+    self.__invalidate_indexes()
 
   def copy(self) -> dict[int, DataStorageType]: return self.data.copy()
 
   def has_key(self, key: int) -> bool: return key in self.data
 
-  def update(self, *args, **kwargs) -> None: return self.data.update(*args, **kwargs)
+  def update(self, *args, **kwargs) -> None:
+    self.data.update(*args, **kwargs)
+    self.__identifier_allocator.rebuild(self.__data.keys())
+    self.__invalidate_indexes()
 
   def keys(self): return self.data.keys()
 
@@ -38,7 +63,12 @@ class DataStorageVar[DataStorageType](dict, Loggable):
 
   def items(self): return self.data.items()
 
-  def pop(self, *args) -> DataStorageType: return self.data.pop(*args)
+  def pop(self, *args) -> DataStorageType:
+    if len(args) > 0 and args[0] in self.data:
+      value: DataStorageType = self[args[0]]
+      del self[args[0]]
+      return value
+    return self.data.pop(*args)
 
   def __contains__(self, item: Union[int, DataStorageType]) -> bool: return item in self.data
 
@@ -47,7 +77,18 @@ class DataStorageVar[DataStorageType](dict, Loggable):
   # getter and setter methods
 
   @property
-  def data(self) -> dict[int, DataStorageType]: return self.__data
+  def data(self) -> dict[int, DataStorageType]:
+    if self.__loader != None: self.set(self.__loader())
+    return self.__data
+
+  @property
+  def is_loaded(self) -> bool:
+    """`False` if the data is still waiting to be loaded by the loader given to `set_loader`."""
+    return self.__loader == None
+
+  def set_loader(self, loader: Callable[[], dict[int, DataStorageType]]) -> None:
+    """Defers loading the data until it is first accessed, at which point `loader` is called."""
+    self.__loader = loader
 
   # dictionary methods
 
@@ -62,6 +103,94 @@ class DataStorageVar[DataStorageType](dict, Loggable):
     if not key in self: raise Exception()
     self[key] = value
 
+  def __sync_identifier_allocator(self) -> None:
+    data: dict[int, DataStorageType] = self.data
+    if len(self.__identifier_allocator) != len(data): # the dictionary returned by `get` was changed directly
+      self.__identifier_allocator.rebuild(data.keys())
+
+  def get_next_available_identifier(self) -> int:
+    """Returns the smallest non-negative key not in use, without sorting the keys."""
+    self.__sync_identifier_allocator()
+    return self.__identifier_allocator.get_next_available_identifier()
+
+  def get_next_available_identifiers(self, count: int) -> list[int]:
+    """Returns the `count` smallest non-negative keys not in use, in ascending order."""
+    self.__sync_identifier_allocator()
+    return self.__identifier_allocator.get_next_available_identifiers(count)
+
+  # undo log
+
+  def start_undo_log(self) -> None:
+    """Starts recording the value of each key before it is first set or deleted, so that `rollback_undo_log` can undo the changes. Loads the data first if it is still waiting to be loaded."""
+    self.data
+    self.__undo_log = {}
+
+  def __log_undo(self, key: int) -> None:
+    undo_log: Optional[dict[int, Optional[DataStorageType]]] = self.__undo_log
+    if undo_log == None or key in undo_log: return None # only the value from before the first change is kept
+    undo_log[key] = self.data.get(key)
+
+  def rollback_undo_log(self) -> None:
+    """Sets every key changed since `start_undo_log` back to its value from then, then stops recording. Changes which were made with `set`, `update` or `clear` aren't undone."""
+    undo_log: Optional[dict[int, Optional[DataStorageType]]] = self.__undo_log
+    if undo_log == None: return None
+    self.__undo_log = None
+    for (key, value) in undo_log.items():
+      if value == None:
+        if key in self: del self[key]
+      else: self[key] = value
+
+  def stop_undo_log(self) -> None:
+    """Stops recording without undoing anything."""
+    self.__undo_log = None
+
+  # secondary indexes
+
+  def __invalidate_indexes(self) -> None:
+    for index in self.__indexes.values():
+      index.invalidate()
+
+  def create_index(self, name: str, key: Callable[[DataStorageType], Any]) -> None:
+    """Indexes the values on `key` (which must not change while a value is stored), so that `get_identifiers_where_in` doesn't scan every value. The index is built on its first lookup and kept up to date afterward."""
+    self.__indexes[name] = StorageIndex(key)
+
+  def has_index(self, name: str) -> bool:
+    return name in self.__indexes
+
+  def get_index(self, name: str) -> StorageIndex:
+    index: StorageIndex = self.__indexes[name]
+    data: dict[int, DataStorageType] = self.data
+    if not index.is_built or index.count != len(data): index.build(data) # also rebuilt if the dictionary returned by `get` was changed directly
+    return index
+
+  def get_identifiers_where_equal(self, name: str, key: Any) -> list[int]:
+    """The identifiers of every value whose key in the index `name` is `key`, in storage order. Used as a reverse lookup, e.g. from an `ItemID` to the weapons of that item."""
+    return self.get_index(name).get_identifiers(key)
+
+  def get_identifiers_where_in(self, name: str, keys: Iterable[Any]) -> list[int]:
+    """The identifiers of every value whose key in the index `name` is any of `keys`, in storage order for each key."""
+    index: StorageIndex = self.get_index(name)
+    identifiers: dict[int, None] = {}
+    for key in keys:
+      identifiers |= dict.fromkeys(index.get_identifiers(key))
+    return list(identifiers)
+
+  def find_identifier(self, value: DataStorageType) -> Optional[int]:
+    """The identifier of `value` (found by identity, not equality), or `None` if it isn't in the storage. Only the values with the same key as `value` in an index are checked, unless it isn't found with any index (or there are none)."""
+    data: dict[int, DataStorageType] = self.data
+    for name in self.__indexes:
+      for identifier in self.get_index(name).get_identifiers(self.__indexes[name].key(value)):
+        if data[identifier] is value: return identifier
+    for (identifier, stored_value) in data.items():
+      if stored_value is value: return identifier
+    return None
+
+  def get_index_keys(self, name: str, identifiers: Iterable[int]) -> list[Any]:
+    """The distinct keys in the index `name` of the values with the given identifiers, in the order of `identifiers`. Identifiers which aren't in the storage are skipped."""
+    key: Callable[[DataStorageType], Any] = self.__indexes[name].key
+    data: dict[int, DataStorageType] = self.data
+    return list(dict.fromkeys(key(data[identifier]) for identifier in identifiers if identifier in data))
+
   def get(self) -> dict[int, DataStorageType]: return cast(dict[int, DataStorageType], self.data)
 
   def set(self, data: dict[int, DataStorageType]) -> None:
@@ -69,4 +198,7 @@ class DataStorageVar[DataStorageType](dict, Loggable):
       data_value_type: Type = type(list(data.values())[0])
       if data_value_type != self.STORAGE_TYPE:
         raise TypeError(f"Value type of {data=} doesn't match with value type of {self.STORAGE_TYPE=}.")
-    self.__data = data
\ No newline at end of file
+    self.__loader = None # any pending load is replaced
+    self.__data = data
+    self.__identifier_allocator.rebuild(data.keys())
+    self.__invalidate_indexes()
\ No newline at end of file
@@ -1,6 +1,10 @@
-__all__ = ["action_type", "entity_type", "fighting_enemy_graph", "matrix"]
+__all__ = ["action_type", "enemy_profile", "entity_type", "fighting_enemy_graph", "identifier_allocator", "matrix", "storage_index", "unit_of_work"]
 
 from . import action_type
+from . import enemy_profile
 from . import entity_type
 from . import fighting_enemy_graph
-from . import matrix
\ No newline at end of file
+from . import identifier_allocator
+from . import matrix
+from . import storage_index
+from . import unit_of_work
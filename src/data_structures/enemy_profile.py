@@ -0,0 +1,29 @@
+from tools.typing_tools import *
+from tools.constants import ActionName
+
+from ability_action import AbilityAction
+
+@dataclass(frozen=True)
+class EnemyProfile:
+  """
+  Everything a `FightingEnemy` needs to make decisions which depends only on its `Enemy`, worked out once for each `EnemyID` (see `GameData.get_enemy_profiles`) and shared by every fighting enemy spawned from it (see `FightingEnemy.apply_profile`).
+
+  :param attack_ability_ids: The `AbilityID` of each ability used in the enemy's attack. Empty if it only has a standard attack.
+  :type attack_ability_ids: tuple[int, ...]
+  :param heal_ability_id: The `AbilityID` of the enemy's healing ability, or `None` if it can't heal.
+  :type heal_ability_id: Optional[int]
+  :param attack_actions: The action of each ability in `attack_ability_ids`, in the same order.
+  :type attack_actions: tuple[AbilityAction, ...]
+  :param heal_action: The action of the healing ability, or `None` if it can't heal.
+  :type heal_action: Optional[AbilityAction]
+  :param action_offensiveness_table: The offensiveness of each action the enemy can take. Read-only, so must be copied by each fighting enemy.
+  :type action_offensiveness_table: Mapping[ActionName, float]
+  :param decision_error_bound: Calculated from the enemy's intelligence with `get_decision_error_bound`.
+  :type decision_error_bound: float
+  """
+  attack_ability_ids: tuple[int, ...]
+  heal_ability_id: Optional[int]
+  attack_actions: tuple[AbilityAction, ...]
+  heal_action: Optional[AbilityAction]
+  action_offensiveness_table: Mapping[ActionName, float]
+  decision_error_bound: float
@@ -1,25 +1,34 @@
-import networkx as nx
-
 from tools.typing_tools import *
 from tools.constants import Constants
 from tools.positional_tools import *
+from tools.generation_tools import generate_random_int_in_range
 
 class FightingEnemyGraph(Sized):
   """
-  Stores instances of `FightingEnemy` in an undirected graph data structure.
+  Stores the identifiers of instances of `FightingEnemy` in a grid, held as a flat list with one cell per position (in the order given by `length_to_point`).
+
+  Every position is connected to every other, with the distance between them being the Euclidean distance; distances aren't stored, and are calculated when needed with `get_distance`.
+
+  Alongside the cells, the position of each fighting enemy and a pool of the free cells are kept up to date as the grid changes, so finding the enemies (`items`) or a free position (`get_random_free_position`) depends on the number of enemies rather than the number of cells. A fighting enemy can only be at one position, so setting it at a new position removes it from its old one.
+
+  :param dimensions: In the form (x_length, y_length). Defaults to `None`, in which case the grid dimensions in `Constants` are used.
+  :type dimensions: Optional[Position]
   """
-  def __init__(self) -> None:
-    self.dimensions: Position = (Constants.GRID_WIDTH, Constants.GRID_HEIGHT)
-    self.__graph: nx.Graph[Position] = nx.grid_graph(dim=self.dimensions)
+  def __init__(self, dimensions: Optional[Position] = None) -> None:
+    if dimensions == None: dimensions = (Constants.GRID_WIDTH, Constants.GRID_HEIGHT)
+    self.dimensions: Position = dimensions
+    self.__cells: list[Optional[int]] = []
+    self.__positions: dict[int, Position] = {} # maps the identifier of each fighting enemy on the grid to its position
+    self.__free_lengths: list[int] = [] # the cells without a fighting enemy, in no particular order
+    self.__free_slots: dict[int, int] = {} # maps each free cell to its place in `__free_lengths`, so that it can be removed without searching
     self.init_storage()
-    self.add_edges()
 
   # built-in methods
 
   @validate_position_on
   def __call__(self, position: Position) -> Optional[int]:
     return self.get_fighting_enemy_id(position)
-  
+
   @validate_position_on
   def __setitem__(self, position: Position, value: Optional[int]) -> None:
     self.set_fighting_enemy_id(position, value)
@@ -27,10 +36,10 @@ class FightingEnemyGraph(Sized):
   @validate_position_on
   def __getitem__(self, position: Position) -> Optional[int]:
     return self.get_fighting_enemy_id(position)
-  
+
   def __len__(self) -> int:
     return self.dimensions[0]*self.dimensions[1]
-  
+
   # other methods
 
   def length_to_point(self, length: int) -> Position:
@@ -38,10 +47,15 @@ class FightingEnemyGraph(Sized):
     y: int = length // self.dimensions[0]
     return (x,y)
 
+  def point_to_length(self, position: Position) -> int:
+    """The inverse of `length_to_point`, being the position of the cell within the flat list."""
+    (x,y) = position
+    return y*self.dimensions[0] + x
+
   def apply_to_all(self, function: Callable[..., None], **kwargs) -> None:
     """
     Applies a given function, taking inputs of the node position with the kwargs, to every node of the graph.
-    
+
     :param function: Takes an input of `position: Position` first, taking `**kwargs` afterward.
     :type function: Callable[..., None]
     :param kwargs: Keyword arguments passed into `function`.
@@ -52,42 +66,103 @@ class FightingEnemyGraph(Sized):
       function(position=position, **kwargs)
 
   def init_storage(self) -> None:
-    node_count: int = len(self)
-    for i in range(node_count):
-      position = self.length_to_point(i)
-      self.__graph.add_node(position, fighting_enemy_id=None)
+    self.__cells = [None]*len(self)
+    self.__positions = {}
+    self.__free_lengths = list(range(len(self)))
+    self.__free_slots = {length: length for length in self.__free_lengths}
+
+  def __add_free_length(self, length: int) -> None:
+    self.__free_slots[length] = len(self.__free_lengths)
+    self.__free_lengths.append(length)
+
+  def __remove_free_length(self, length: int) -> None:
+    """Swaps the cell with the last free cell, so that it can be popped from the end of the pool."""
+    slot: int = self.__free_slots.pop(length)
+    last_length: int = self.__free_lengths.pop()
+    if last_length != length:
+      self.__free_lengths[slot] = last_length
+      self.__free_slots[last_length] = slot
 
   @validate_position_on
   def set_fighting_enemy_id(self, position: Position, fighting_enemy_id: Optional[int]) -> None:
-    self.__graph.nodes[position]["fighting_enemy_id"] = fighting_enemy_id
+    length: int = self.point_to_length(position)
+    previous_fighting_enemy_id: Optional[int] = self.__cells[length]
+    if previous_fighting_enemy_id == fighting_enemy_id: return None
+    if previous_fighting_enemy_id != None: del self.__positions[previous_fighting_enemy_id]
+    elif fighting_enemy_id != None: self.__remove_free_length(length)
+    if fighting_enemy_id == None: self.__add_free_length(length)
+    else:
+      previous_position: Optional[Position] = self.__positions.get(fighting_enemy_id)
+      if previous_position != None: # moved from elsewhere on the grid
+        previous_length: int = self.point_to_length(previous_position)
+        self.__cells[previous_length] = None
+        self.__add_free_length(previous_length)
+      self.__positions[fighting_enemy_id] = position
+    self.__cells[length] = fighting_enemy_id
 
   @validate_position_on
   def get_fighting_enemy_id(self, position: Position) -> Optional[int]:
-    return self.__graph.nodes[position]["fighting_enemy_id"]
-  
+    return self.__cells[self.point_to_length(position)]
+
   @validate_position_on
   def is_fighting_enemy_at(self, position: Position) -> bool:
     if self.get_fighting_enemy_id(position) == None: return False
     return True
-  
+
   @validate_position_on
   def add_fighting_enemy_id(self, position: Position, fighting_enemy_id: int) -> None:
     if self.is_fighting_enemy_at(position):
       raise MemoryError(f"Attempting to add fighting enemy (id=`{fighting_enemy_id}`) at position `{position}` when there is already an enemy there")
     self.set_fighting_enemy_id(position, fighting_enemy_id)
-  
+
   @validate_position_on
   def clear_fighting_enemy_id(self, position: Position) -> None:
     self.set_fighting_enemy_id(position, None)
 
   def clear_graph(self) -> None:
-    self.apply_to_all(self.clear_fighting_enemy_id)
+    for position in list(self.__positions.values()):
+      self.clear_fighting_enemy_id(position)
 
-  def add_edges(self) -> None:
-    node_count: int = len(self)
-    for l1 in range(node_count-1):
-      p1 = self.length_to_point(l1)
-      for l2 in range(l1+1, node_count):
-        p2 = self.length_to_point(l2)
-        distance: float = calculate_distance(p1, p2)
-        self.__graph.add_edge(p1, p2, distance=distance)
\ No newline at end of file
+  # occupancy
+
+  def items(self) -> list[tuple[Position, int]]:
+    """The position and identifier of every fighting enemy on the grid, in the order given by `length_to_point`. A list is returned, so fighting enemies can be removed while iterating over it."""
+    return sorted(((position, fighting_enemy_id) for (fighting_enemy_id, position) in self.__positions.items()), key=lambda item: self.point_to_length(item[0]))
+
+  def get_occupied_positions(self) -> list[Position]:
+    return [position for (position, _) in self.items()]
+
+  def get_position(self, fighting_enemy_id: int) -> Optional[Position]:
+    """The position of a fighting enemy, or `None` if it isn't on the grid."""
+    return self.__positions.get(fighting_enemy_id)
+
+  def get_fighting_enemy_count(self) -> int:
+    return len(self.__positions)
+
+  def is_full(self) -> bool:
+    return len(self.__free_lengths) == 0
+
+  def get_random_free_position(self) -> Position:
+    """Picks a position without a fighting enemy uniformly at random. Raises a `MemoryError` if the grid is full."""
+    if self.is_full(): raise MemoryError(f"Cannot find a free position when every position of the grid is occupied ({self.dimensions=}).")
+    return self.length_to_point(self.__free_lengths[generate_random_int_in_range(0, len(self.__free_lengths))])
+
+  # distances
+
+  def get_distance(self, p1: Position, p2: Position) -> float:
+    """The Euclidean distance between two positions, being the weight of the edge between them."""
+    validate_position(self.dimensions)(p1)
+    validate_position(self.dimensions)(p2)
+    return calculate_distance(p1, p2)
+
+  @validate_position_on
+  def get_positions_within(self, position: Position, max_distance: float) -> list[Position]:
+    """Every other position at most `max_distance` away from `position`, in the order given by `length_to_point`. Only the cells in the square bounding the circle are checked, rather than the whole grid."""
+    (x, y) = position
+    reach: int = int(max_distance)
+    positions_within: list[Position] = []
+    for other_y in range(max(0, y-reach), min(self.dimensions[1], y+reach+1)):
+      for other_x in range(max(0, x-reach), min(self.dimensions[0], x+reach+1)):
+        other_position: Position = (other_x, other_y)
+        if other_position != position and calculate_distance(position, other_position) <= max_distance: positions_within.append(other_position)
+    return positions_within
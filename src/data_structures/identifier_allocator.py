@@ -0,0 +1,67 @@
+import heapq
+
+from tools.typing_tools import *
+
+class IdentifierAllocator:
+  """
+  Finds the smallest non-negative identifier which isn't in use in O(1), instead of sorting every identifier on each insert.
+
+  Keeps a high-water mark (one more than the largest identifier ever added) and a min-heap of the holes below it. Holes which are filled are removed from the heap lazily, when they reach the top.
+
+  :param identifiers: The identifiers already in use. Defaults to `[]`.
+  :type identifiers: Iterable[int]
+  """
+  def __init__(self, identifiers: Iterable[int] = []) -> None:
+    self.__high_water_mark: int = 0
+    self.__holes: list[int] = [] # min-heap, which may contain identifiers which have since been filled
+    self.__hole_set: set[int] = set() # the holes which are actually free
+    self.rebuild(identifiers)
+
+  def __len__(self) -> int:
+    """The number of identifiers in use."""
+    return self.__high_water_mark - len(self.__hole_set)
+
+  def __repr__(self) -> str:
+    return f"IdentifierAllocator(next={self.get_next_available_identifier()}, {self.__high_water_mark=}, holes={sorted(self.__hole_set)})"
+
+  def rebuild(self, identifiers: Iterable[int]) -> None:
+    """Recalculates the holes from scratch. Used when loading, or when the identifiers are replaced wholesale."""
+    used_identifiers: set[int] = set(identifiers)
+    self.__high_water_mark = max(used_identifiers) + 1 if len(used_identifiers) > 0 else 0
+    self.__hole_set = set(range(self.__high_water_mark)) - used_identifiers
+    self.__holes = sorted(self.__hole_set) # a sorted list is already a valid heap
+
+  def get_next_available_identifier(self) -> int:
+    """Returns the smallest identifier not in use, without reserving it."""
+    while len(self.__holes) > 0:
+      if self.__holes[0] in self.__hole_set: return self.__holes[0]
+      heapq.heappop(self.__holes) # filled since it was freed
+    return self.__high_water_mark
+
+  def get_next_available_identifiers(self, count: int) -> list[int]:
+    """Returns the `count` smallest identifiers not in use, in ascending order, without reserving them."""
+    identifiers: list[int] = heapq.nsmallest(count, self.__hole_set)
+    identifiers += range(self.__high_water_mark, self.__high_water_mark + count - len(identifiers))
+    return identifiers
+
+  def add(self, identifier: int) -> None:
+    """Marks `identifier` as in use."""
+    if identifier >= self.__high_water_mark:
+      for hole in range(self.__high_water_mark, identifier): # skipped identifiers become holes
+        heapq.heappush(self.__holes, hole)
+        self.__hole_set.add(hole)
+      self.__high_water_mark = identifier + 1
+    else:
+      self.__hole_set.discard(identifier)
+
+  def remove(self, identifier: int) -> None:
+    """Marks `identifier` as free."""
+    if identifier >= self.__high_water_mark or identifier in self.__hole_set: return None
+    heapq.heappush(self.__holes, identifier)
+    self.__hole_set.add(identifier)
+
+  def allocate(self) -> int:
+    """Returns the smallest identifier not in use, marking it as in use."""
+    identifier: int = self.get_next_available_identifier()
+    self.add(identifier)
+    return identifier
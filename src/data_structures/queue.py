@@ -17,6 +17,10 @@ class Queue[QueueType](Sized, Loggable):
   def __repr__(self) -> str:
     return f"{self.__queue}"
 
+  def __iter__(self) -> Iterator[QueueType]:
+    """Iterates from the front of the queue to the back without removing anything."""
+    return iter(self.__queue)
+
   # queue operations
   
   def empty(self) -> bool:
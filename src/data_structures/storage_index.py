@@ -0,0 +1,50 @@
+from tools.typing_tools import *
+
+class StorageIndex:
+  """
+  Hash index over the values of a `DataStorageVar`, mapping each key (e.g. a foreign key of the stored objects) to the identifiers of the values holding it. Identifiers are kept in the order they were added, so lookups return them in the same order as the storage.
+
+  :param key: Gets the indexed key of a value. The key of a value must not change while it is in the storage.
+  :type key: Callable[[Any], Any]
+  """
+  def __init__(self, key: Callable[[Any], Any]) -> None:
+    self.key: Callable[[Any], Any] = key
+    self.is_built: bool = False # built lazily, on the first lookup
+    self.count: int = 0 # the number of values indexed, used to notice when the storage was changed without updating the index
+    self.__buckets: dict[Any, dict[int, None]] = {} # dictionaries are used as ordered sets
+
+  def __repr__(self) -> str:
+    return f"StorageIndex({self.is_built=}, {self.count=}, {len(self.__buckets)} keys)"
+
+  def build(self, data: dict[int, Any]) -> None:
+    self.__buckets = {}
+    self.count = 0
+    for (identifier, value) in data.items():
+      self.add(identifier, value)
+    self.is_built = True
+
+  def invalidate(self) -> None:
+    """Called when the storage is replaced wholesale, so that the index is rebuilt on the next lookup."""
+    self.is_built = False
+    self.__buckets = {}
+    self.count = 0
+
+  def add(self, identifier: int, value: Any) -> None:
+    self.__buckets.setdefault(self.key(value), {})[identifier] = None
+    self.count += 1
+
+  def remove(self, identifier: int, value: Any) -> None:
+    key: Any = self.key(value)
+    bucket: Optional[dict[int, None]] = self.__buckets.get(key)
+    if bucket == None or not identifier in bucket: return None
+    del bucket[identifier]
+    if len(bucket) == 0: del self.__buckets[key]
+    self.count -= 1
+
+  def replace(self, identifier: int, old_value: Any, new_value: Any) -> None:
+    if self.key(old_value) == self.key(new_value): return None # keeps the identifier in its current place
+    self.remove(identifier, old_value)
+    self.add(identifier, new_value)
+
+  def get_identifiers(self, key: Any) -> list[int]:
+    return list(self.__buckets.get(key, {}))
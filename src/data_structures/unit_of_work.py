@@ -0,0 +1,54 @@
+from tools.typing_tools import *
+
+class UnitOfWork:
+  """
+  Records which rows of each table have been inserted into or deleted from the storage attributes of `GameData` since they were last saved, so that the changes are written to `Database` together (see `GameData.save_stored`) instead of as each one is made.
+
+  Only identifiers are kept: the storage attributes hold the one copy of each object, and its raw data is read from there when the changes are flushed. Updates aren't recorded here, as changed objects track themselves (see `Stored.is_changed`).
+  """
+  def __init__(self) -> None:
+    self.__inserted: dict[str, dict[int, None]] = {} # dictionaries are used as ordered sets
+    self.__deleted: dict[str, set[int]] = {}
+
+  def __repr__(self) -> str:
+    return f"UnitOfWork(inserted={ {table_name: list(identifiers) for (table_name, identifiers) in self.__inserted.items()} }, deleted={self.__deleted})"
+
+  def __len__(self) -> int:
+    """The number of pending inserts and deletes."""
+    return sum(len(identifiers) for identifiers in self.__inserted.values()) + sum(len(identifiers) for identifiers in self.__deleted.values())
+
+  def register_insert(self, table_name: str, identifier: int) -> None:
+    self.__inserted.setdefault(table_name, {})[identifier] = None
+
+  def register_delete(self, table_name: str, identifier: int) -> None:
+    inserted: dict[int, None] = self.__inserted.get(table_name, {})
+    if identifier in inserted: # the row never reached the table, so there is nothing to delete
+      del inserted[identifier]
+      return None
+    self.__deleted.setdefault(table_name, set()).add(identifier)
+
+  def is_inserted(self, table_name: str, identifier: int) -> bool:
+    return identifier in self.__inserted.get(table_name, {})
+
+  def pop_pending(self, table_name: str) -> tuple[list[int], list[int]]:
+    """
+    Removes and returns the pending changes of a table. Deletes must be applied before inserts, as an identifier freed by a delete may have been given to an inserted row.
+
+    :return: The identifiers of the inserted rows (in the order they were inserted), then those of the deleted rows.
+    :rtype: tuple[list[int], list[int]]
+    """
+    inserted: list[int] = list(self.__inserted.pop(table_name, {}))
+    deleted: list[int] = sorted(self.__deleted.pop(table_name, set()))
+    return (inserted, deleted)
+
+  def copy(self) -> "UnitOfWork":
+    """A copy of the pending changes, which is unaffected by later changes to `self` (see `GameData.transaction`)."""
+    unit_of_work = UnitOfWork()
+    unit_of_work.__inserted = {table_name: identifiers.copy() for (table_name, identifiers) in self.__inserted.items()}
+    unit_of_work.__deleted = {table_name: identifiers.copy() for (table_name, identifiers) in self.__deleted.items()}
+    return unit_of_work
+
+  def clear(self) -> None:
+    """Discards every pending change, e.g. when the storage attributes are reloaded from the database."""
+    self.__inserted = {}
+    self.__deleted = {}
@@ -1,8 +1,21 @@
-__all__ = ["config_data", "condition", "database_main_data", "database", "file_handler", "table"]
+__all__ = ["column_store", "columnar_table", "config_data", "condition", "database_main_data", "database", "file_handler", "journal", "migration", "query_plan", "relationships", "snapshot", "sqlite_backend", "storage_backend", "table", "table_changes", "table_index", "table_transaction", "toml_backend"]
 
+from . import column_store
+from . import columnar_table
 from . import config_data
 from . import condition
 from . import database_main_data
 from . import database
 from . import file_handler
-from . import table
\ No newline at end of file
+from . import journal
+from . import migration
+from . import query_plan
+from . import relationships
+from . import snapshot
+from . import sqlite_backend
+from . import storage_backend
+from . import table
+from . import table_changes
+from . import table_index
+from . import table_transaction
+from . import toml_backend
\ No newline at end of file
@@ -0,0 +1,256 @@
+from array import array
+from itertools import compress, count, repeat
+from collections.abc import MutableMapping
+import operator
+import sys
+
+from tools.typing_tools import *
+
+from database.condition import *
+
+# columns
+
+class Column:
+  """
+  A single column of a `ColumnStore`, holding one field per row in the order the rows are stored. This base class holds any values in a list; subclasses store values of one type more compactly.
+
+  :param values: The fields of the column, in row order. Defaults to `[]`.
+  :type values: Iterable[Any]
+  """
+  def __init__(self, values: Iterable[Any] = []) -> None:
+    self.values: list[Any] = list(values)
+
+  def __len__(self) -> int: return len(self.values)
+
+  def __getitem__(self, position: int) -> Any: return self.values[position]
+
+  def __setitem__(self, position: int, value: Any) -> None: self.values[position] = value
+
+  def __delitem__(self, position: int) -> None: del self.values[position]
+
+  def __iter__(self) -> Iterator[Any]: return iter(self.values)
+
+  def append(self, value: Any) -> None: self.values.append(value)
+
+  def accepts(self, value: Any) -> bool:
+    """Whether `value` can be stored in this column. If not, `ColumnStore` replaces the column with a plain `Column`."""
+    return True
+
+  # vectorised evaluation; each returns the positions of the selected rows
+
+  def find_positions_equal(self, value: Any) -> list[int]:
+    return list(compress(count(), map(operator.eq, self.values, repeat(value))))
+
+  def find_positions_in(self, values: set[Any]) -> list[int]:
+    return list(compress(count(), map(values.__contains__, self.values)))
+
+  def find_positions_in_range(self, lower: Optional[Any], upper: Optional[Any]) -> list[int]:
+    positions: list[int] = []
+    for (position, value) in enumerate(self):
+      if value == None: continue
+      if lower != None and value < lower: continue
+      if upper != None and value > upper: continue
+      positions.append(position)
+    return positions
+
+class ArrayColumn(Column):
+  """
+  Column of `int`, `float` or `bool` fields, packed into an `array` instead of a list of Python objects.
+
+  :param typecode: The `array` typecode used to store the fields (`"q"`, `"d"` or `"b"`).
+  :type typecode: str
+  :param value_type: The exact type of every field. `bool` fields are stored as integers and converted back when read.
+  :type value_type: type
+  """
+  def __init__(self, typecode: str, value_type: type, values: Iterable[Any] = []) -> None:
+    self.value_type: type = value_type
+    self.values: array = array(typecode, values) # type: ignore
+
+  def __getitem__(self, position: int) -> Any:
+    if self.value_type == bool: return bool(self.values[position])
+    return self.values[position]
+
+  def __iter__(self) -> Iterator[Any]:
+    if self.value_type == bool: return map(bool, self.values)
+    return iter(self.values)
+
+  def accepts(self, value: Any) -> bool:
+    if type(value) != self.value_type: return False # `bool` is a subclass of `int`, so types are compared exactly
+    if self.value_type == int: return -2**63 <= value < 2**63
+    return True
+
+  def find_positions_equal(self, value: Any) -> list[int]:
+    if not isinstance(value, (int, float)): return [] # numbers are never equal to anything else
+    return super().find_positions_equal(value)
+
+class StringColumn(Column):
+  """Column of `str` fields. Each distinct string is interned and stored once; rows only hold its integer code, so equality is checked by comparing codes."""
+  def __init__(self, values: Iterable[str] = []) -> None:
+    self.strings: list[str] = [] # maps codes to strings
+    self.codes_by_string: dict[str, int] = {}
+    self.values: array = array("l")
+    for value in values: self.append(value)
+
+  def get_code(self, value: str) -> int:
+    code: Optional[int] = self.codes_by_string.get(value)
+    if code == None:
+      code = len(self.strings)
+      self.strings.append(sys.intern(value))
+      self.codes_by_string[value] = code
+    return code
+
+  def __getitem__(self, position: int) -> Any: return self.strings[self.values[position]]
+
+  def __setitem__(self, position: int, value: Any) -> None: self.values[position] = self.get_code(value)
+
+  def __iter__(self) -> Iterator[Any]: return map(self.strings.__getitem__, self.values)
+
+  def append(self, value: Any) -> None: self.values.append(self.get_code(value))
+
+  def accepts(self, value: Any) -> bool: return type(value) == str
+
+  def find_positions_equal(self, value: Any) -> list[int]:
+    if not isinstance(value, str): return []
+    code: Optional[int] = self.codes_by_string.get(value)
+    if code == None: return []
+    return list(compress(count(), map(operator.eq, self.values, repeat(code))))
+
+  def find_positions_in(self, values: set[Any]) -> list[int]:
+    codes: set[int] = {self.codes_by_string[value] for value in values if isinstance(value, str) and value in self.codes_by_string}
+    return list(compress(count(), map(codes.__contains__, self.values)))
+
+def create_column(values: list[Any]) -> Column:
+  """Picks the most compact column which can hold every one of `values`. Empty columns, and columns whose fields have mixed types (or are `None`), use a plain `Column`."""
+  value_types: set[type] = {type(value) for value in values}
+  if len(value_types) != 1: return Column(values)
+  value_type: type = value_types.pop()
+  if value_type == str: return StringColumn(values)
+  if value_type == float: return ArrayColumn("d", float, values)
+  if value_type == bool: return ArrayColumn("b", bool, values)
+  if value_type == int:
+    try:
+      return ArrayColumn("q", int, values)
+    except OverflowError:
+      return Column(values)
+  return Column(values)
+
+# column store
+
+class ColumnStore(MutableMapping):
+  """
+  Holds the rows of a table column by column (struct-of-arrays) instead of as one list per row. Behaves like the `dict[int, list[Any]]` in `Table.rows`, except that each row read is a new list, so changing it doesn't change the store.
+
+  Rows are kept in the order they were inserted. Reading or writing a single row is slower than with a dictionary, but numeric and string columns use far less memory, and predicates can be evaluated over whole columns at once (see `find_identifiers`).
+
+  :param column_count: The number of non-identifier columns.
+  :type column_count: int
+  """
+  def __init__(self, column_count: int) -> None:
+    self.identifiers: array = array("q")
+    self.positions: dict[int, int] = {} # maps identifiers to their row's position in each column
+    self.columns: list[Column] = [Column() for _ in range(column_count)]
+
+  @classmethod
+  def from_rows(cls, rows: dict[int, list[Any]], column_count: int) -> "ColumnStore":
+    column_store = cls(0)
+    column_store.identifiers = array("q", rows.keys())
+    column_store.positions = {identifier: position for (position, identifier) in enumerate(rows.keys())}
+    column_store.columns = [create_column([row[i] for row in rows.values()]) for i in range(column_count)]
+    return column_store
+
+  def to_dict(self) -> dict[int, list[Any]]:
+    columns: list[list[Any]] = [list(column) for column in self.columns]
+    return {identifier: [column[position] for column in columns] for (position, identifier) in enumerate(self.identifiers)}
+
+  # mapping methods
+
+  def __getitem__(self, identifier: int) -> list[Any]:
+    position: int = self.positions[identifier]
+    return [column[position] for column in self.columns]
+
+  def __setitem__(self, identifier: int, row: list[Any]) -> None:
+    if len(row) != len(self.columns): raise ValueError(f"{row=} has {len(row)} fields, but the store has {len(self.columns)} columns.")
+    position: Optional[int] = self.positions.get(identifier)
+    for (i, value) in enumerate(row):
+      column: Column = self.columns[i]
+      if not column.accepts(value): # e.g. a `None` in an integer column
+        column = Column(column)
+        self.columns[i] = column
+      if position == None: column.append(value)
+      else: column[position] = value
+    if position == None:
+      self.positions[identifier] = len(self.identifiers)
+      self.identifiers.append(identifier)
+
+  def __delitem__(self, identifier: int) -> None:
+    position: int = self.positions.pop(identifier)
+    del self.identifiers[position]
+    for column in self.columns:
+      del column[position]
+    for later_position in range(position, len(self.identifiers)): # every later row moves back by one
+      self.positions[self.identifiers[later_position]] = later_position
+
+  def __contains__(self, identifier: object) -> bool: return identifier in self.positions
+
+  def __iter__(self) -> Iterator[int]: return iter(self.identifiers)
+
+  def __len__(self) -> int: return len(self.identifiers)
+
+  def __repr__(self) -> str: return f"ColumnStore({len(self)} rows, {[type(column).__name__ for column in self.columns]})"
+
+  # schema changes
+
+  def add_column(self) -> None:
+    self.columns.append(Column([None] * len(self)))
+
+  def drop_column(self, position: int) -> None:
+    del self.columns[position]
+
+  # vectorised evaluation
+
+  def get_column(self, column_name: str, column_names: list[str]) -> Column:
+    column_position: int = get_column_position(column_name, column_names)
+    if column_position != -1: return self.columns[column_position]
+    identifier_column = ArrayColumn("q", int)
+    identifier_column.values = self.identifiers # shared rather than copied, as it is only read
+    return identifier_column
+
+  def find_positions(self, predicate: Predicate, column_names: list[str]) -> Optional[set[int]]:
+    """Evaluates `predicate` over whole columns, returning the positions of the selected rows. Returns `None` if the predicate contains a `Where`, which can only be evaluated row by row."""
+    match predicate:
+      case Everything(): return set(range(len(self)))
+      case Nothing(): return set()
+      case MatchingIdentifiers(identifiers=identifiers):
+        return {self.positions[identifier] for identifier in identifiers if identifier in self.positions}
+      case Eq(column_name=column_name, value=value):
+        return set(self.get_column(column_name, column_names).find_positions_equal(value))
+      case In(column_name=column_name, values=values):
+        return set(self.get_column(column_name, column_names).find_positions_in(values))
+      case Range(column_name=column_name, lower=lower, upper=upper):
+        return set(self.get_column(column_name, column_names).find_positions_in_range(lower, upper))
+      case And(predicates=predicates):
+        positions: Optional[set[int]] = None
+        for child in predicates:
+          child_positions: Optional[set[int]] = self.find_positions(child, column_names)
+          if child_positions == None: return None
+          positions = child_positions if positions == None else positions & child_positions
+          if len(positions) == 0: break
+        return positions if positions != None else set(range(len(self)))
+      case Or(predicates=predicates):
+        positions = set()
+        for child in predicates:
+          child_positions = self.find_positions(child, column_names)
+          if child_positions == None: return None
+          positions |= child_positions
+        return positions
+      case Not(predicate=child):
+        child_positions = self.find_positions(child, column_names)
+        if child_positions == None: return None
+        return set(range(len(self))) - child_positions
+      case _: return None
+
+  def find_identifiers(self, predicate: Predicate, column_names: list[str]) -> Optional[list[int]]:
+    """The identifiers of every row selected by `predicate`, in the order the rows are stored. Returns `None` if the predicate can't be evaluated over whole columns."""
+    positions: Optional[set[int]] = self.find_positions(predicate, column_names)
+    if positions == None: return None
+    return [self.identifiers[position] for position in sorted(positions)]
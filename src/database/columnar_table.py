@@ -0,0 +1,51 @@
+from tools.typing_tools import *
+
+from database.condition import *
+from database.table import Table
+from database.column_store import ColumnStore
+
+class ColumnarTable(Table):
+  """
+  `Table` whose rows are held in a `ColumnStore` rather than a dictionary of lists. Intended for static tables, which are read far more often than they are written: they take up less memory, and conditions which would otherwise scan every row are evaluated over whole columns instead.
+
+  Takes the same parameters as `Table`.
+  """
+  def __init__(self, name: str, column_names: list[str], indexed_column_names: list[str] = [], is_logging_enabled: bool = False, tag: Optional[str] = None, include_call_stack: bool = False) -> None:
+    super().__init__(name, column_names, indexed_column_names, is_logging_enabled, tag, include_call_stack)
+    self.rows: ColumnStore = ColumnStore(len(self.get_non_identifier_column_names())) # type: ignore
+
+  def load_rows(self, rows: dict[int, list[Any]]) -> None:
+    super().load_rows(ColumnStore.from_rows(rows, len(self.get_non_identifier_column_names()))) # type: ignore
+
+  def rows_to_dict(self) -> dict[int, list[Any]]:
+    return self.rows.to_dict()
+
+  # queries
+
+  def scan(self, predicate: Predicate) -> list[int]:
+    identifiers: Optional[list[int]] = self.rows.find_identifiers(predicate, self.column_names)
+    if identifiers == None: return super().scan(predicate) # `Where` can only be evaluated row by row
+    return identifiers
+
+  def get_identifiers_where_equal(self, column_name: str, value: Any) -> set[int]:
+    if self.is_column_indexed(column_name): return super().get_identifiers_where_equal(column_name, value)
+    return set(cast(list[int], self.rows.find_identifiers(Eq(column_name, value), self.column_names))) # equality never needs a row by row scan
+
+  # schema changes; rows read from a `ColumnStore` are copies, so columns are changed in the store itself
+
+  def add_column(self, name: str) -> None:
+    if name in self.column_names:
+      raise Exception(f"Column `{name}` already exists.")
+    self.column_names.append(name)
+    self.rows.add_column()
+    self.changes.record_schema_change()
+
+  def drop_column(self, name: str) -> None:
+    if not (name in self.column_names):
+      raise Exception(f"Cannot remove column `{name}` which does not exist.")
+    dropped_index: int = self.get_column_position(name)
+    self.drop_index(name)
+    self.column_names = [column_name for column_name in self.column_names if column_name != name]
+    self.rows.drop_column(dropped_index)
+    self.rebuild_indexes() # positions of the remaining indexed columns may have shifted
+    self.changes.record_schema_change()
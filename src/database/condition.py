@@ -1,13 +1,152 @@
 from tools.typing_tools import *
+from tools.custom_exceptions import AbstractMethodCallError
 
-type Condition = Callable[[int, list[Any]], bool]
+type RowFilter = Callable[[int, list[Any]], bool]
+"Takes the identifier of a record and its fields (without the identifier), returning whether the record is selected."
+type Condition = Union[Predicate, RowFilter]
+"""
+Either a declarative `Predicate`, which `Table` can inspect in order to use direct lookups and indexes, or an opaque `RowFilter` which is always evaluated over every row.
 
-def everything() -> Condition: return lambda _identifier, _row: True
+Predicates refer to columns by name. Before being evaluated against raw rows, they must be bound to the column names of the table the rows come from (see `bind_condition`).
+"""
 
-def nothing() -> Condition: return lambda _identifier, _row: False
+def get_column_position(column_name: str, column_names: list[str]) -> int:
+  """
+  :param column_names: All column names of a table, including the identifier column (which is always first).
+  :type column_names: list[str]
+  :return: The position of the column's field in a row without the identifier. Is `-1` for the identifier column itself.
+  :rtype: int
+  """
+  if not column_name in column_names: raise KeyError(f"Column `{column_name}` not found in {column_names=}.")
+  return column_names.index(column_name) - 1
 
-def matching_identifiers(specific_identifier: int) -> Condition:
-  return lambda identifier, _row: specific_identifier == identifier
+def get_field_getter(column_name: str, column_names: list[str]) -> Callable[[int, list[Any]], Any]:
+  position: int = get_column_position(column_name, column_names)
+  if position == -1: return lambda identifier, _row: identifier
+  return lambda _identifier, row: row[position]
+
+# predicates
+
+@dataclass
+class Predicate:
+  """Abstract base class for all declarative conditions."""
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    """Compiles the predicate into a `RowFilter` for rows of a table with the given column names (including the identifier column)."""
+    raise AbstractMethodCallError(Predicate.__name__, self.bind.__name__)
+
+  # combining predicates
+
+  def __and__(self, other: "Predicate") -> "Predicate": return And([self, other])
+
+  def __or__(self, other: "Predicate") -> "Predicate": return Or([self, other])
+
+  def __invert__(self) -> "Predicate": return Not(self)
+
+@dataclass
+class Everything(Predicate):
+  def bind(self, column_names: list[str]) -> RowFilter: return lambda _identifier, _row: True
+
+@dataclass
+class Nothing(Predicate):
+  def bind(self, column_names: list[str]) -> RowFilter: return lambda _identifier, _row: False
+
+@dataclass
+class MatchingIdentifiers(Predicate):
+  """Selects the records with any of the given identifiers."""
+  identifiers: set[int]
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    identifiers: set[int] = self.identifiers
+    return lambda identifier, _row: identifier in identifiers
+
+@dataclass
+class Eq(Predicate):
+  """Selects the records whose field in `column_name` is equal to `value`."""
+  column_name: str
+  value: Any
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    get_field = get_field_getter(self.column_name, column_names)
+    value: Any = self.value
+    return lambda identifier, row: get_field(identifier, row) == value
+
+@dataclass
+class In(Predicate):
+  """Selects the records whose field in `column_name` is equal to any of `values`. Values must be hashable."""
+  column_name: str
+  values: set[Any]
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    get_field = get_field_getter(self.column_name, column_names)
+    values: set[Any] = self.values
+    return lambda identifier, row: get_field(identifier, row) in values
+
+@dataclass
+class Range(Predicate):
+  """Selects the records whose field in `column_name` lies between `lower` and `upper` (inclusive). A bound of `None` is unbounded."""
+  column_name: str
+  lower: Optional[Any] = None
+  upper: Optional[Any] = None
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    get_field = get_field_getter(self.column_name, column_names)
+    (lower, upper) = (self.lower, self.upper)
+    def is_in_range(identifier: int, row: list[Any]) -> bool:
+      field_value: Any = get_field(identifier, row)
+      if field_value == None: return False
+      if lower != None and field_value < lower: return False
+      if upper != None and field_value > upper: return False
+      return True
+    return is_in_range
+
+@dataclass
+class And(Predicate):
+  predicates: list[Predicate]
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    row_filters: list[RowFilter] = [predicate.bind(column_names) for predicate in self.predicates]
+    return lambda identifier, row: all(row_filter(identifier, row) for row_filter in row_filters)
+
+@dataclass
+class Or(Predicate):
+  predicates: list[Predicate]
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    row_filters: list[RowFilter] = [predicate.bind(column_names) for predicate in self.predicates]
+    return lambda identifier, row: any(row_filter(identifier, row) for row_filter in row_filters)
+
+@dataclass
+class Not(Predicate):
+  predicate: Predicate
+
+  def bind(self, column_names: list[str]) -> RowFilter:
+    row_filter: RowFilter = self.predicate.bind(column_names)
+    return lambda identifier, row: not row_filter(identifier, row)
+
+@dataclass
+class Where(Predicate):
+  """Wraps an opaque `RowFilter`. Cannot be planned, so it is always evaluated against every candidate row."""
+  row_filter: RowFilter
+
+  def bind(self, column_names: list[str]) -> RowFilter: return self.row_filter
+
+# functions
+
+def to_predicate(condition: Condition) -> Predicate:
+  if isinstance(condition, Predicate): return condition
+  return Where(condition)
+
+def bind_condition(condition: Condition, column_names: list[str]) -> RowFilter:
+  """Turns any condition into a `RowFilter` which can be evaluated directly against rows of a table with the given column names."""
+  return to_predicate(condition).bind(column_names)
+
+def everything() -> Condition: return Everything()
+
+def nothing() -> Condition: return Nothing()
+
+def matching_identifiers(*specific_identifiers: int) -> Condition:
+  return MatchingIdentifiers(set(specific_identifiers))
 
 def get_condition_inverse(condition: Condition) -> Condition:
-  return lambda identifier, row: not condition(identifier, row)
\ No newline at end of file
+  return Not(to_predicate(condition))
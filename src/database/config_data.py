@@ -2,4 +2,7 @@ from tools.typing_tools import *
 
 @dataclass
 class ConfigData():
-  version: str
\ No newline at end of file
+  version: str
+  storage_backend: str = "toml" # used when creating a new database; existing databases keep their own backend
+  is_snapshot_enabled: bool = True # whether the TOML backend keeps a binary snapshot for fast loading
+  is_columnar_storage_enabled: bool = True # whether static tables are held column by column in memory
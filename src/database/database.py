@@ -1,21 +1,53 @@
+import threading
+from contextlib import contextmanager
+
 from tools.typing_tools import *
 from tools.constants import TableName
 
 from database.table import Table
-from database.condition import Condition
+from database.columnar_table import ColumnarTable
+from database.condition import Condition, In
+from database.relationships import Relationships
 from database.file_handler import FileHandler
+from database.journal import JournalEntry
+from database.storage_backend import StorageBackend
+from database.snapshot import SnapshotTable
+from database.toml_backend import TomlBackend
+from database.sqlite_backend import SqliteBackend
 from database.database_main_data import DatabaseMainData
 from database.config_data import ConfigData
 
+def create_storage_backend(backend_name: str, file_handler: FileHandler, config_data: ConfigData) -> StorageBackend:
+  match backend_name:
+    case TomlBackend.NAME: return TomlBackend(file_handler, config_data.is_snapshot_enabled)
+    case SqliteBackend.NAME: return SqliteBackend(file_handler)
+    case _: raise ValueError(f"Unknown storage backend `{backend_name}`; expected `{TomlBackend.NAME}` or `{SqliteBackend.NAME}`.")
+
+def find_storage_backend(file_handler: FileHandler, config_data: ConfigData) -> StorageBackend:
+  """Returns the backend of the existing database, or a new backend of the configured type if no database exists yet. SQLite takes priority, as migrating to it leaves the TOML files in place."""
+  sqlite_backend = SqliteBackend(file_handler)
+  if sqlite_backend.exists(): return sqlite_backend
+  toml_backend = TomlBackend(file_handler, config_data.is_snapshot_enabled)
+  if toml_backend.exists(): return toml_backend
+  return create_storage_backend(config_data.storage_backend, file_handler, config_data)
+
 class Database:
   def __init__(self, name: str, tables: dict[str, Table] = {}, table_names: list[str] = []) -> None:
     self.name: str = name
-    self.tables: dict[str, Table] = tables
+    self.tables: dict[str, Table] = tables.copy() # only holds tables which have been loaded; see `find_table`
     self.file_handler = FileHandler()
-    self.table_names = table_names
+    self.table_names = table_names.copy() # copied so that the default list is never appended to
     self.deleted_table_names: list[str] = []
+    self.is_main_data_dirty: bool = True # whether the main data needs to be rewritten on the next save
+    self.lock = threading.RLock() # held for every save, load and change to `tables`, which may happen on a background thread (saves and prefetches), and for every use of the backend, which isn't thread-safe by itself
+    self.snapshot_tables: Optional[dict[str, SnapshotTable]] = None # up-to-date tables from the backend's snapshot which haven't been loaded yet; `None` until first needed
+    self.index_templates: dict[str, list[str]] = {} # maps table names to the columns which are given secondary indexes
+    self.static_table_names: set[str] = set() # tables which never change while the game is running
+    self.relationships = Relationships() # the foreign keys between tables, used by `join`
+    self.transaction_tables: Optional[list[Table]] = None # the tables taking part in the current `transaction`, or `None` if there isn't one
 
     self.config_data: ConfigData = self.get_config_data()
+    self.backend: StorageBackend = find_storage_backend(self.file_handler, self.config_data)
 
     self.save_on_delete: bool = True
 
@@ -31,70 +63,174 @@ class Database:
     return self.file_handler.get_config_data()
   
   def exists(self) -> bool:
-    """Uses the `file_handler.does_data_directory_exist()` method to determine whether the database has already been created in memory or not."""
-    if self.file_handler.does_data_directory_exist(): return True
-    return False
+    """Uses the `backend.exists()` method to determine whether the database has already been created in storage or not."""
+    with self.lock:
+      return self.backend.exists()
   
   def create_main(self, table_names: list[str] = []) -> None:
-    if not self.file_handler.does_data_directory_exist():
-      self.file_handler.create_directory("data")
     if table_names != []: self.table_names = table_names
     main_data: DatabaseMainData = DatabaseMainData(self.table_names, self.config_data.version)
-    self.file_handler.save_file("MAIN", main_data.to_dict())
+    with self.lock:
+      self.backend.create(main_data.to_dict())
+
+  def set_index_templates(self, index_templates: dict[TableName, list[str]]) -> None:
+    """Declares which columns of each table are indexed. Applies to tables already in memory as well as any created or loaded afterward."""
+    self.index_templates = {str(table_name): column_names.copy() for (table_name, column_names) in index_templates.items()}
+    with self.lock:
+      self.backend.index_templates = self.index_templates
+      for (table_name, table) in self.tables.items():
+        for column_name in self.get_indexed_column_names(table_name):
+          table.create_index(column_name)
+
+  def get_indexed_column_names(self, table_name: str) -> list[str]:
+    return self.index_templates.get(table_name, [])
+
+  def set_static_table_names(self, static_table_names: list[TableName]) -> None:
+    """Declares which tables are static. Unless disabled in the config, static tables created or loaded afterward are held as a `ColumnarTable`."""
+    self.static_table_names = {str(table_name) for table_name in static_table_names}
+
+  def set_relationships(self, table_templates: dict[TableName, list[str]]) -> None:
+    """Finds the foreign keys between tables from their column names (see `Relationships`)."""
+    self.relationships = Relationships(table_templates)
+
+  def create_table_object(self, table_name: str, column_names: list[str]) -> Table:
+    if self.config_data.is_columnar_storage_enabled and table_name in self.static_table_names:
+      return ColumnarTable(table_name, column_names, self.get_indexed_column_names(table_name))
+    return Table(table_name, column_names, self.get_indexed_column_names(table_name))
 
   def init_tables(self, table_templates: dict[TableName, list[str]]) -> None:
     for (table_name, columns) in table_templates.items():
       self.create_table(table_name, columns)
 
   def load(self) -> None:
-    """Fetches the database from storage, loading all tables specified in `self.table_names`. Raises a `ValueError` if `self.table_names` is empty."""
+    """Fetches the list of tables from storage. Raises a `ValueError` if there are no tables. Each table is only loaded once it is first needed (see `find_table`), or when prefetched."""
     main_data: DatabaseMainData = self.load_main_data()
     table_names: list[str] = main_data.table_names
     version: str = main_data.version
     if table_names == []: raise ValueError(f"Expected a non-empty list of table names; instead got {table_names}.")
-    self.table_names = table_names
-    for table_name in self.table_names:
-      raw_table: dict = self.file_handler.load_file(table_name)
-      self.load_table(table_name, raw_table)
+    with self.lock:
+      self.table_names = table_names
+      self.tables = {}
+      self.snapshot_tables = None
+    self.is_main_data_dirty = version != self.config_data.version
+
+  def is_table_loaded(self, table_name: str) -> bool:
+    return table_name in self.tables
+
+  def load_table_by_name(self, table_name: str) -> None:
+    """Loads a table from its snapshot if it has an up-to-date one, otherwise from the backend. Does nothing if it has already been loaded."""
+    with self.lock:
+      if self.is_table_loaded(table_name): return None
+      if self.snapshot_tables == None: self.snapshot_tables = self.backend.load_snapshot(self.table_names) # the whole snapshot is read at once, as it is cheap to unpickle
+      if table_name in self.snapshot_tables:
+        (column_names, rows) = self.snapshot_tables.pop(table_name)
+        self.load_rows_into_table(table_name, column_names, rows)
+      else:
+        self.load_table(table_name, self.backend.load_table(table_name))
+
+  def load_all_tables(self) -> None:
+    for table_name in self.table_names.copy():
+      self.load_table_by_name(table_name)
+
+  def prefetch(self, table_names: list[str]) -> threading.Thread:
+    """Loads the given tables on a background thread, so that they are ready by the time they are needed. Tables which are already loaded (or don't exist) are skipped."""
+    def prefetch_tables() -> None:
+      for table_name in table_names:
+        if table_name in self.table_names: self.load_table_by_name(table_name)
+    prefetch_thread = threading.Thread(target=prefetch_tables, name=f"{self.name}-prefetch", daemon=True)
+    prefetch_thread.start()
+    return prefetch_thread
 
   def load_table(self, table_name: str, raw_table: dict[str, Any]) -> None:
     """Fetches each table from secondary storage."""
     column_names: list = raw_table["column_names"] 
 
-    table = Table(table_name, column_names)
-
     identifier_name: str = column_names[0] # identifier name will always be the first element in the column_names list
-    identifier: int = 0
-    rows: list[Any] = raw_table["rows"]
-    for row in rows: # stores each value in the table
-      identifier = row[identifier_name]
-      table.insert_with_identifier(row, identifier)
+    non_identifier_column_names: list[str] = column_names[1:]
+    rows: dict[int, list[Any]] = {}
+    for raw_row in raw_table["rows"]: # missing fields (i.e. `None`, which TOML can't store) are filled in as in `Table.format_raw_row`
+      rows[raw_row[identifier_name]] = [raw_row.get(column_name) for column_name in non_identifier_column_names]
+    self.load_rows_into_table(table_name, column_names, rows)
+
+  def load_rows_into_table(self, table_name: str, column_names: list[str], rows: dict[int, list[Any]]) -> None:
+    table: Table = self.create_table_object(table_name, column_names)
+    table.load_rows(rows) # the table matches what is saved, so it starts clean
     self.tables[table_name] = table
 
+  def get_snapshot_tables(self, table_names: list[str]) -> dict[str, SnapshotTable]:
+    """Each table in `table_names` which is loaded or is still only in the previous snapshot (which cannot have changed, as it hasn't been loaded)."""
+    snapshot_tables: dict[str, SnapshotTable] = {}
+    with self.lock:
+      for table_name in table_names:
+        table: Optional[Table] = self.tables.get(table_name)
+        if table != None: snapshot_tables[table_name] = (table.column_names, table.rows_to_dict())
+        elif self.snapshot_tables != None and table_name in self.snapshot_tables: snapshot_tables[table_name] = self.snapshot_tables[table_name]
+    return snapshot_tables
+
+  def recover(self) -> None:
+    """Finishes any save which was interrupted (see `StorageBackend.recover`)."""
+    with self.lock:
+      self.backend.recover()
+
   def load_main_data(self) -> DatabaseMainData:
-    if self.file_handler.does_data_directory_exist():
-      raw_main_data: dict[str, Any] = self.file_handler.load_file("MAIN")
-      main_data: DatabaseMainData = DatabaseMainData(raw_main_data["table_names"], raw_main_data["version"])
-    else: raise Exception(f"`data` directory doesn't exist.")
+    with self.lock:
+      if self.backend.exists():
+        self.recover()
+        raw_main_data: dict[str, Any] = self.backend.load_main_data()
+        main_data: DatabaseMainData = DatabaseMainData(raw_main_data["table_names"], raw_main_data["version"])
+      else: raise Exception(f"Database doesn't exist.")
     return main_data
 
-  def save(self) -> None:
-    self.save_main_data()
-    for table_name in self.table_names:
-      self.save_table(table_name)
-    for deleted_table_name in self.deleted_table_names:
-      self.file_handler.delete_file(deleted_table_name)
+  def save(self, checkpoint: bool = True) -> None:
+    """
+    Writes every change made since the last save to the backend as a single `JournalEntry`, so that only changed rows are written.
+
+    :param checkpoint: Whether backends which journal their saves (i.e. TOML) should then also rewrite the changed tables and clear the journal. If `False`, the save only costs as much as the change, which makes frequent autosaves cheap. Defaults to `True`.
+    :type checkpoint: bool
+    """
+    with self.lock:
+      entry: JournalEntry = self.create_journal_entry()
+      self.backend.save(entry, checkpoint, self.get_raw_table)
+      self.mark_saved(entry)
+      if checkpoint: self.backend.save_snapshot(self.table_names, self.get_snapshot_tables)
+
+  def create_journal_entry(self) -> JournalEntry:
+    entry = JournalEntry()
+    if self.is_main_data_dirty: entry.main_data = self.get_main_data().to_dict()
+    entry.deleted_table_names = self.deleted_table_names.copy()
+    for table_name in self.get_dirty_table_names():
+      table: Table = self.find_table(table_name)
+      if table.changes.is_schema_changed: entry.full_tables[table_name] = table.to_file()
+      else: entry.table_changes[table_name] = table.changes_to_file()
+    return entry
+
+  def mark_saved(self, entry: JournalEntry) -> None:
+    self.is_main_data_dirty = False
+    self.deleted_table_names = []
+    for table_name in entry.get_table_names():
+      self.find_table(table_name).mark_clean()
+
+  def checkpoint(self) -> None:
+    with self.lock:
+      self.backend.checkpoint(self.get_raw_table)
 
-  def save_main_data(self) -> None:
+  def get_raw_table(self, table_name: str) -> Optional[dict[str, Any]]:
+    if not table_name in self.table_names: return None
+    return self.find_table(table_name).to_file()
+
+  def get_dirty_table_names(self) -> list[str]:
+    """Tables which haven't been loaded can't have changed, so they are never loaded here."""
+    return [table_name for table_name in self.table_names if self.is_table_loaded(table_name) and self.find_table(table_name).is_dirty()]
+
+  def is_dirty(self) -> bool:
+    """`True` if anything would be written by `save`."""
+    return self.is_main_data_dirty or self.deleted_table_names != [] or self.get_dirty_table_names() != []
+
+  def get_main_data(self) -> DatabaseMainData:
     main_data: DatabaseMainData = DatabaseMainData(self.table_names, self.config_data.version)
     if main_data.table_names == []:
       main_data = self.load_main_data()
-    self.file_handler.save_file("MAIN", main_data.to_dict())
-
-  def save_table(self, table_name: str) -> None:
-    table: Table = self.find_table(table_name)
-    file: dict = table.to_file()
-    self.file_handler.save_file(table_name, file)
+    return main_data
 
   def is_version_updated(self) -> bool:
     main_data: DatabaseMainData = self.load_main_data()
@@ -104,17 +240,60 @@ class Database:
   def is_identifier_in_table(self, identifier: int, table_name: str) -> bool:
     return self.find_table(table_name).has_key(identifier)
 
+  # transactions
+
+  @contextmanager
+  def transaction(self) -> Iterator[None]:
+    """
+    Groups the changes made within the `with` block, so that they either all happen or none do. If an exception is raised, every row changed in the block is restored and the exception is re-raised; otherwise the changes are committed when the block exits. Secondary indexes are only brought up to date at the commit (or when they are read within the block), so a row changed by several steps is only re-indexed once.
+
+    Saves and prefetches from other threads wait until the transaction has finished, so they never write half of one or add a table part-way through. A transaction started within another is part of the outer one. Schema changes (e.g. `add_column`) and tables which are created or deleted are not rolled back.
+    """
+    with self.lock:
+      if self.transaction_tables != None: # nested within an outer transaction, which commits or rolls back the changes
+        yield None
+        return None
+      self.transaction_tables = []
+      for table in self.tables.values():
+        self.join_transaction(table)
+      try:
+        yield None
+      except BaseException:
+        for table in self.transaction_tables:
+          table.rollback_transaction()
+        raise
+      else:
+        for table in self.transaction_tables:
+          table.commit_transaction()
+      finally:
+        self.transaction_tables = None
+
+  def join_transaction(self, table: Table) -> None:
+    """Adds a table to the current transaction. Tables loaded part-way through a transaction join it when they are first found by `find_table`."""
+    table.begin_transaction()
+    cast(list[Table], self.transaction_tables).append(table)
+
+  def is_in_transaction(self) -> bool:
+    return self.transaction_tables != None
+
   # SQL queries
 
   def find_table(self, table_name: str) -> Table:
-    try:
-      table: Table = self.tables[table_name]
-    except:
-      raise NameError(f"Table {table_name} does not exist.")
+    """Returns the table with the given name, loading it first if needed. Raises a `NameError` if the table doesn't exist."""
+    table: Optional[Table] = self.tables.get(table_name) # a single lookup is safe without `lock`, so tables which are already loaded are found without waiting
+    if table == None:
+      if not table_name in self.table_names: raise NameError(f"Table {table_name} does not exist.")
+      self.load_table_by_name(table_name)
+      table = self.tables[table_name]
+    if self.transaction_tables != None and table.transaction == None: self.join_transaction(table)
     return table
 
   def select(self, table_name: str, columns: list[str], condition: Condition) -> dict[int, list[Any]]:
     return self.find_table(table_name).select(columns, condition)
+
+  def select_where_equal(self, table_name: str, columns: list[str], column_name: str, value: Any) -> dict[int, list[Any]]:
+    """Selects every record whose field in `column_name` equals `value`, using the column's secondary index if it has one."""
+    return self.find_table(table_name).select_where_equal(columns, column_name, value)
   
   def update(self, table_name: str, columns_to_values: dict[str, Any], condition: Condition) -> None:
     table: Table = self.find_table(table_name)
@@ -130,29 +309,90 @@ class Database:
     if identifier == None: return table.insert(columns_to_values)
     else: return table.insert_with_identifier(columns_to_values, identifier)
 
+  def insert_many(self, table_name: str, rows: list[dict[str, Any]], identifiers: Optional[list[int]] = None) -> list[int]:
+    """Inserts several records into a specified table at once, returning their identifiers."""
+    return self.find_table(table_name).insert_many(rows, identifiers)
+
+  def update_many(self, table_name: str, identifiers_to_values: dict[int, dict[str, Any]]) -> None:
+    """Updates several records in a specified table at once, each with its own `column: field` values."""
+    self.find_table(table_name).update_many(identifiers_to_values)
+
+  def delete_many(self, table_name: str, identifiers: Iterable[int]) -> None:
+    """Deletes the records with the given identifiers from a specified table."""
+    self.find_table(table_name).delete_many(identifiers)
+
+  def join(self, table_names: list[str], identifiers: Iterable[int]) -> list[int]:
+    """
+    Finds the records related to `identifiers` by following the foreign keys between each consecutive pair of tables in `table_names` (e.g. `["Item", "ItemAbility", "Ability"]` finds the abilities of the given items).
+
+    Each step is a hash join: when the source table holds the foreign key its field is read from each source record, otherwise the target table's foreign key column is looked up, using its index if it has one.
+
+    :param table_names: The tables to join, starting with the table which `identifiers` belong to.
+    :type table_names: list[str]
+    :param identifiers: Identifiers of records in the first table.
+    :type identifiers: Iterable[int]
+    :return: The identifiers of the related records in the last table, in ascending order.
+    :rtype: list[int]
+    """
+    selected_identifiers: set[int] = set(identifiers)
+    for (source_table_name, target_table_name) in zip(table_names, table_names[1:]):
+      join_step = self.relationships.get_join_step(source_table_name, target_table_name)
+      column_name: str = join_step.foreign_key.column_name
+      target_table: Table = self.find_table(target_table_name)
+      if join_step.is_forward:
+        source_table: Table = self.find_table(source_table_name)
+        position: int = source_table.get_column_position(column_name)
+        referenced_identifiers: set[int] = {source_table[identifier][position] for identifier in selected_identifiers if source_table.has_key(identifier)}
+        selected_identifiers = {identifier for identifier in referenced_identifiers if target_table.has_key(identifier)}
+      else:
+        selected_identifiers = set(target_table.find_identifiers(In(column_name, selected_identifiers)))
+    return sorted(selected_identifiers)
+
   def create_table(self, table_name: str, column_names: list[str]) -> None:
     """Initialises the given table in memory."""
     if table_name in self.table_names:
       raise BufferError(f"Table {table_name} already exists.")
-    table = Table(table_name, column_names)
-    self.tables[table_name] = table
-    self.table_names.append(table_name)
+    with self.lock:
+      self.tables[table_name] = self.create_table_object(table_name, column_names)
+      self.table_names.append(table_name)
+    if table_name in self.deleted_table_names: self.deleted_table_names.remove(table_name) # its file is overwritten instead
+    self.is_main_data_dirty = True
 
   def delete_table(self, table_name: str) -> None:
-    self.table_names = list(filter(lambda element : element != table_name, self.table_names))
-    self.deleted_table_names.append(table_name)
-    self.tables.pop(table_name)
+    with self.lock:
+      self.table_names = list(filter(lambda element : element != table_name, self.table_names))
+      self.deleted_table_names.append(table_name)
+      self.tables.pop(table_name, None)
+      if self.snapshot_tables != None: self.snapshot_tables.pop(table_name, None)
+    self.is_main_data_dirty = True
+
+  def create_index(self, table_name: str, column_name: str) -> None:
+    self.find_table(table_name).create_index(column_name)
+
+  def drop_index(self, table_name: str, column_name: str) -> None:
+    self.find_table(table_name).drop_index(column_name)
 
   def add_column(self, table_name: str, column_name: str) -> None:
     self.find_table(table_name).add_column(column_name)
 
   def drop_column(self, table_name: str, column_name: str) -> None:
     self.find_table(table_name).drop_column(column_name)
+    indexed_column_names: list[str] = self.get_indexed_column_names(table_name)
+    if column_name in indexed_column_names: indexed_column_names.remove(column_name)
 
   def rename_column(self, table_name: str, name: str, new_name: str) -> None:
     self.find_table(table_name).rename_column(name, new_name)
+    indexed_column_names: list[str] = self.get_indexed_column_names(table_name)
+    if name in indexed_column_names: indexed_column_names[indexed_column_names.index(name)] = new_name
 
   def rename_table(self, table_name: str, new_name: str) -> None:
     table: Table = self.find_table(table_name)
     table.rename_table(new_name)
-    self.tables[new_name] = self.tables.pop(table_name)
\ No newline at end of file
+    with self.lock:
+      self.tables[new_name] = self.tables.pop(table_name)
+    if table_name in self.table_names: # the table is saved under its new name, so the old file is removed
+      self.table_names[self.table_names.index(table_name)] = new_name
+      self.deleted_table_names.append(table_name)
+      self.is_main_data_dirty = True
+    if table_name in self.index_templates:
+      self.index_templates[new_name] = self.index_templates.pop(table_name)
\ No newline at end of file
@@ -1,4 +1,5 @@
 import toml
+import json
 import os
 import pathlib
 import re
@@ -42,10 +43,47 @@ class FileHandler:
       return os.path.join(self.data_path(), file_name)
     return os.path.join(file_name)
 
+  def data_file_path(self, file_name: str) -> str:
+    """Path of a non-TOML file (e.g. the journal) in the data directory. `file_name` must include its extension."""
+    return os.path.join(self.data_path(), file_name)
+
+  def does_file_exist(self, file_name: str) -> bool:
+    return os.path.isfile(self.toml_file_path(file_name))
+
   def save_file(self, file_name: str, data: dict[str, Any]) -> None:
+    """Atomically replaces the file: the data is written to a temporary file which is synced to disk and then renamed over the original, so a crash can never leave a half-written file."""
     file_path: str = self.toml_file_path(file_name)
-    with open(file_path, 'w') as f:
+    temporary_file_path: str = file_path + ".tmp"
+    with open(temporary_file_path, 'w') as f:
       toml.dump(data, f)
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace(temporary_file_path, file_path)
+    self.sync_directory(os.path.dirname(file_path))
+
+  def save_binary_file(self, file_name: str, data: bytes) -> None:
+    """Atomically replaces a binary file in the data directory, in the same way as `save_file`. `file_name` must include its extension."""
+    file_path: str = self.data_file_path(file_name)
+    temporary_file_path: str = file_path + ".tmp"
+    with open(temporary_file_path, 'wb') as f:
+      f.write(data)
+      f.flush()
+      os.fsync(f.fileno())
+    os.replace(temporary_file_path, file_path)
+    self.sync_directory(os.path.dirname(file_path))
+
+  def load_binary_file(self, file_name: str) -> bytes:
+    with open(self.data_file_path(file_name), 'rb') as f:
+      return f.read()
+
+  def sync_directory(self, directory_path: str) -> None:
+    """Makes renames within the directory durable. Not supported on Windows, where it is skipped."""
+    if os.name != "posix": return None
+    directory_descriptor: int = os.open(directory_path or ".", os.O_RDONLY)
+    try:
+      os.fsync(directory_descriptor)
+    finally:
+      os.close(directory_descriptor)
     
   def load_file(self, file_name: str, in_data_directory: bool = True) -> dict[str, Any]:
     file_path: str = self.toml_file_path(file_name, in_data_directory)
@@ -55,9 +93,37 @@ class FileHandler:
     file_path: str = self.toml_file_path(file_name)
     os.remove(file_path)
 
+  # append-only files
+
+  def append_json_line(self, file_name: str, data: dict[str, Any]) -> None:
+    """Appends `data` as a single line of JSON, only returning once it has been synced to disk."""
+    with open(self.data_file_path(file_name), 'a') as f:
+      f.write(json.dumps(data) + "\n")
+      f.flush()
+      os.fsync(f.fileno())
+
+  def load_json_lines(self, file_name: str) -> list[dict[str, Any]]:
+    """Reads every complete line written by `append_json_line`. A torn final line (from a crash mid-append) is ignored."""
+    file_path: str = self.data_file_path(file_name)
+    if not os.path.isfile(file_path): return []
+    lines: list[dict[str, Any]] = []
+    with open(file_path, 'r') as f:
+      for line in f:
+        if not line.endswith("\n"): break
+        try:
+          lines.append(json.loads(line))
+        except json.JSONDecodeError:
+          break
+    return lines
+
+  def clear_file(self, file_name: str) -> None:
+    file_path: str = self.data_file_path(file_name)
+    if os.path.isfile(file_path): os.remove(file_path)
+
   # config methods
 
   def get_config_data(self) -> ConfigData:
     pyproject_raw_data: dict[str, Any] = self.load_file("pyproject.toml", False)
     project_raw_data: dict[str, Any] = pyproject_raw_data["project"]
-    return ConfigData(version=project_raw_data["version"])
+    gaia_raw_data: dict[str, Any] = pyproject_raw_data.get("tool", {}).get("gaia", {}) # optional `[tool.gaia]` table
+    return ConfigData(version=project_raw_data["version"], storage_backend=gaia_raw_data.get("storage_backend", "toml"), is_snapshot_enabled=gaia_raw_data.get("snapshot", True), is_columnar_storage_enabled=gaia_raw_data.get("columnar_static_tables", True))
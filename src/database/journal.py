@@ -0,0 +1,94 @@
+from tools.typing_tools import *
+
+from database.file_handler import FileHandler
+
+@dataclass
+class JournalEntry:
+  """
+  Everything written by one `Database.save`, which is passed to the `StorageBackend`. When journaled by the TOML backend, entries are replayed in order on top of the table files, so replaying an entry which has already been applied has no further effect.
+
+  :param main_data: The contents of `MAIN.toml`, if it changed. Defaults to `None`.
+  :type main_data: Optional[dict[str, Any]]
+  :param deleted_table_names: Tables whose files are to be removed. Defaults to `[]`.
+  :type deleted_table_names: list[str]
+  :param full_tables: Tables written out in full, in the same form as their files (used when a table's columns have changed). Defaults to `{}`.
+  :type full_tables: dict[str, dict[str, Any]]
+  :param table_changes: Maps table names to the rows which were inserted or updated (`"upserted_rows"`) and the identifiers which were deleted (`"deleted_identifiers"`). Defaults to `{}`.
+  :type table_changes: dict[str, dict[str, Any]]
+  """
+  main_data: Optional[dict[str, Any]] = None
+  deleted_table_names: list[str] = field(default_factory=list)
+  full_tables: dict[str, dict[str, Any]] = field(default_factory=dict)
+  table_changes: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+  def is_empty(self) -> bool:
+    return self.main_data == None and self.deleted_table_names == [] and self.full_tables == {} and self.table_changes == {}
+
+  def get_table_names(self) -> list[str]:
+    return list(self.full_tables.keys()) + list(self.table_changes.keys())
+
+  def to_dict(self) -> dict[str, Any]:
+    return {"main_data": self.main_data, "deleted_table_names": self.deleted_table_names, "full_tables": self.full_tables, "table_changes": self.table_changes}
+
+  @staticmethod
+  def from_dict(raw_entry: dict[str, Any]) -> "JournalEntry":
+    return JournalEntry(raw_entry["main_data"], raw_entry["deleted_table_names"], raw_entry["full_tables"], raw_entry["table_changes"])
+
+def apply_table_changes(raw_table: dict[str, Any], table_changes: dict[str, Any]) -> dict[str, Any]:
+  """Applies the changes recorded in a `JournalEntry` to a table in the same form as its file, returning the updated table."""
+  identifier_name: str = raw_table["column_names"][0]
+  rows: dict[int, dict[str, Any]] = {row[identifier_name]: row for row in raw_table["rows"]}
+  for identifier in table_changes["deleted_identifiers"]:
+    rows.pop(identifier, None)
+  for row in table_changes["upserted_rows"]:
+    rows[row[identifier_name]] = row
+  return {"column_names": raw_table["column_names"], "rows": list(rows.values())}
+
+class Journal:
+  """
+  Write-ahead journal kept in `data/JOURNAL.jsonl`. Each save is appended (and synced to disk) as a single line before any table file is touched, so a crash part-way through writing the table files can be recovered from by replaying the journal.
+
+  :param file_handler: Used to read and write the journal file.
+  :type file_handler: FileHandler
+  """
+  FILE_NAME: str = "JOURNAL.jsonl"
+
+  def __init__(self, file_handler: FileHandler) -> None:
+    self.file_handler: FileHandler = file_handler
+    self.entry_count: int = 0 # any entries already in the file are cleared by `replay` when the database is loaded
+
+  def append(self, entry: JournalEntry) -> None:
+    self.file_handler.append_json_line(self.FILE_NAME, entry.to_dict())
+    self.entry_count += 1
+
+  def load_entries(self) -> list[JournalEntry]:
+    return [JournalEntry.from_dict(raw_entry) for raw_entry in self.file_handler.load_json_lines(self.FILE_NAME)]
+
+  def clear(self) -> None:
+    """Called once every entry has been applied to the table files."""
+    self.file_handler.clear_file(self.FILE_NAME)
+    self.entry_count = 0
+
+  def replay(self) -> None:
+    """Applies every complete entry to the table files, then clears the journal. Does nothing if the journal is empty."""
+    entries: list[JournalEntry] = self.load_entries()
+    if entries == []:
+      self.clear() # removes a torn entry, if any
+      return None
+    main_data: Optional[dict[str, Any]] = None
+    raw_tables: dict[str, Optional[dict[str, Any]]] = {} # `None` marks a table whose file is to be deleted
+    for entry in entries:
+      if entry.main_data != None: main_data = entry.main_data
+      for table_name in entry.deleted_table_names:
+        raw_tables[table_name] = None
+      for (table_name, raw_table) in entry.full_tables.items():
+        raw_tables[table_name] = raw_table
+      for (table_name, table_changes) in entry.table_changes.items():
+        raw_table: Optional[dict[str, Any]] = raw_tables.get(table_name)
+        if raw_table == None: raw_table = self.file_handler.load_file(table_name)
+        raw_tables[table_name] = apply_table_changes(raw_table, table_changes)
+    for (table_name, raw_table) in raw_tables.items():
+      if raw_table != None: self.file_handler.save_file(table_name, raw_table)
+      elif self.file_handler.does_file_exist(table_name): self.file_handler.delete_file(table_name)
+    if main_data != None: self.file_handler.save_file("MAIN", main_data)
+    self.clear()
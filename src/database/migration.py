@@ -0,0 +1,49 @@
+import os
+
+from tools.typing_tools import *
+
+from database.file_handler import FileHandler
+from database.journal import JournalEntry
+from database.storage_backend import StorageBackend
+from database.toml_backend import TomlBackend
+from database.sqlite_backend import SqliteBackend
+
+def copy_database(source: StorageBackend, target: StorageBackend) -> list[str]:
+  """
+  Copies every table from `source` to `target`, which is created if needed. Any interrupted save in `source` is finished first.
+
+  :return: The names of the tables which were copied.
+  :rtype: list[str]
+  """
+  source.recover()
+  main_data: dict[str, Any] = source.load_main_data()
+  table_names: list[str] = main_data["table_names"]
+  entry = JournalEntry(main_data=main_data, full_tables={table_name: source.load_table(table_name) for table_name in table_names})
+  if not target.exists(): target.create(main_data)
+  target.save(entry, True, lambda table_name: entry.full_tables.get(table_name))
+  return table_names
+
+def migrate_database(target_backend_name: str, file_handler: Optional[FileHandler] = None) -> list[str]:
+  """
+  Converts the database in `data/` to the backend with the given name. Migrating to SQLite leaves the TOML files in place (they are ignored once `data/gaia.sqlite3` exists); migrating back to TOML renames the SQLite file to `gaia.sqlite3.bak` so that the TOML files are used again.
+
+  :param target_backend_name: Either `"toml"` or `"sqlite"`.
+  :type target_backend_name: str
+  :return: The names of the tables which were migrated.
+  :rtype: list[str]
+  """
+  if file_handler == None: file_handler = FileHandler()
+  toml_backend = TomlBackend(file_handler)
+  sqlite_backend = SqliteBackend(file_handler)
+  match target_backend_name:
+    case SqliteBackend.NAME:
+      if sqlite_backend.exists(): raise FileExistsError(f"`{sqlite_backend.get_file_path()}` already exists.")
+      table_names: list[str] = copy_database(toml_backend, sqlite_backend)
+      sqlite_backend.close()
+    case TomlBackend.NAME:
+      if not sqlite_backend.exists(): raise FileNotFoundError(f"`{sqlite_backend.get_file_path()}` does not exist, so there is nothing to migrate.")
+      table_names = copy_database(sqlite_backend, toml_backend)
+      sqlite_backend.close()
+      os.replace(sqlite_backend.get_file_path(), sqlite_backend.get_file_path() + ".bak")
+    case _: raise ValueError(f"Unknown storage backend `{target_backend_name}`; expected `{TomlBackend.NAME}` or `{SqliteBackend.NAME}`.")
+  return table_names
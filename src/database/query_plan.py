@@ -0,0 +1,51 @@
+from tools.typing_tools import *
+
+from database.condition import Predicate, And, Or
+
+@dataclass
+class QueryPlan:
+  """
+  How a `Table` will find the records selected by a `Predicate`.
+
+  A record is selected if and only if its identifier is in `candidate_identifiers` **and** it satisfies `residual`.
+
+  :param candidate_identifiers: Identifiers found through direct lookups or indexes. `None` denotes every record in the table (i.e. a scan).
+  :type candidate_identifiers: Optional[set[int]]
+  :param residual: The part of the predicate which must still be evaluated against each candidate row. `None` if no further filtering is needed.
+  :type residual: Optional[Predicate]
+  """
+  candidate_identifiers: Optional[set[int]] = None
+  residual: Optional[Predicate] = None
+
+  def is_scan(self) -> bool:
+    return self.candidate_identifiers == None
+
+  def is_exact(self) -> bool:
+    """`True` if the candidates are exactly the selected records, so no row needs to be read."""
+    return self.candidate_identifiers != None and self.residual == None
+
+def intersect_candidates(a: Optional[set[int]], b: Optional[set[int]]) -> Optional[set[int]]:
+  if a == None: return b
+  if b == None: return a
+  return a & b
+
+def combine_conjunctive_plans(plans: list[QueryPlan]) -> QueryPlan:
+  """Combines the plans of every child of an `And`: candidates are intersected and residuals are all required."""
+  candidate_identifiers: Optional[set[int]] = None
+  residuals: list[Predicate] = []
+  for plan in plans:
+    candidate_identifiers = intersect_candidates(candidate_identifiers, plan.candidate_identifiers)
+    if plan.residual != None: residuals.append(plan.residual)
+  residual: Optional[Predicate] = None
+  if len(residuals) == 1: residual = residuals[0]
+  elif len(residuals) > 1: residual = And(residuals)
+  return QueryPlan(candidate_identifiers, residual)
+
+def combine_disjunctive_plans(predicate: Or, plans: list[QueryPlan]) -> QueryPlan:
+  """Combines the plans of every child of an `Or`. Lookups are only used if every child has some; otherwise the whole disjunction is scanned."""
+  candidate_identifiers: set[int] = set()
+  for plan in plans:
+    if plan.candidate_identifiers == None: return QueryPlan(None, predicate)
+    candidate_identifiers |= plan.candidate_identifiers
+  if all(plan.residual == None for plan in plans): return QueryPlan(candidate_identifiers, None)
+  return QueryPlan(candidate_identifiers, predicate) # the full predicate is re-checked, as a candidate from one child may only satisfy another's residual
@@ -0,0 +1,56 @@
+from tools.typing_tools import *
+
+@dataclass(frozen=True)
+class ForeignKey:
+  """A column of `table_name` whose fields are identifiers of records in `referenced_table_name`."""
+  table_name: str
+  column_name: str
+  referenced_table_name: str
+
+@dataclass(frozen=True)
+class JoinStep:
+  """
+  How to get from records of one table to the related records of another.
+
+  :param foreign_key: The foreign key linking the two tables.
+  :type foreign_key: ForeignKey
+  :param is_forward: `True` if the source table holds the foreign key, so each source record's field is the identifier of a target record. `False` if the target table holds it, so target records are looked up by the source identifiers.
+  :type is_forward: bool
+  """
+  foreign_key: ForeignKey
+  is_forward: bool
+
+class Relationships:
+  """
+  The foreign keys between tables, found from their column names: a non-identifier column named after the identifier column of another table (e.g. `ItemID` in `Weapon`) refers to that table.
+
+  :param table_templates: The column names of each table, with the identifier column first. Defaults to `{}`.
+  :type table_templates: Mapping[str, list[str]]
+  """
+  def __init__(self, table_templates: Mapping[str, list[str]] = {}) -> None:
+    referenced_table_names: dict[str, str] = {column_names[0]: str(table_name) for (table_name, column_names) in table_templates.items()}
+    self.foreign_keys: list[ForeignKey] = []
+    for (table_name, column_names) in table_templates.items():
+      for column_name in column_names[1:]:
+        if column_name in referenced_table_names: self.foreign_keys.append(ForeignKey(str(table_name), column_name, referenced_table_names[column_name]))
+    self.__join_steps: dict[tuple[str, str], JoinStep] = {}
+
+  def __repr__(self) -> str:
+    return f"Relationships({[f'{foreign_key.table_name}.{foreign_key.column_name}' for foreign_key in self.foreign_keys]})"
+
+  def get_foreign_keys(self, table_name: str) -> list[ForeignKey]:
+    """Every foreign key held by `table_name`."""
+    return [foreign_key for foreign_key in self.foreign_keys if foreign_key.table_name == table_name]
+
+  def get_join_step(self, source_table_name: str, target_table_name: str) -> JoinStep:
+    """Finds the foreign key linking two tables. Raises a `LookupError` if there isn't exactly one."""
+    join_step: Optional[JoinStep] = self.__join_steps.get((source_table_name, target_table_name))
+    if join_step != None: return join_step
+    join_steps: list[JoinStep] = []
+    for foreign_key in self.foreign_keys:
+      if foreign_key.table_name == source_table_name and foreign_key.referenced_table_name == target_table_name: join_steps.append(JoinStep(foreign_key, True))
+      elif foreign_key.table_name == target_table_name and foreign_key.referenced_table_name == source_table_name: join_steps.append(JoinStep(foreign_key, False))
+    if len(join_steps) == 0: raise LookupError(f"No foreign key links table `{source_table_name}` to table `{target_table_name}`.")
+    if len(join_steps) > 1: raise LookupError(f"Multiple foreign keys link table `{source_table_name}` to table `{target_table_name}` ({join_steps=}).")
+    self.__join_steps[(source_table_name, target_table_name)] = join_steps[0]
+    return join_steps[0]
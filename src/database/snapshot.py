@@ -0,0 +1,87 @@
+import pickle
+import os
+
+from tools.typing_tools import *
+
+from database.file_handler import FileHandler
+
+type SnapshotTable = tuple[list[str], dict[int, list[Any]]]
+"A table's column names and rows, in the same form as `Table.column_names` and `Table.rows`."
+
+type FileStat = tuple[int, int]
+"A file's modification time (in nanoseconds) and size."
+
+class Snapshot:
+  """
+  Binary copy of the tables kept in `data/SNAPSHOT.pickle`, next to the TOML files. Tables are stored in the same form as in memory, so loading them needs no parsing or per-row conversion.
+
+  The snapshot records the modification time and size of the TOML file each table was taken from. A table is only loaded from the snapshot if its file hasn't changed since; otherwise its TOML file is loaded as normal.
+
+  Isn't thread-safe by itself: it is only used through the backend, so `save` and `load` are never run at the same time as each other (see `Database.lock`).
+
+  :param file_handler: Used to read and write the snapshot file.
+  :type file_handler: FileHandler
+  """
+  FILE_NAME: str = "SNAPSHOT.pickle"
+  FORMAT_VERSION: int = 3 # increased whenever the layout of the snapshot changes, so that old snapshots are ignored
+
+  def __init__(self, file_handler: FileHandler) -> None:
+    self.file_handler: FileHandler = file_handler
+    self.file_stats: dict[str, FileStat] = {} # the stats of the TOML file of each table in the snapshot when it was last saved or loaded
+    self.pickled_tables: dict[str, bytes] = {} # each table in the snapshot, pickled separately so that unchanged tables don't have to be pickled again
+
+  def get_file_stat(self, table_name: str) -> Optional[FileStat]:
+    file_path: str = self.file_handler.toml_file_path(table_name)
+    if not os.path.isfile(file_path): return None
+    stat_result: os.stat_result = os.stat(file_path)
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+  def save(self, table_names: list[str], get_tables: Callable[[list[str]], dict[str, SnapshotTable]]) -> None:
+    """
+    Updates the snapshot of the tables in `table_names`, which must match their TOML files. Only tables whose TOML files have changed since the snapshot was last saved or loaded (or which aren't in the snapshot yet) are got from `get_tables` and pickled again. Does nothing if none of them have changed.
+
+    :param get_tables: Returns each of the given tables which is in memory.
+    :type get_tables: Callable[[list[str]], dict[str, SnapshotTable]]
+    """
+    file_stats: dict[str, FileStat] = {}
+    for table_name in table_names:
+      file_stat: Optional[FileStat] = self.get_file_stat(table_name)
+      if file_stat != None: file_stats[table_name] = file_stat
+    outdated_table_names: list[str] = [table_name for (table_name, file_stat) in file_stats.items() if self.file_stats.get(table_name) != file_stat]
+    removed_table_names: list[str] = [table_name for table_name in self.file_stats if not table_name in file_stats]
+    if len(outdated_table_names) == 0 and len(removed_table_names) == 0: return None
+    tables: dict[str, SnapshotTable] = get_tables(outdated_table_names)
+    is_changed: bool = False
+    for table_name in removed_table_names + outdated_table_names:
+      if table_name in tables:
+        self.pickled_tables[table_name] = pickle.dumps(tables[table_name], protocol=5)
+        self.file_stats[table_name] = file_stats[table_name]
+      elif table_name in self.file_stats: # removed, or changed but not in memory
+        del self.pickled_tables[table_name]
+        del self.file_stats[table_name]
+      else: continue # not in memory and not in the snapshot, so there is nothing to update
+      is_changed = True
+    if not is_changed: return None
+    raw_tables: dict[str, tuple[FileStat, bytes]] = {table_name: (file_stat, self.pickled_tables[table_name]) for (table_name, file_stat) in self.file_stats.items()}
+    raw_snapshot: dict[str, Any] = {"format_version": self.FORMAT_VERSION, "tables": raw_tables}
+    self.file_handler.save_binary_file(self.FILE_NAME, pickle.dumps(raw_snapshot, protocol=5))
+
+  def load(self, table_names: list[str]) -> dict[str, SnapshotTable]:
+    """Returns every table in `table_names` whose TOML file hasn't changed since the snapshot was saved. Returns `{}` if the snapshot is missing or unreadable."""
+    if not os.path.isfile(self.file_handler.data_file_path(self.FILE_NAME)): return {}
+    tables: dict[str, SnapshotTable] = {}
+    self.file_stats = {}
+    self.pickled_tables = {}
+    try:
+      raw_snapshot: dict[str, Any] = pickle.loads(self.file_handler.load_binary_file(self.FILE_NAME))
+      if raw_snapshot.get("format_version") != self.FORMAT_VERSION: return {}
+      for (table_name, (file_stat, pickled_table)) in raw_snapshot["tables"].items():
+        if not table_name in table_names or self.get_file_stat(table_name) != file_stat: continue
+        tables[table_name] = pickle.loads(pickled_table)
+        self.pickled_tables[table_name] = pickled_table
+        self.file_stats[table_name] = file_stat
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+      self.file_stats = {}
+      self.pickled_tables = {}
+      return {}
+    return tables
@@ -0,0 +1,140 @@
+import sqlite3
+import json
+import os
+
+from tools.typing_tools import *
+
+from database.file_handler import FileHandler
+from database.journal import JournalEntry
+from database.storage_backend import StorageBackend, RawTableGetter
+
+def quote_identifier(name: str) -> str:
+  """Quotes a table or column name for use in SQL."""
+  return '"' + name.replace('"', '""') + '"'
+
+def get_boolean_column_names(raw_rows: list[dict[str, Any]]) -> set[str]:
+  """SQLite stores booleans as integers, so the columns holding them are recorded in order to convert them back when loading."""
+  return {column_name for row in raw_rows for (column_name, value) in row.items() if type(value) == bool}
+
+class SqliteBackend(StorageBackend):
+  """
+  Stores the whole database in `data/gaia.sqlite3`, with one SQL table per `Table`. Indexed columns (see `Database.set_index_templates`) are given SQL indexes, and each save is written in a single transaction.
+
+  :param file_handler: Used to find the data directory.
+  :type file_handler: FileHandler
+  """
+  NAME: str = "sqlite"
+  FILE_NAME: str = "gaia.sqlite3"
+  MAIN_DATA_TABLE_NAME: str = "_gaia_main_data"
+  METADATA_TABLE_NAME: str = "_gaia_tables"
+
+  def __init__(self, file_handler: FileHandler) -> None:
+    super().__init__()
+    self.file_handler: FileHandler = file_handler
+    self.__connection: Optional[sqlite3.Connection] = None
+
+  def get_file_path(self) -> str:
+    return self.file_handler.data_file_path(self.FILE_NAME)
+
+  def get_connection(self) -> sqlite3.Connection:
+    if self.__connection == None:
+      self.__connection = sqlite3.connect(self.get_file_path(), check_same_thread=False) # shared by the main thread, background saves and prefetches, whose access is serialised by `Database.lock`
+      self.__connection.execute("PRAGMA journal_mode=WAL")
+    return self.__connection
+
+  def close(self) -> None:
+    if self.__connection == None: return None
+    self.__connection.close()
+    self.__connection = None
+
+  def exists(self) -> bool:
+    return self.file_handler.does_data_directory_exist() and os.path.isfile(self.get_file_path())
+
+  def create(self, main_data: dict[str, Any]) -> None:
+    if not self.file_handler.does_data_directory_exist():
+      self.file_handler.create_directory("data")
+    with self.get_connection() as connection:
+      connection.execute(f"CREATE TABLE IF NOT EXISTS {self.MAIN_DATA_TABLE_NAME} (Key TEXT PRIMARY KEY, Value TEXT)")
+      connection.execute(f"CREATE TABLE IF NOT EXISTS {self.METADATA_TABLE_NAME} (TableName TEXT PRIMARY KEY, ColumnNames TEXT, BooleanColumnNames TEXT)")
+      self.save_main_data(connection, main_data)
+
+  # loading
+
+  def load_main_data(self) -> dict[str, Any]:
+    rows: list[tuple[str, str]] = self.get_connection().execute(f"SELECT Key, Value FROM {self.MAIN_DATA_TABLE_NAME}").fetchall()
+    return {key: json.loads(value) for (key, value) in rows}
+
+  def load_table_metadata(self, table_name: str) -> tuple[list[str], set[str]]:
+    """:return: The column names of the table, and the names of the columns which hold booleans."""
+    metadata: Optional[tuple[str, str]] = self.get_connection().execute(f"SELECT ColumnNames, BooleanColumnNames FROM {self.METADATA_TABLE_NAME} WHERE TableName = ?", (table_name,)).fetchone()
+    if metadata == None: raise NameError(f"Table {table_name} does not exist.")
+    return (json.loads(metadata[0]), set(json.loads(metadata[1])))
+
+  def load_table(self, table_name: str) -> dict[str, Any]:
+    (column_names, boolean_column_names) = self.load_table_metadata(table_name)
+    cursor: sqlite3.Cursor = self.get_connection().execute(f"SELECT {', '.join(quote_identifier(column_name) for column_name in column_names)} FROM {quote_identifier(table_name)}")
+    raw_rows: list[dict[str, Any]] = []
+    for fields in cursor:
+      raw_row: dict[str, Any] = {}
+      for (column_name, value) in zip(column_names, fields):
+        if value == None: continue # matches TOML, which cannot store `None`
+        raw_row[column_name] = bool(value) if column_name in boolean_column_names else value
+      raw_rows.append(raw_row)
+    return {"column_names": column_names, "rows": raw_rows}
+
+  # saving
+
+  def save(self, entry: JournalEntry, checkpoint: bool, get_raw_table: RawTableGetter) -> None:
+    """Writes `entry` in a single transaction. Every save is durable, so `checkpoint` is ignored."""
+    if entry.is_empty(): return None
+    with self.get_connection() as connection: # commits once every statement has succeeded, or rolls back
+      if entry.main_data != None: self.save_main_data(connection, entry.main_data)
+      for table_name in entry.deleted_table_names:
+        self.drop_table(connection, table_name)
+      for (table_name, raw_table) in entry.full_tables.items():
+        self.replace_table(connection, table_name, raw_table)
+      for (table_name, table_changes) in entry.table_changes.items():
+        self.apply_table_changes(connection, table_name, table_changes)
+
+  def save_main_data(self, connection: sqlite3.Connection, main_data: dict[str, Any]) -> None:
+    connection.executemany(f"INSERT OR REPLACE INTO {self.MAIN_DATA_TABLE_NAME} (Key, Value) VALUES (?, ?)", [(key, json.dumps(value)) for (key, value) in main_data.items()])
+
+  def save_table_metadata(self, connection: sqlite3.Connection, table_name: str, column_names: list[str], boolean_column_names: set[str]) -> None:
+    connection.execute(f"INSERT OR REPLACE INTO {self.METADATA_TABLE_NAME} (TableName, ColumnNames, BooleanColumnNames) VALUES (?, ?, ?)", (table_name, json.dumps(column_names), json.dumps(sorted(boolean_column_names))))
+
+  def drop_table(self, connection: sqlite3.Connection, table_name: str) -> None:
+    connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(table_name)}")
+    connection.execute(f"DELETE FROM {self.METADATA_TABLE_NAME} WHERE TableName = ?", (table_name,))
+
+  def replace_table(self, connection: sqlite3.Connection, table_name: str, raw_table: dict[str, Any]) -> None:
+    """Recreates the table from scratch, as is needed whenever its columns change."""
+    self.drop_table(connection, table_name)
+    column_names: list[str] = raw_table["column_names"]
+    column_definitions: list[str] = [f"{quote_identifier(column_names[0])} INTEGER PRIMARY KEY"] + [quote_identifier(column_name) for column_name in column_names[1:]] # non-identifier columns are left untyped so that fields keep their types
+    connection.execute(f"CREATE TABLE {quote_identifier(table_name)} ({', '.join(column_definitions)})")
+    self.create_indexes(connection, table_name, column_names)
+    self.save_table_metadata(connection, table_name, column_names, get_boolean_column_names(raw_table["rows"]))
+    self.upsert_rows(connection, table_name, column_names, raw_table["rows"])
+
+  def create_indexes(self, connection: sqlite3.Connection, table_name: str, column_names: list[str]) -> None:
+    """Creates an SQL index for each of the table's indexed columns which doesn't have one yet (e.g. for tables which were migrated without index templates)."""
+    for column_name in self.index_templates.get(table_name, []):
+      if not column_name in column_names: continue
+      index_name: str = f"{table_name}_{column_name}"
+      connection.execute(f"CREATE INDEX IF NOT EXISTS {quote_identifier(index_name)} ON {quote_identifier(table_name)} ({quote_identifier(column_name)})")
+
+  def apply_table_changes(self, connection: sqlite3.Connection, table_name: str, table_changes: dict[str, Any]) -> None:
+    (column_names, boolean_column_names) = self.load_table_metadata(table_name)
+    self.create_indexes(connection, table_name, column_names)
+    upserted_rows: list[dict[str, Any]] = table_changes["upserted_rows"]
+    new_boolean_column_names: set[str] = get_boolean_column_names(upserted_rows) - boolean_column_names
+    if len(new_boolean_column_names) > 0: self.save_table_metadata(connection, table_name, column_names, boolean_column_names | new_boolean_column_names)
+    connection.executemany(f"DELETE FROM {quote_identifier(table_name)} WHERE {quote_identifier(column_names[0])} = ?", [(identifier,) for identifier in table_changes["deleted_identifiers"]])
+    self.upsert_rows(connection, table_name, column_names, upserted_rows)
+
+  def upsert_rows(self, connection: sqlite3.Connection, table_name: str, column_names: list[str], raw_rows: list[dict[str, Any]]) -> None:
+    placeholders: str = ", ".join("?" for _ in column_names)
+    connection.executemany(
+      f"INSERT OR REPLACE INTO {quote_identifier(table_name)} ({', '.join(quote_identifier(column_name) for column_name in column_names)}) VALUES ({placeholders})",
+      [tuple(raw_row.get(column_name) for column_name in column_names) for raw_row in raw_rows],
+    )
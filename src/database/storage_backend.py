@@ -0,0 +1,62 @@
+from tools.typing_tools import *
+from tools.custom_exceptions import AbstractMethodCallError
+
+from database.journal import JournalEntry
+from database.snapshot import SnapshotTable
+
+type RawTableGetter = Callable[[str], Optional[dict[str, Any]]]
+"Returns the current contents of a table in memory, in the same form as `Table.to_file`, or `None` if the table no longer exists."
+type SnapshotTablesGetter = Callable[[list[str]], dict[str, SnapshotTable]]
+"Returns each of the given tables which is in memory, in the same form as `Table.column_names` and `Table.rows`."
+
+class StorageBackend:
+  """
+  Abstract base class for the ways `Database` can be persisted to secondary storage.
+
+  Subclasses must implement:
+  * `exists() -> bool` - whether a database has already been created.
+  * `create(main_data: dict[str, Any]) -> None` - creates an empty database with the given main data.
+  * `load_main_data() -> dict[str, Any]` - loads the main data (in the form given by `DatabaseMainData.to_dict`).
+  * `load_table(table_name: str) -> dict[str, Any]` - loads a table in the form given by `Table.to_file`.
+  * `save(entry: JournalEntry, checkpoint: bool, get_raw_table: RawTableGetter) -> None` - durably writes the changes made by one save.
+
+  Subclasses can also override `recover`, `checkpoint`, `save_snapshot`, `load_snapshot` and `close`, which do nothing by default.
+  """
+  NAME: str = ""
+
+  def __init__(self) -> None:
+    self.index_templates: dict[str, list[str]] = {} # maps table names to the columns which are indexed, for backends which support indexes
+
+  def exists(self) -> bool:
+    raise AbstractMethodCallError(StorageBackend.__name__, self.exists.__name__)
+
+  def create(self, main_data: dict[str, Any]) -> None:
+    raise AbstractMethodCallError(StorageBackend.__name__, self.create.__name__)
+
+  def load_main_data(self) -> dict[str, Any]:
+    raise AbstractMethodCallError(StorageBackend.__name__, self.load_main_data.__name__)
+
+  def load_table(self, table_name: str) -> dict[str, Any]:
+    raise AbstractMethodCallError(StorageBackend.__name__, self.load_table.__name__)
+
+  def save(self, entry: JournalEntry, checkpoint: bool, get_raw_table: RawTableGetter) -> None:
+    raise AbstractMethodCallError(StorageBackend.__name__, self.save.__name__)
+
+  def recover(self) -> None:
+    """Called before the database is loaded in order to finish any save which was interrupted."""
+    return None
+
+  def checkpoint(self, get_raw_table: RawTableGetter) -> None:
+    """Folds any saved changes which are only held in a journal into the main storage."""
+    return None
+
+  def save_snapshot(self, table_names: list[str], get_tables: SnapshotTablesGetter) -> None:
+    """Called after a checkpointed save. Backends which are slow to load can store a copy of the tables in `table_names` which is faster to load, getting only the tables they need from `get_tables`."""
+    return None
+
+  def load_snapshot(self, table_names: list[str]) -> dict[str, SnapshotTable]:
+    """Returns every table in `table_names` which has an up-to-date copy in the backend's snapshot."""
+    return {}
+
+  def close(self) -> None:
+    return None
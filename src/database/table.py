@@ -2,17 +2,33 @@ from tools.typing_tools import *
 from tools.dictionary_tools import *
 from tools.logging_tools import * # required for `Loggable`
 
-from database.condition import Condition, get_condition_inverse
+from database.condition import *
+from database.table_index import TableIndex
+from database.table_changes import TableChanges
+from database.table_transaction import TableTransaction
+from database.query_plan import *
+
+from data_structures.identifier_allocator import IdentifierAllocator
 
 from tools.custom_exceptions import InsertAtExistingIdentifierError
 
 class Table(Loggable):
-  def __init__(self, name: str, column_names: list[str], is_logging_enabled: bool = False, tag: Optional[str] = None, include_call_stack: bool = False) -> None:
+  """
+  :param indexed_column_names: Non-identifier columns which are given a secondary hash index, so that equality lookups on them do not scan every row. Defaults to `[]`.
+  :type indexed_column_names: list[str]
+  """
+  def __init__(self, name: str, column_names: list[str], indexed_column_names: list[str] = [], is_logging_enabled: bool = False, tag: Optional[str] = None, include_call_stack: bool = False) -> None:
     self.name: str = name
     if tag == None: tag = self.name
     super().__init__(is_logging_enabled, tag, include_call_stack)
     self.column_names: list[str] = column_names
     self.rows: dict[int, list[Any]] = {}
+    self.identifier_allocator = IdentifierAllocator()
+    self.transaction: Optional[TableTransaction] = None # set while the table is part of a `Database.transaction`
+    self.indexes: dict[str, TableIndex] = {}
+    for column_name in indexed_column_names:
+      self.create_index(column_name)
+    self.changes: TableChanges = TableChanges(is_schema_changed=True) # a new table has never been saved
 
   # built-in methods
 
@@ -34,7 +50,26 @@ class Table(Loggable):
     return self.rows[identifier]
   
   def __setitem__(self, identifier: int, value: list[Any]) -> None:
+    old_row: Optional[list[Any]] = None
+    if identifier in self.rows:
+      old_row = self.rows[identifier]
+      if old_row == value: return None # unchanged rows are not marked as dirty
+      self.changes.record_update(identifier)
+    else:
+      self.changes.record_insert(identifier)
+      self.identifier_allocator.add(identifier)
+    if self.transaction != None: self.transaction.record(identifier, old_row) # the indexes are brought up to date by `sync_indexes` instead
+    elif old_row != None: self.remove_row_from_indexes(identifier, old_row)
     self.rows[identifier] = value
+    if self.transaction == None: self.add_row_to_indexes(identifier, value)
+
+  def __delitem__(self, identifier: int) -> None:
+    row: list[Any] = self.rows[identifier]
+    if self.transaction != None: self.transaction.record(identifier, row)
+    else: self.remove_row_from_indexes(identifier, row)
+    del self.rows[identifier]
+    self.identifier_allocator.remove(identifier)
+    self.changes.record_delete(identifier)
   
   def __contains__(self, value: Union[int, list[Any]]) -> bool:
     return value in self.rows
@@ -42,6 +77,13 @@ class Table(Loggable):
   def has_key(self, key: int) -> bool:
     return key in self.rows
 
+  def load_rows(self, rows: dict[int, list[Any]]) -> None:
+    """Replaces every row at once with rows which are already saved (e.g. when loading), so no changes are recorded. Much faster than inserting each row individually."""
+    self.rows = rows
+    self.identifier_allocator.rebuild(self.rows.keys())
+    self.rebuild_indexes()
+    self.mark_clean()
+
   # basic getter and setter methods
 
   @property
@@ -56,27 +98,168 @@ class Table(Loggable):
       return []
     return self.column_names[1:]
 
-  def to_file(self) -> dict[str, Any]:
-    file: dict[str, Any] = {}
+  def get_column_position(self, column_name: str) -> int:
+    """Gets the position of a non-identifier column within each row. Raises a `KeyError` if the column doesn't exist."""
+    non_identifier_column_names: list[str] = self.get_non_identifier_column_names()
+    if not column_name in non_identifier_column_names: raise KeyError(f"Column `{column_name}` does not exist in table `{self.name}` ({non_identifier_column_names=}).")
+    return non_identifier_column_names.index(column_name)
 
-    file["column_names"] = self.column_names
+  # change tracking
+
+  def is_dirty(self) -> bool:
+    """`True` if the table has changed since it was last saved or loaded."""
+    return not self.changes.is_empty()
+
+  def mark_clean(self) -> None:
+    """Called once the table has been saved or loaded, so that it is only saved again after it next changes."""
+    self.changes.clear()
+
+  # transactions
+
+  def begin_transaction(self) -> None:
+    """Starts recording the rows which are changed, so that they can be restored by `rollback_transaction`. Index maintenance is deferred until the indexes are next read or the transaction is committed. Does nothing if the table is already part of a transaction."""
+    if self.transaction != None: return None
+    self.transaction = TableTransaction(self.changes.copy())
+
+  def commit_transaction(self) -> None:
+    self.sync_indexes()
+    self.transaction = None
+
+  def rollback_transaction(self) -> None:
+    """Restores every row changed during the transaction, and the record of the table's changes, to how they were when it began. Schema changes are not undone."""
+    if self.transaction == None: return None
+    self.sync_indexes()
+    transaction: TableTransaction = self.transaction
+    self.transaction = None
+    for (identifier, original_row) in transaction.original_rows.items():
+      if original_row != None: self[identifier] = original_row
+      elif identifier in self.rows: del self[identifier]
+    self.changes = transaction.changes
+
+  # secondary indexes
+
+  def is_column_indexed(self, column_name: str) -> bool:
+    return column_name in self.indexes
+
+  def create_index(self, column_name: str) -> None:
+    """Creates a secondary index on a non-identifier column, populating it from the existing rows. Does nothing if the column is already indexed."""
+    if self.is_column_indexed(column_name): return None
+    self.sync_indexes()
+    position: int = self.get_column_position(column_name)
+    index = TableIndex(column_name)
+    for (identifier, row) in self.rows.items():
+      index.add(row[position], identifier)
+    self.indexes[column_name] = index
+
+  def drop_index(self, column_name: str) -> None:
+    self.indexes.pop(column_name, None)
+
+  def add_row_to_indexes(self, identifier: int, row: list[Any]) -> None:
+    for (column_name, index) in self.indexes.items():
+      index.add(row[self.get_column_position(column_name)], identifier)
+
+  def remove_row_from_indexes(self, identifier: int, row: list[Any]) -> None:
+    for (column_name, index) in self.indexes.items():
+      index.remove(row[self.get_column_position(column_name)], identifier)
+
+  def rebuild_indexes(self) -> None:
+    if self.transaction != None: self.transaction.stale_rows.clear()
+    for index in self.indexes.values():
+      index.clear()
+    for (identifier, row) in self.rows.items():
+      self.add_row_to_indexes(identifier, row)
+
+  def sync_indexes(self) -> None:
+    """Brings the secondary indexes up to date with the rows changed during the current transaction (if there is one), moving each changed row within the indexes once however many times it was changed. Called before the indexes are read."""
+    if self.transaction == None or len(self.transaction.stale_rows) == 0: return None
+    for (identifier, indexed_row) in self.transaction.stale_rows.items():
+      if indexed_row != None: self.remove_row_from_indexes(identifier, indexed_row)
+      if identifier in self.rows: self.add_row_to_indexes(identifier, self.rows[identifier])
+    self.transaction.stale_rows.clear()
 
-    rows: list[dict[str, Any]] = []
-    identifier_name: str = self.get_identifier_name()
-    remaining_columns: list[str] = []
+  def get_identifiers_where_equal(self, column_name: str, value: Any) -> set[int]:
+    """Finds the identifiers of every row whose field in `column_name` equals `value`. Answered directly from the index when the column is indexed, otherwise all rows are scanned."""
+    if self.is_column_indexed(column_name):
+      self.sync_indexes()
+      return self.indexes[column_name].get_identifiers(value)
+    position: int = self.get_column_position(column_name)
+    return {identifier for (identifier, row) in self.rows.items() if row[position] == value}
+
+  def rows_to_dict(self) -> dict[int, list[Any]]:
+    """The rows in the form `identifier: fields`, as used by `Snapshot`."""
+    return self.rows
+
+  def row_to_file(self, identifier: int, table_row: list[Any]) -> dict[str, Any]:
     file_row: dict[str, Any] = {}
-    for (identifier, table_row) in self.rows.items():
-      file_row[identifier_name] = identifier # sets the first value to be the identifier
-      remaining_columns = self.get_non_identifier_column_names() # goes through every column except the identifier
-      for (i, column_name) in enumerate(remaining_columns):
-        file_row[column_name] = table_row[i]
-      rows.append(file_row.copy()) # a copy is used, as if it were not, then all of the rows would be stored with the same data as the most recently saved one
-
-    file["rows"] = rows
+    file_row[self.get_identifier_name()] = identifier # sets the first value to be the identifier
+    for (i, column_name) in enumerate(self.get_non_identifier_column_names()): # goes through every column except the identifier
+      file_row[column_name] = table_row[i]
+    return file_row
+
+  def to_file(self) -> dict[str, Any]:
+    file: dict[str, Any] = {}
+    file["column_names"] = self.column_names
+    file["rows"] = [self.row_to_file(identifier, table_row) for (identifier, table_row) in self.rows.items()]
     return file
 
-  # SELECT columns FROM rows WHERE condition ORDER BY order
-  def select(self, columns: list[str], condition: Condition) -> dict[int, list[Any]]:
+  def changes_to_file(self) -> dict[str, Any]:
+    """The rows changed since the table was last saved, in the form used by `JournalEntry.table_changes`."""
+    upserted_identifiers: list[int] = sorted(self.changes.inserted_identifiers | self.changes.updated_identifiers)
+    return {
+      "upserted_rows": [self.row_to_file(identifier, self.rows[identifier]) for identifier in upserted_identifiers],
+      "deleted_identifiers": sorted(self.changes.deleted_identifiers),
+    }
+
+  # query planning
+
+  def get_lookup_identifiers(self, column_name: str, values: Iterable[Any]) -> Optional[set[int]]:
+    """Finds the identifiers of records whose field in `column_name` is any of `values` without scanning. Returns `None` if the column can't be looked up directly (i.e. it is neither the identifier column nor indexed)."""
+    if column_name == self.get_identifier_name():
+      return {value for value in values if value in self.rows}
+    if not self.is_column_indexed(column_name): return None
+    self.sync_indexes()
+    index: TableIndex = self.indexes[column_name]
+    identifiers: set[int] = set()
+    for value in values:
+      identifiers |= index.get_identifiers(value)
+    return identifiers
+
+  def plan(self, condition: Condition) -> QueryPlan:
+    """Decides how the records selected by `condition` will be found. Identifier matches become direct dictionary lookups, equality on indexed columns uses the index, and only what remains is scanned."""
+    predicate: Predicate = to_predicate(condition)
+    if type(predicate) == Everything: return QueryPlan(None, None)
+    if type(predicate) == Nothing: return QueryPlan(set(), None)
+    if type(predicate) == MatchingIdentifiers:
+      return QueryPlan({identifier for identifier in predicate.identifiers if identifier in self.rows}, None)
+    if type(predicate) == Eq or type(predicate) == In:
+      values: Iterable[Any] = [predicate.value] if type(predicate) == Eq else predicate.values
+      lookup_identifiers: Optional[set[int]] = self.get_lookup_identifiers(predicate.column_name, values)
+      if lookup_identifiers != None: return QueryPlan(lookup_identifiers, None)
+      return QueryPlan(None, predicate)
+    if type(predicate) == And:
+      return combine_conjunctive_plans([self.plan(child) for child in predicate.predicates])
+    if type(predicate) == Or:
+      return combine_disjunctive_plans(predicate, [self.plan(child) for child in predicate.predicates])
+    return QueryPlan(None, predicate) # `Not`, `Range` and `Where` can only be answered by scanning
+
+  def find_identifiers(self, condition: Condition) -> list[int]:
+    """Executes the plan for `condition`, returning the identifiers of all selected records. Scans return identifiers in the order they are stored; lookups return them in ascending order."""
+    plan: QueryPlan = self.plan(condition)
+    if plan.candidate_identifiers == None:
+      if plan.residual == None: return list(self.rows.keys())
+      return self.scan(plan.residual)
+    candidate_identifiers: list[int] = sorted(identifier for identifier in plan.candidate_identifiers if identifier in self.rows)
+    if plan.residual == None: return candidate_identifiers
+    row_filter: RowFilter = plan.residual.bind(self.column_names)
+    return [identifier for identifier in candidate_identifiers if row_filter(identifier, self.rows[identifier])]
+
+  def scan(self, predicate: Predicate) -> list[int]:
+    """Finds the identifiers of every record selected by `predicate` by checking each row, in the order they are stored."""
+    row_filter: RowFilter = predicate.bind(self.column_names)
+    return [identifier for (identifier, row) in self.rows.items() if row_filter(identifier, row)]
+
+  def project_rows(self, columns: list[str], rows: dict[int, list[Any]]) -> dict[int, list[Any]]:
+    """Reduces each of the given rows to only the fields in `columns` (`["*"]` selects every column). Always returns new lists."""
     non_identifier_column_names: list[str] = self.get_non_identifier_column_names()
     if columns[0] == "*":
       columns = non_identifier_column_names
@@ -85,38 +268,49 @@ class Table(Loggable):
       if column_name in columns:
         selected_column_indexes.append(i)
 
-    selected_rows: dict[int, Any] = filter_dictionary(self.rows, condition)
-    for (identifier, row) in selected_rows.items():
+    projected_rows: dict[int, list[Any]] = {}
+    for (identifier, row) in rows.items():
       filtered_row = []
       for i in selected_column_indexes:
         filtered_row.append(row[i])
-      selected_rows[identifier] = filtered_row
+      projected_rows[identifier] = filtered_row
+    return projected_rows
+
+  # SELECT columns FROM rows WHERE condition ORDER BY order
+  def select(self, columns: list[str], condition: Condition) -> dict[int, list[Any]]:
+    selected_rows: dict[int, list[Any]] = {identifier: self.rows[identifier] for identifier in self.find_identifiers(condition)}
+    return self.project_rows(columns, selected_rows)
 
-    return selected_rows
+  # SELECT columns FROM rows WHERE column_name = value
+  def select_where_equal(self, columns: list[str], column_name: str, value: Any) -> dict[int, list[Any]]:
+    identifiers: set[int] = self.get_identifiers_where_equal(column_name, value)
+    selected_rows: dict[int, list[Any]] = {identifier: self.rows[identifier] for identifier in sorted(identifiers)}
+    return self.project_rows(columns, selected_rows)
   
   def update(self, columns_to_values: dict[str, Any], condition: Condition) -> None:
-    rows_to_update: dict[int, list[Any]] = filter_dictionary(self.rows, condition)
-    identifiers_to_update: list[int] = list(rows_to_update.keys())
-    column_name: str = ""
-    updated_rows: dict[int, list[Any]] = {}
+    self.update_many({identifier: columns_to_values for identifier in self.find_identifiers(condition)})
+
+  def update_many(self, identifiers_to_values: dict[int, dict[str, Any]]) -> None:
+    """Updates several records at once, each with its own `column: field` values. Identifiers which aren't in the table are ignored."""
     non_identifier_column_names: list[str] = self.get_non_identifier_column_names()
-    for identifier in identifiers_to_update:
-      fields_to_update = rows_to_update[identifier]
+    updated_rows: dict[int, list[Any]] = {}
+    for (identifier, columns_to_values) in identifiers_to_values.items():
+      if not identifier in self.rows: continue
+      fields_to_update: list[Any] = self.rows[identifier].copy() # a copy is used so that the old fields can still be removed from the indexes when the row is set
       for (i, column_name) in enumerate(non_identifier_column_names):
-        try:
-          column_value = columns_to_values[column_name]
-        except:
-          continue
-        fields_to_update[i] = column_value
+        if column_name in columns_to_values: fields_to_update[i] = columns_to_values[column_name]
       updated_rows[identifier] = fields_to_update
     for identifier in updated_rows:
       self[identifier] = updated_rows[identifier]
 
   def delete_from(self, condition: Condition) -> None:
     """Deletes all values from the table where the condition statement evaluates to `True`."""
-    condition_inverse: Condition = get_condition_inverse(condition)
-    undeleted_rows: dict[int, list[Any]] = filter_dictionary(self.rows, condition_inverse)
-    self.rows = undeleted_rows
+    self.delete_many(self.find_identifiers(condition))
+
+  def delete_many(self, identifiers: Iterable[int]) -> None:
+    """Deletes the records with the given identifiers, without evaluating a condition against the table. Identifiers which aren't in the table are ignored."""
+    for identifier in list(identifiers):
+      if identifier in self.rows: del self[identifier]
   
   def format_raw_row(self, raw_row: dict[str, Any]) -> list[Any]:
     """Turns a dictionary of the form `column: field` to an array of fields in order *without* the identifier"""
@@ -132,27 +326,37 @@ class Table(Loggable):
   
   def insert_with_identifier(self, raw_row: dict[str, Any], identifier: int) -> None:
     """Inserts a new record at a given identifier. Raises an error if the identifier has already been assigned."""
-    existing_identifiers: list[int] = list(self.rows.keys())
-    if identifier in existing_identifiers: raise InsertAtExistingIdentifierError(identifier, self.name)
+    if self.has_key(identifier): raise InsertAtExistingIdentifierError(identifier, self.name)
     self[identifier] = self.format_raw_row(raw_row)
 
   #insert
   def insert(self, raw_row: dict[str, Any]) -> int:
-    identifier: int = get_next_available_identifier(self.rows)
+    identifier: int = self.get_next_available_identifier()
     self.insert_with_identifier(raw_row, identifier)
     return identifier
   
+  def insert_many(self, raw_rows: list[dict[str, Any]], identifiers: Optional[list[int]] = None) -> list[int]:
+    """
+    Inserts several records at once, returning their identifiers. Nothing is inserted if any of the identifiers have already been assigned.
+
+    :param raw_rows: The records to insert, each in the form `column: field`.
+    :type raw_rows: list[dict[str, Any]]
+    :param identifiers: The identifier of each record. If `None`, the smallest identifiers not in the table are used. Defaults to `None`.
+    :type identifiers: Optional[list[int]]
+    :return: The identifier of each inserted record, in the same order as `raw_rows`.
+    :rtype: list[int]
+    """
+    if identifiers == None: identifiers = self.identifier_allocator.get_next_available_identifiers(len(raw_rows))
+    if len(identifiers) != len(raw_rows): raise ValueError(f"{len(identifiers)=} doesn't match {len(raw_rows)=}.")
+    for identifier in identifiers:
+      if self.has_key(identifier): raise InsertAtExistingIdentifierError(identifier, self.name)
+    for (identifier, raw_row) in zip(identifiers, raw_rows):
+      self[identifier] = self.format_raw_row(raw_row)
+    return identifiers
+
   def get_next_available_identifier(self) -> int:
-    """Calculates the smallest, non-zero identifier not in the table."""
-    previous_id: int = -1 # defining variables
-    previous_id_successor: int = 0 
-    for current_id in self.identifiers:
-      previous_id_successor = previous_id+1
-      if current_id > previous_id_successor: # if there is a hole in the sequence (e.g. [1,2,4,5] would return 3)
-        return previous_id_successor
-      previous_id = current_id # sets up for next iteration
-    previous_id_successor = previous_id+1
-    return previous_id_successor # in the case there are no holes, then it returns the id outside of the list 
+    """Returns the smallest non-negative identifier not in the table (e.g. `[0,1,2,4,5]` would return `3`), without sorting the identifiers."""
+    return self.identifier_allocator.get_next_available_identifier()
 
   #add_column
   def add_column(self, name: str) -> None:
@@ -161,6 +365,7 @@ class Table(Loggable):
     self.column_names.append(name)
     for identifier in self.rows.keys():
       self[identifier].append(None)
+    self.changes.record_schema_change()
 
   #drop_column
   def drop_column(self, name: str) -> None:
@@ -175,21 +380,30 @@ class Table(Loggable):
       else:
         new_column_names.append(column_name)
     
-    self.column_names = new_column_names
+    self.drop_index(name)
+    self.column_names = [self.get_identifier_name()] + new_column_names
     
     for (identifier, row) in self.rows.items():
       new_row = []
       for (i, field) in enumerate(row):
         if i != dropped_index:
           new_row.append(field)
-      self[identifier] = new_row
+      self.rows[identifier] = new_row
+    self.rebuild_indexes() # positions of the remaining indexed columns may have shifted
+    self.changes.record_schema_change()
 
   #rename_column
   def rename_column(self, name: str, new_name: str) -> None:
     for (i, column_name) in enumerate(self.column_names):
       if column_name == name:
         self.column_names[i] = new_name
+        self.changes.record_schema_change()
+    if self.is_column_indexed(name):
+      index: TableIndex = self.indexes.pop(name)
+      index.rename(new_name)
+      self.indexes[new_name] = index
 
   #rename_table
   def rename_table(self, new_name) -> None:
-    self.name = new_name
\ No newline at end of file
+    self.name = new_name
+    self.changes.record_schema_change()
\ No newline at end of file
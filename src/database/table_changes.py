@@ -0,0 +1,58 @@
+from tools.typing_tools import *
+
+@dataclass
+class TableChanges:
+  """
+  Row-level record of how a `Table` has changed since it was last saved or loaded. Used by `Database.save` so that only modified tables are written.
+
+  :param inserted_identifiers: Records which did not exist when the table was last saved.
+  :type inserted_identifiers: set[int]
+  :param updated_identifiers: Records which existed when the table was last saved and whose fields have since changed.
+  :type updated_identifiers: set[int]
+  :param deleted_identifiers: Records which existed when the table was last saved and have since been deleted.
+  :type deleted_identifiers: set[int]
+  :param is_schema_changed: Whether the table's name or columns have changed, or whether the table has never been saved. Defaults to `False`.
+  :type is_schema_changed: bool
+  """
+  inserted_identifiers: set[int] = field(default_factory=set)
+  updated_identifiers: set[int] = field(default_factory=set)
+  deleted_identifiers: set[int] = field(default_factory=set)
+  is_schema_changed: bool = False
+
+  def is_empty(self) -> bool:
+    return not (self.is_schema_changed or self.inserted_identifiers or self.updated_identifiers or self.deleted_identifiers)
+
+  def copy(self) -> "TableChanges":
+    return TableChanges(self.inserted_identifiers.copy(), self.updated_identifiers.copy(), self.deleted_identifiers.copy(), self.is_schema_changed)
+
+  def get_change_count(self) -> int:
+    return len(self.inserted_identifiers) + len(self.updated_identifiers) + len(self.deleted_identifiers)
+
+  # recording changes
+
+  def record_insert(self, identifier: int) -> None:
+    if identifier in self.deleted_identifiers: # deleted then re-inserted, so the saved record is just being overwritten
+      self.deleted_identifiers.discard(identifier)
+      self.updated_identifiers.add(identifier)
+    else:
+      self.inserted_identifiers.add(identifier)
+
+  def record_update(self, identifier: int) -> None:
+    if identifier in self.inserted_identifiers: return None # still just an insert as far as the saved table is concerned
+    self.updated_identifiers.add(identifier)
+
+  def record_delete(self, identifier: int) -> None:
+    if identifier in self.inserted_identifiers: # never saved, so there is nothing to delete
+      self.inserted_identifiers.discard(identifier)
+      return None
+    self.updated_identifiers.discard(identifier)
+    self.deleted_identifiers.add(identifier)
+
+  def record_schema_change(self) -> None:
+    self.is_schema_changed = True
+
+  def clear(self) -> None:
+    self.inserted_identifiers.clear()
+    self.updated_identifiers.clear()
+    self.deleted_identifiers.clear()
+    self.is_schema_changed = False
@@ -0,0 +1,52 @@
+from tools.typing_tools import *
+
+class TableIndex:
+  """
+  Secondary hash index over a single column of a `Table`. Maps each field value found in the column to the identifiers of the rows holding it.
+
+  :param column_name: The name of the column being indexed. Cannot be the identifier column.
+  :type column_name: str
+  """
+  def __init__(self, column_name: str) -> None:
+    self.column_name: str = column_name
+    self.__buckets: dict[Any, set[int]] = {}
+
+  # built-in methods
+
+  def __repr__(self) -> str:
+    return f"TableIndex({self.column_name=}, {len(self.__buckets)} values)"
+
+  def __contains__(self, value: Any) -> bool:
+    return value in self.__buckets
+
+  def __len__(self) -> int:
+    return len(self.__buckets)
+
+  # index maintenance
+
+  def add(self, value: Any, identifier: int) -> None:
+    bucket: Optional[set[int]] = self.__buckets.get(value)
+    if bucket == None:
+      self.__buckets[value] = {identifier}
+    else:
+      bucket.add(identifier)
+
+  def remove(self, value: Any, identifier: int) -> None:
+    bucket: Optional[set[int]] = self.__buckets.get(value)
+    if bucket == None: return None
+    bucket.discard(identifier)
+    if len(bucket) == 0: del self.__buckets[value] # stops values which are no longer used from building up
+
+  def clear(self) -> None:
+    self.__buckets.clear()
+
+  def rename(self, new_column_name: str) -> None:
+    self.column_name = new_column_name
+
+  # lookups
+
+  def get_identifiers(self, value: Any) -> set[int]:
+    """Returns the identifiers of every row whose field in the indexed column is equal to `value`. The returned set is a copy, so it is safe to mutate the table while iterating over it."""
+    bucket: Optional[set[int]] = self.__buckets.get(value)
+    if bucket == None: return set()
+    return bucket.copy()
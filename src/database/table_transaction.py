@@ -0,0 +1,24 @@
+from tools.typing_tools import *
+
+from database.table_changes import TableChanges
+
+@dataclass
+class TableTransaction:
+  """
+  Undo log of a `Table` while it is part of a `Database.transaction`. Only the rows changed during the transaction are recorded, along with the row each held beforehand (`None` if there was no row).
+
+  :param changes: A copy of the table's changes from when the transaction began, restored if it is rolled back.
+  :type changes: TableChanges
+  :param original_rows: The row held at each identifier before its first change during the transaction. Used to roll the table back.
+  :type original_rows: dict[int, Optional[list[Any]]]
+  :param stale_rows: The row held in the secondary indexes at each identifier changed since the indexes were last brought up to date (see `Table.sync_indexes`). Index maintenance is deferred until then, so a row changed several times is only moved within the indexes once.
+  :type stale_rows: dict[int, Optional[list[Any]]]
+  """
+  changes: TableChanges
+  original_rows: dict[int, Optional[list[Any]]] = field(default_factory=dict)
+  stale_rows: dict[int, Optional[list[Any]]] = field(default_factory=dict)
+
+  def record(self, identifier: int, row: Optional[list[Any]]) -> None:
+    """Called before the row at `identifier` is changed, with the row it currently holds. Only the first change of each row is kept."""
+    if not identifier in self.original_rows: self.original_rows[identifier] = row
+    if not identifier in self.stale_rows: self.stale_rows[identifier] = row
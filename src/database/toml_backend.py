@@ -0,0 +1,81 @@
+from tools.typing_tools import *
+
+from database.file_handler import FileHandler
+from database.journal import Journal, JournalEntry
+from database.snapshot import Snapshot, SnapshotTable
+from database.storage_backend import StorageBackend, RawTableGetter, SnapshotTablesGetter
+
+class TomlBackend(StorageBackend):
+  """
+  Stores each table in its own `data/<table name>.toml` file, with the table names and version in `data/MAIN.toml`.
+
+  Each save is first appended to the write-ahead `Journal`; a checkpoint then rewrites the affected files atomically and clears the journal.
+
+  :param file_handler: Used to read and write the TOML files.
+  :type file_handler: FileHandler
+  :param is_snapshot_enabled: Whether a binary `Snapshot` of every table is written after each checkpoint and used for loading when it is up to date. Defaults to `True`.
+  :type is_snapshot_enabled: bool
+  """
+  NAME: str = "toml"
+  MAX_JOURNAL_ENTRIES: int = 64 # saves which skip the checkpoint are folded into the table files once the journal reaches this many entries
+
+  def __init__(self, file_handler: FileHandler, is_snapshot_enabled: bool = True) -> None:
+    super().__init__()
+    self.file_handler: FileHandler = file_handler
+    self.is_snapshot_enabled: bool = is_snapshot_enabled
+    self.snapshot = Snapshot(self.file_handler)
+    self.journal = Journal(self.file_handler)
+    self.journaled_table_names: set[str] = set() # tables with journal entries which have not yet been written to their files
+    self.journaled_deleted_table_names: set[str] = set()
+    self.journaled_main_data: Optional[dict[str, Any]] = None
+
+  def exists(self) -> bool:
+    return self.file_handler.does_data_directory_exist()
+
+  def create(self, main_data: dict[str, Any]) -> None:
+    if not self.file_handler.does_data_directory_exist():
+      self.file_handler.create_directory("data")
+    self.file_handler.save_file("MAIN", main_data)
+
+  def recover(self) -> None:
+    """Replays any journal entries left over from a save which was interrupted before its checkpoint completed."""
+    self.journal.replay()
+
+  def load_main_data(self) -> dict[str, Any]:
+    return self.file_handler.load_file("MAIN")
+
+  def load_table(self, table_name: str) -> dict[str, Any]:
+    return self.file_handler.load_file(table_name)
+
+  def save(self, entry: JournalEntry, checkpoint: bool, get_raw_table: RawTableGetter) -> None:
+    """Appends `entry` to the journal, only changing the table files if `checkpoint` is `True` or the journal has grown too long."""
+    if not entry.is_empty():
+      self.journal.append(entry)
+      if entry.main_data != None: self.journaled_main_data = entry.main_data
+      self.journaled_deleted_table_names |= set(entry.deleted_table_names)
+      self.journaled_table_names |= set(entry.get_table_names())
+    if checkpoint or self.journal.entry_count >= self.MAX_JOURNAL_ENTRIES:
+      self.checkpoint(get_raw_table)
+
+  def checkpoint(self, get_raw_table: RawTableGetter) -> None:
+    """Rewrites every table with journal entries to its file, then clears the journal. Does nothing if the journal is empty."""
+    if self.journal.entry_count == 0: return None
+    for deleted_table_name in self.journaled_deleted_table_names:
+      if get_raw_table(deleted_table_name) == None and self.file_handler.does_file_exist(deleted_table_name):
+        self.file_handler.delete_file(deleted_table_name)
+    for table_name in self.journaled_table_names:
+      raw_table: Optional[dict[str, Any]] = get_raw_table(table_name)
+      if raw_table != None: self.file_handler.save_file(table_name, raw_table)
+    if self.journaled_main_data != None: self.file_handler.save_file("MAIN", self.journaled_main_data)
+    self.journal.clear()
+    self.journaled_table_names = set()
+    self.journaled_deleted_table_names = set()
+    self.journaled_main_data = None
+
+  def save_snapshot(self, table_names: list[str], get_tables: SnapshotTablesGetter) -> None:
+    if not self.is_snapshot_enabled or self.journal.entry_count > 0: return None # the snapshot must match the TOML files
+    self.snapshot.save(table_names, get_tables)
+
+  def load_snapshot(self, table_names: list[str]) -> dict[str, SnapshotTable]:
+    if not self.is_snapshot_enabled: return {}
+    return self.snapshot.load(table_names)
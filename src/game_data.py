@@ -1,17 +1,23 @@
+from types import MappingProxyType
+from contextlib import contextmanager
+
 from tools.typing_tools import *
 from tools.constants import *
-from tools.dictionary_tools import filter_dictionary, get_next_available_identifier, add_if_vacant
+from tools.dictionary_tools import filter_dictionary, add_if_vacant
 from tools.generation_tools import *
+from tools.decision_tools import get_decision_error_bound
 from tools.ability_names import *
 from tools.logging_tools import * # required for `Loggable`
 
 from data_storage_var import DataStorageVar
 
 from database.database import Database
-from database.condition import Condition, everything, matching_identifiers
+from database.condition import *
+from database.relationships import JoinStep
 from database.database_main_data import DatabaseMainData
 
 from stored.stored import Stored
+from stored.row_view import RowView
 from stored.user import User
 from stored.entities.character import Character
 from stored.world import World
@@ -32,9 +38,11 @@ from stored.abilities.enemy_ability import EnemyAbility
 from data_structures.fighting_enemy_graph import FightingEnemyGraph
 from custom_tkinter.toggleable_button import ToggleableButton
 from stored.entities.enemy import Enemy
-from stored.entities.fighting_enemy import FightingEnemy
+from stored.entities.fighting_enemy import FightingEnemy, calculate_action_offensiveness
+from data_structures.enemy_profile import EnemyProfile
 
 from data_structures.queue import Queue
+from data_structures.unit_of_work import UnitOfWork
 
 from ability_action import *
 
@@ -45,6 +53,8 @@ class GameData(Loggable):
     self.is_dev_mode_enabled: bool = is_dev_mode_enabled
     
     self.database = Database("game_data")
+    self.unit_of_work = UnitOfWork() # inserts and deletes which haven't been written to `database` yet
+    self.is_in_transaction: bool = False # see `transaction`
 
     self.users: DataStorageVar[User] = DataStorageVar[User](User, label=StorageAttrName.USERS)
     self.active_user_id: Optional[int] = 0 # defaults as 0
@@ -78,6 +88,8 @@ class GameData(Loggable):
     self.statistic_abilities: DataStorageVar[StatisticAbility] = DataStorageVar[StatisticAbility](StatisticAbility, label=StorageAttrName.STATISTIC_ABILITIES)
 
     self.item_abilities: DataStorageVar[ItemAbility] = DataStorageVar[ItemAbility](ItemAbility, label=StorageAttrName.ITEM_ABILITIES)
+    self.__ability_actions: Optional[Mapping[int, AbilityAction]] = None # resolved from the ability tables on first use; see `get_ability_actions`
+    self.__enemy_profiles: Optional[Mapping[int, EnemyProfile]] = None # see `get_enemy_profiles`
 
     # Each entry contains target type as the key with a tuple as the value
     # The first element is the variable name to which the `Stored` type should be stored in within the `GameData` object
@@ -125,6 +137,24 @@ class GameData(Loggable):
       TableName.ENEMY: ["EnemyID", "Name", "MaxHealth", "AttackDamage", "Intelligence", "IsBoss"], # Y
       TableName.ENEMY_ABILITY: ["EnemyAbilityID", "EnemyID", "AbilityID", "IsUsedInAttack"], # Y
     }
+    # foreign key columns which are given secondary indexes in `Database`, so that equality lookups on them don't scan the whole table
+    self.index_templates: dict[TableName, list[str]] = {
+      TableName.CHARACTER: ["UserID"],
+      TableName.WORLD: ["UserID"],
+      TableName.INVENTORY_ITEM: ["CharacterID", "ItemID"],
+      TableName.STORAGE: ["WorldID"],
+      TableName.STORAGE_ITEM: ["StorageID", "ItemID"],
+      TableName.ITEM_ABILITY: ["ItemID", "AbilityID"],
+      TableName.WEAPON: ["ItemID"],
+      TableName.EQUIPABLE: ["ItemID"],
+      TableName.PARRY_ABILITY: ["AbilityID"],
+      TableName.STATISTIC_ABILITY: ["AbilityID"],
+      TableName.ENEMY_ABILITY: ["EnemyID", "AbilityID"],
+    }
+    self.database.set_index_templates(self.index_templates)
+    self.database.set_static_table_names(list(self.static_table_templates.keys())) # held column by column, as they are only read after being loaded
+    self.database.set_relationships(self.table_templates)
+    self.create_storage_indexes()
 
     self.is_boss_encounter: bool = False
 
@@ -203,6 +233,7 @@ class GameData(Loggable):
 
   def load_default_data(self) -> None:
     """Loads data into `self` after a new database has been initialised."""
+    self.invalidate_ability_actions()
     self.users.set({0: User("User", loaded=False)})
     self.items.set({
       # 12 weapons (2 starter)
@@ -434,6 +465,7 @@ class GameData(Loggable):
     raw_stored_data: dict[int, list[Any]] = self.select_all_from_table(table_name)
     for (identifier, stored_data) in raw_stored_data.items():
       stored: StoredType = cast(StoredType, stored_type.instantiate(stored_data, True))
+      stored.mark_saved()
       entities[identifier] = stored
     return entities
   
@@ -451,12 +483,56 @@ class GameData(Loggable):
 
     return (storage_name, is_in_database)
 
+  def get_storage[StoredType: Stored](self, stored_type: Type[StoredType]) -> DataStorageVar[StoredType]:
+    """Returns the storage attribute which objects of `stored_type` are kept in."""
+    (storage_name, _) = self.get_save_load_storage_options(self.save_load_targets[stored_type])
+    return self[storage_name]
+
+  def create_storage_indexes(self) -> None:
+    """Indexes each storage attribute on the foreign keys of its table, so that `join_stored` can find related stored objects without scanning."""
+    for stored_type in self.save_load_targets:
+      table_name: TableName = stored_type.get_table_name()
+      for foreign_key in self.database.relationships.get_foreign_keys(table_name):
+        position: int = self.table_templates[table_name].index(foreign_key.column_name) - 1 # raw data doesn't include the identifier
+        self.get_storage(stored_type).create_index(foreign_key.column_name, lambda stored, position=position: stored.get_field(position))
+
+  def join_stored[StoredType: Stored](self, stored_types: list[Type[Stored]], identifiers: Iterable[int]) -> dict[int, StoredType]:
+    """
+    Finds the stored objects related to `identifiers` by following the foreign keys between each consecutive pair of types in `stored_types`. Works like `Database.join`, but over the storage attributes in `self` (which may hold unsaved changes), using their foreign key indexes instead of scanning.
+
+    :param stored_types: The types to join, starting with the type which `identifiers` belong to (e.g. `[Item, ItemAbility, Ability]` finds the abilities of the given items).
+    :type stored_types: list[Type[Stored]]
+    :param identifiers: Identifiers of objects of the first type.
+    :type identifiers: Iterable[int]
+    :return: The related objects of the last type, in storage order.
+    :rtype: dict[int, StoredType]
+    """
+    selected_identifiers: list[int] = list(dict.fromkeys(identifiers))
+    for (source_type, target_type) in zip(stored_types, stored_types[1:]):
+      join_step: JoinStep = self.database.relationships.get_join_step(source_type.get_table_name(), target_type.get_table_name())
+      column_name: str = join_step.foreign_key.column_name
+      target_storage: DataStorageVar = self.get_storage(target_type)
+      if join_step.is_forward:
+        referenced_identifiers: list[int] = self.get_storage(source_type).get_index_keys(column_name, selected_identifiers)
+        selected_identifiers = [identifier for identifier in referenced_identifiers if identifier in target_storage]
+      else:
+        selected_identifiers = target_storage.get_identifiers_where_in(column_name, selected_identifiers)
+    storage: DataStorageVar = self.get_storage(stored_types[-1])
+    return {identifier: storage[identifier] for identifier in selected_identifiers}
+
   def load(self) -> None:
+    """Loads the database. Each storage attribute is only filled from its table once it is first accessed."""
     self.load_database()
+    self.unit_of_work.clear()
+    self.invalidate_ability_actions()
     for (target, storage_options) in self.save_load_targets.items():
       (storage_name, is_in_database) = self.get_save_load_storage_options(storage_options)
       if not is_in_database: continue # skips if the target won't be saved to / loaded from the database
-      self[storage_name].set(self.load_stored_from_database(target))
+      self[storage_name].set_loader(lambda target=target: self.load_stored_from_database(target))
+
+  def prefetch(self, stored_types: list[Type[Stored]]) -> None:
+    """Starts loading the tables of the given types in the background, so that accessing them later doesn't have to wait for them to be read."""
+    self.database.prefetch([stored_type.get_table_name() for stored_type in stored_types])
 
   def format_data_to_dictionary(self, table_name: TableName, raw_data: list) -> dict[str, Any]:
     formatted_data: dict[str, Any] = {}
@@ -483,7 +559,7 @@ class GameData(Loggable):
     :param raw_data: The data which is to take the place of the existing data found in the database.
     :type raw_data: list[Any]
     """
-    match_condition = lambda id, _row: id == identifier
+    match_condition: Condition = matching_identifiers(identifier)
     self.update_database(table_name, raw_data, match_condition)
 
   def insert_into_database(self, table_name: TableName, raw_data: list[Any], identifier: Optional[int] = None) -> Optional[int]:
@@ -491,36 +567,88 @@ class GameData(Loggable):
     formatted_data: dict[str, Any] = self.format_data_to_dictionary(table_name, raw_data)
     return self.database.insert(table_name, formatted_data, identifier)
   
+  def update_database_records(self, table_name: TableName, identifiers_to_raw_data: dict[int, list[Any]]) -> None:
+    """Updates several existing records in the database at once. Only updates the database."""
+    formatted_data: dict[int, dict[str, Any]] = {identifier: self.format_data_to_dictionary(table_name, raw_data) for (identifier, raw_data) in identifiers_to_raw_data.items()}
+    self.database.update_many(table_name, formatted_data)
+
+  def insert_many_into_database(self, table_name: TableName, raw_data: list[list[Any]], identifiers: Optional[list[int]] = None) -> list[int]:
+    """Inserts several new records into a table at once, returning their identifiers."""
+    formatted_data: list[dict[str, Any]] = [self.format_data_to_dictionary(table_name, raw_row) for raw_row in raw_data]
+    return self.database.insert_many(table_name, formatted_data, identifiers)
+
   def insert_into_storage[StoredType: Stored](self, storage_name: StorageAttrName, identifier: int, data: StoredType) -> None: # type: ignore
     """Inserts a record into the storage attribute in `self` whose name matches the one given."""
-    storage_data: dict[int, StoredType] = cast(dict[int, StoredType], self[storage_name].data)
-    if identifier in storage_data: raise IndexError(f"Tried to insert {data=} with {identifier=} into {storage_name=} when the index is already being used ({storage_data[identifier]=}).")
-    storage_data[identifier] = data
-    self[storage_name].set(storage_data)
+    storage: DataStorageVar[StoredType] = self[storage_name]
+    if identifier in storage: raise IndexError(f"Tried to insert {data=} with {identifier=} into {storage_name=} when the index is already being used ({storage[identifier]=}).")
+    storage[identifier] = data
   
-  def is_stored_unique_in_table(self, table_name: TableName, identical_condition: Condition) -> bool:
-    identifier_column: str = table_name + "ID"
-    identical_identifiers: list[int] = list(self.select_from_table(table_name, [identifier_column], identical_condition).keys())
-    if len(identical_identifiers) > 0: return False
-    return True
-    
+  def bind_storage_condition(self, stored: Stored, condition: Condition) -> RowFilter:
+    """Turns `condition` into a `RowFilter` over the raw data of `stored`. Predicates are bound to the column names of the table which `stored` is saved to."""
+    if not isinstance(condition, Predicate): return condition
+    return condition.bind(self.database.find_table(stored.get_table_name()).column_names)
+
   def select_from_storage[StoredType: Stored](self, storage: dict[int, StoredType], condition: Condition) -> dict[int, StoredType]:
-    return {identifier: stored for identifier, stored in storage.items() if condition(identifier, stored.get_raw_data())}
+    if isinstance(condition, MatchingIdentifiers): return {identifier: storage[identifier] for identifier in condition.identifiers if identifier in storage}
+    if isinstance(condition, Nothing): return {}
+    selected_storage: dict[int, StoredType] = {}
+    row_filter: Optional[RowFilter] = None
+    row_view: Optional[RowView] = None # one view is moved from stored to stored, so no row is built for any of them
+    for identifier, stored in storage.items():
+      if row_filter == None or row_view == None: # every stored in a storage shares the same table
+        row_filter = self.bind_storage_condition(stored, condition)
+        row_view = stored.get_row_view()
+      if row_filter(identifier, row_view.point_to(stored)): selected_storage[identifier] = stored
+    return selected_storage
+
+  def find_indexed_eq(self, storage: DataStorageVar, condition: Condition) -> Optional[Eq]:
+    """An `Eq` which every stored meeting `condition` must also meet (i.e. the condition itself, or one within an `And`), on a column which the storage attribute has an index on. Returns `None` if there isn't one, in which case every stored has to be checked."""
+    conditions: list[Condition] = list(condition.predicates) if isinstance(condition, And) else [condition]
+    for sub_condition in conditions:
+      if isinstance(sub_condition, Eq) and storage.has_index(sub_condition.column_name): return sub_condition
+    return None
 
   def is_stored_unique_in_self[StoredType: Stored](self, storage_name: StorageAttrName, identical_condition: Condition) -> bool:
-    storage: dict[int, StoredType] = getattr(self, storage_name)
-    identical_identifiers: list[int] = list(self.select_from_storage(storage, identical_condition).keys())
-    if len(identical_identifiers) > 0: return False
+    if isinstance(identical_condition, Nothing): return True
+    storage: DataStorageVar[StoredType] = getattr(self, storage_name)
+    indexed_eq: Optional[Eq] = self.find_indexed_eq(storage, identical_condition)
+    candidates: Iterable[tuple[int, StoredType]] = storage.items() # only the stored objects found with an index are checked, if there is one
+    if indexed_eq != None: candidates = [(identifier, storage[identifier]) for identifier in storage.get_identifiers_where_equal(indexed_eq.column_name, indexed_eq.value)]
+    row_filter: Optional[RowFilter] = None
+    row_view: Optional[RowView] = None
+    for identifier, stored in candidates: # stops at the first identical stored instead of collecting all of them
+      if row_filter == None or row_view == None:
+        row_filter = self.bind_storage_condition(stored, identical_condition)
+        row_view = stored.get_row_view()
+      if row_filter(identifier, row_view.point_to(stored)): return False
     return True
   
   def is_stored_unique[StoredType: Stored](self, stored_type: Type[StoredType], storage_name: StorageAttrName, identical_condition: Condition) -> bool:
+    """Only the storage attribute is checked: once loaded it holds every row of the table, along with the changes which haven't been saved yet, so the table itself may be out of date."""
+    return self.is_stored_unique_in_self(storage_name, identical_condition)
+
+  def is_stored_batch_unique[StoredType: Stored](self, stored_type: Type[StoredType], storage_name: StorageAttrName, stored_data: list[list[Any]]) -> bool:
+    """Checks that none of `stored_data` are identical to each other or to an existing stored. Each row whose identical condition is on an indexed column is only checked against the stored objects found with the index; the storage attribute is scanned at most once, for the rest of the batch."""
     table_name: TableName = stored_type.get_table_name()
-    return self.is_stored_unique_in_table(table_name, identical_condition) and self.is_stored_unique_in_self(storage_name, identical_condition) # if either are false, then the stored must not be unique
+    storage: DataStorageVar[StoredType] = getattr(self, storage_name)
+    identical_conditions: list[Condition] = [stored_type.identical_condition(stored_row) for stored_row in stored_data]
+    checked_rows: list[tuple[list[Any], Predicate]] = [(stored_row, to_predicate(condition)) for (stored_row, condition) in zip(stored_data, identical_conditions) if not isinstance(condition, Nothing)]
+    if len(checked_rows) == 0: return True
+    unindexed_predicates: list[Predicate] = []
+    for (_, predicate) in checked_rows:
+      if self.find_indexed_eq(storage, predicate) == None: unindexed_predicates.append(predicate)
+      elif not self.is_stored_unique_in_self(storage_name, predicate): return False
+    if len(unindexed_predicates) > 0 and not self.is_stored_unique_in_self(storage_name, Or(unindexed_predicates)): return False
+    column_names: list[str] = self.database.find_table(table_name).column_names
+    for (i, (_, predicate)) in enumerate(checked_rows): # the batch must not contain duplicates either
+      row_filter: RowFilter = predicate.bind(column_names)
+      if any(row_filter(-1, stored_row) for (stored_row, _) in checked_rows[i+1:]): return False
+    return True
 
   # returns the stored's identifier and the stored which was created
   def insert_stored[StoredType: Stored](self, stored_type: Type[StoredType], stored_data: list[Any], storage_name: StorageAttrName) -> tuple[int, StoredType]:
     """
-    Inserts a record both into the database and the appropriate storage attribute in `self`. Automatically finds the next insertion point.
+    Inserts a record into the appropriate storage attribute in `self`, and records it in `unit_of_work` so that it is inserted into the database on the next save. Automatically finds the next insertion point.
     
     :param stored_type: The type of object which is being inserted.
     :type stored_type: type[StoredType]
@@ -537,47 +665,144 @@ class GameData(Loggable):
     if not self.is_stored_unique(stored_type, storage_name, identical_condition):
       del new_stored
       raise Exception(f"stored object (type `{stored_type}`) with data `{stored_data}` already exists in table `{table_name}`.")
-    identifier: int = get_next_available_identifier(getattr(self, storage_name)) # generates its own identifier instead of relying on the database to generate it
-    self.insert_into_database(table_name, stored_data, identifier)
+    identifier: int = self[storage_name].get_next_available_identifier() # generates its own identifier instead of relying on the database to generate it
     self.insert_into_storage(storage_name, identifier, new_stored)
+    self.unit_of_work.register_insert(table_name, identifier) # written to the database on the next save
+    self.on_stored_changed(stored_type)
     return (identifier, new_stored)
 
-  def save_stored[StoredType: Stored](self, stored_type: Type[StoredType], storage_name: StorageAttrName) -> None:
+  def insert_many_stored[StoredType: Stored](self, stored_type: Type[StoredType], stored_data: list[list[Any]], storage_name: StorageAttrName) -> dict[int, StoredType]:
+    """
+    Inserts several records into the appropriate storage attribute in `self`, recording them in `unit_of_work` as with `insert_stored`. Uniqueness is checked and identifiers are allocated once for the whole batch, rather than once per record.
+
+    :param stored_type: The type of object which is being inserted.
+    :type stored_type: type[StoredType]
+    :param stored_data: The raw data of each `StoredType` object. Does not include the identifiers of the objects.
+    :type stored_data: list[list[Any]]
+    :param storage_name: The storage attribute of `self` which the created objects will be stored at.
+    :type storage_name: StorageAttrName
+    :return: The newly created objects, keyed by their identifiers.
+    :rtype: dict[int, StoredType]
+    """
+    table_name: TableName = stored_type.get_table_name()
+    if not self.is_stored_batch_unique(stored_type, storage_name, stored_data):
+      raise Exception(f"stored objects (type `{stored_type}`) with data `{stored_data}` are not unique in table `{table_name}`.")
+    storage: DataStorageVar[StoredType] = self[storage_name]
+    identifiers: list[int] = storage.get_next_available_identifiers(len(stored_data))
+    new_storeds: dict[int, StoredType] = {}
+    for (identifier, stored_row) in zip(identifiers, stored_data):
+      new_stored: StoredType = cast(StoredType, stored_type.instantiate(stored_row))
+      storage[identifier] = new_stored
+      new_storeds[identifier] = new_stored
+      self.unit_of_work.register_insert(table_name, identifier)
+    self.on_stored_changed(stored_type)
+    return new_storeds
+
+  def save_stored[StoredType: Stored](self, stored_type: Type[StoredType], storage_name: StorageAttrName, changed_identifiers: Optional[Iterable[int]] = None) -> None:
     """
-    Saves from one variable in the `GameData` object to `Database`. Does not insert objects into their respective variables in `self`.
+    Saves from one variable in the `GameData` object to `Database`. Does not insert objects into their respective variables in `self`. Flushes the inserts and deletes recorded in `unit_of_work`, along with the objects whose fields have changed since they were last saved or loaded, changing the table once for each kind of change.
     
     :param stored_type: The object type that is to be saved, being a subclass of `StoredType`.
     :type stored_type: Type[StoredType]
     :param storage_name: Name of the variable being saved to memory.
     :type storage_name: StorageAttrName
+    :param changed_identifiers: If given, only these objects are checked for changed fields, instead of every object in the storage attribute (e.g. by `transaction`, which knows which objects were changed within it). Defaults to `None`.
+    :type changed_identifiers: Optional[Iterable[int]]
     """
+    if not self[storage_name].is_loaded: return None # nothing can have changed if it was never accessed
     storage: dict[int, StoredType] = self[storage_name].get()
-    for (identifier, stored) in storage.items():
-      table_name: TableName = stored_type.get_table_name()
+    table_name: TableName = stored_type.get_table_name()
+    (inserted_identifiers, deleted_identifiers) = self.unit_of_work.pop_pending(table_name)
+    if len(deleted_identifiers) > 0: self.database.delete_many(table_name, deleted_identifiers) # before inserting, as inserted rows may reuse the identifiers of deleted ones
+    updated_data: dict[int, list[Any]] = {}
+    inserted_data: dict[int, list[Any]] = {identifier: storage[identifier].get_raw_data() for identifier in inserted_identifiers}
+    changed_storeds: list[StoredType] = [storage[identifier] for identifier in inserted_identifiers]
+    checked_storeds: Iterable[tuple[int, StoredType]] = storage.items()
+    if changed_identifiers != None: checked_storeds = [(identifier, storage[identifier]) for identifier in changed_identifiers if identifier in storage]
+    for (identifier, stored) in checked_storeds:
+      if not stored.is_changed or identifier in inserted_data: continue
       raw_data: list = stored.get_raw_data()
       if stored.loaded or self.database.is_identifier_in_table(identifier, table_name):
-        self.update_database_record(table_name, identifier, raw_data)
-      else:
-        self.insert_into_database(table_name, raw_data, identifier)
+        updated_data[identifier] = raw_data
+      else: # e.g. objects set directly by `load_default_data`
+        inserted_data[identifier] = raw_data
+      changed_storeds.append(stored)
+    if len(updated_data) > 0: self.update_database_records(table_name, updated_data)
+    if len(inserted_data) > 0: self.insert_many_into_database(table_name, list(inserted_data.values()), list(inserted_data.keys()))
+    for stored in changed_storeds:
+      stored.mark_saved()
+
+  def save(self, checkpoint: bool = True) -> None:
+    """
+    Saves all targeted data stored in memory (in `self`) to the database.
 
-  def save(self) -> None:
-    """Saves all targeted data stored in memory (in `self`) to the database."""
+    :param checkpoint: Passed to `Database.save`. If `False`, changes are only written to the journal. Defaults to `True`.
+    :type checkpoint: bool
+    """
     for (target, storage_options) in self.save_load_targets.items():
       (storage_name, is_in_database) = self.get_save_load_storage_options(storage_options)
       if not is_in_database: continue # skips if not stored in database
       self.save_stored(target, storage_name)
-    self.database.save()
+    self.database.save(checkpoint)
 
   def delete_stored[StoredType: Stored](self, stored_type: Type[StoredType], identifier: int, storage_name: StorageAttrName) -> None:
-    """Deletes a specific value from both the appropriate storage attribute in `self` and the subsequent table in `Database`."""
-    # deleting from 'self'
-    updated_storage: dict[int, StoredType] = self[storage_name].get()
-    del updated_storage[identifier]
-    self[storage_name].set(updated_storage)
-    # deleting from 'Database'
+    """Deletes a specific value from the appropriate storage attribute in `self`. It is deleted from the subsequent table in `Database` on the next save."""
+    self.delete_many_stored(stored_type, [identifier], storage_name)
+
+  def delete_many_stored[StoredType: Stored](self, stored_type: Type[StoredType], identifiers: Iterable[int], storage_name: StorageAttrName) -> None:
+    """Deletes several values from the appropriate storage attribute in `self`, recording them in `unit_of_work` so that the table is changed once for the whole batch on the next save."""
+    storage: DataStorageVar[StoredType] = self[storage_name]
     table_name: TableName = stored_type.get_table_name()
-    condition: Condition = matching_identifiers(identifier)
-    self.database.delete_from(table_name, condition)
+    for identifier in list(identifiers):
+      del storage[identifier]
+      self.unit_of_work.register_delete(table_name, identifier)
+    self.on_stored_changed(stored_type)
+
+  @contextmanager
+  def transaction(self, stored_types: list[Type[Stored]]) -> Iterator[None]:
+    """
+    Groups several changes to the storage attributes of `stored_types` (e.g. the steps of moving items between the inventory and a storage), so that they either all happen or none do.
+
+    If an exception is raised, those storage attributes, the fields of the objects in them and `unit_of_work` are restored to how they were before the block, and the exception is re-raised. Otherwise, the changes are written to `database` together once the block exits, within a single `Database.transaction`. A transaction started within another is part of the outer one, so it must only change the storage attributes of the outer one's `stored_types`.
+
+    Only what is changed within the block is recorded (see `DataStorageVar.start_undo_log` and `Stored.undo_log`), and only the objects which were changed are written, so a transaction costs as much as its changes rather than as much as its storage attributes.
+
+    :param stored_types: The types of the objects which are changed within the block.
+    :type stored_types: list[Type[Stored]]
+    """
+    if self.is_in_transaction: # committed or rolled back by the outer transaction
+      yield None
+      return None
+    with self.database.transaction(): # rolls back the tables if writing the changes fails part-way
+      storages: list[DataStorageVar] = [self.get_storage(stored_type) for stored_type in stored_types]
+      for (stored_type, storage) in zip(stored_types, storages):
+        storage.start_undo_log()
+        stored_type.undo_log = {}
+      unit_of_work: UnitOfWork = self.unit_of_work.copy()
+      self.is_in_transaction = True
+      try:
+        yield None
+        for (stored_type, storage) in zip(stored_types, storages):
+          (storage_name, _) = self.get_save_load_storage_options(self.save_load_targets[stored_type])
+          changed_identifiers: list[Optional[int]] = [storage.find_identifier(stored) for (stored, _, _) in unpack_optional(stored_type.undo_log).values()] # `None` for changed objects which have since been deleted
+          self.save_stored(stored_type, storage_name, [identifier for identifier in changed_identifiers if identifier != None])
+      except BaseException:
+        self.unit_of_work = unit_of_work
+        for (stored_type, storage) in zip(stored_types, storages):
+          storage.rollback_undo_log()
+          for (stored, raw_data, is_changed) in unpack_optional(stored_type.undo_log).values():
+            stored.restore(raw_data, is_changed)
+          self.on_stored_changed(stored_type)
+        raise
+      finally:
+        self.is_in_transaction = False
+        for (stored_type, storage) in zip(stored_types, storages):
+          storage.stop_undo_log()
+          stored_type.undo_log = None
+
+  def on_stored_changed[StoredType: Stored](self, stored_type: Type[StoredType]) -> None:
+    """Called after records of `stored_type` are inserted or deleted. Static tables are only expected to change when the game's data is first loaded, so anything derived from them is resolved again."""
+    if stored_type.get_table_name() in self.static_table_templates: self.invalidate_ability_actions()
 
   # weapon methods
   
@@ -590,12 +815,7 @@ class GameData(Loggable):
   
   def get_weapon_abilities(self, weapon: Weapon) -> dict[int, Ability]:
     """Includes the weapon's parry ability (if it has one)."""
-    item_id: int = weapon.item_id
-    weapon_item_abilities: dict[int, ItemAbility] = filter_dictionary(self.item_abilities, lambda _, item_ability: item_ability.item_id == item_id)
-    weapon_item_abilities_ability_identifiers: list[int] = []
-    for item_ability in list(weapon_item_abilities.values()):
-      weapon_item_abilities_ability_identifiers.append(item_ability.ability_id)
-    return filter_dictionary(self.abilities.data, lambda identifier, _: identifier in weapon_item_abilities_ability_identifiers)
+    return self.join_stored([Item, ItemAbility, Ability], [weapon.item_id])
   
   def get_non_parry_weapon_abilities(self, weapon: Weapon) -> dict[int, Ability]:
     weapon_abilities: dict[int, Ability] = self.get_weapon_abilities(weapon)
@@ -606,8 +826,7 @@ class GameData(Loggable):
     weapon_abilities: dict[int, Ability] = self.get_weapon_abilities(weapon)
     is_parry_ability: Callable[[int, Ability], bool] = lambda _, ability: ability.ability_type == AbilityTypeName.PARRY
     weapon_parry_abilities: dict[int, Ability] = filter_dictionary(weapon_abilities, is_parry_ability)
-    weapon_parry_abilities_identifiers: list[int] = list(weapon_parry_abilities.keys())
-    parries_dict: dict[int, ParryAbility] = filter_dictionary(self.parry_abilities, lambda _, parry_ability: parry_ability.ability_id in weapon_parry_abilities_identifiers)
+    parries_dict: dict[int, ParryAbility] = self.join_stored([Ability, ParryAbility], weapon_parry_abilities.keys())
     parries_list: list[ParryAbility] = list(parries_dict.values())
     if len(parries_list) == 0: return None
     if len(parries_list) > 1: raise LookupError(f"Multiple parry abilities found for {weapon=} ({parries_dict=}).")
@@ -621,17 +840,12 @@ class GameData(Loggable):
     active_character_id: Optional[int] = self.active_character_id 
     if active_character_id == None: return []
 
-    is_character_equipped_inventory_weapon: Callable[[int, InventoryItem], float] = lambda _, inv_item: self.items[inv_item.item_id].item_type == ItemType.WEAPON and inv_item.equipped and inv_item.character_id == active_character_id
+    is_equipped_inventory_weapon: Callable[[int, InventoryItem], float] = lambda _, inv_item: self.items[inv_item.item_id].item_type == ItemType.WEAPON and inv_item.equipped
 
-    equipped_inventory_weapons: dict[int, InventoryItem] = filter_dictionary(self.inventory_items, is_character_equipped_inventory_weapon)
+    equipped_inventory_weapons: dict[int, InventoryItem] = filter_dictionary(self.join_stored([Character, InventoryItem], [active_character_id]), is_equipped_inventory_weapon)
     equipped_weapon_identifiers: list[int] = []
     for equipped_inventory_weapon in equipped_inventory_weapons.values():
-      item_id: int = equipped_inventory_weapon.item_id
-      is_selected_weapon: Callable[[int, Weapon], bool] = lambda _, weapon: weapon.item_id == item_id
-      weapon_item: dict[int, Weapon] = filter_dictionary(self.weapons, is_selected_weapon)
-      if len(weapon_item) > 1: raise BufferError(f"Multiple values found for {weapon_item=} with {item_id=}.")
-      weapon_id: int = list(weapon_item.keys())[0]
-      equipped_weapon_identifiers.append(weapon_id)
+      equipped_weapon_identifiers.append(self.get_weapon_id_from_item_id(equipped_inventory_weapon.item_id))
     return equipped_weapon_identifiers
   
   def get_equipped_character_equipables_identifiers(self) -> list[int]:
@@ -642,17 +856,12 @@ class GameData(Loggable):
     active_character_id: Optional[int] = self.active_character_id 
     if active_character_id == None: return []
 
-    is_character_equipped_inventory_equipable: Callable[[int, InventoryItem], float] = lambda _, inv_item: self.items[inv_item.item_id].item_type == ItemType.EQUIPABLE and inv_item.equipped and inv_item.character_id == active_character_id
+    is_equipped_inventory_equipable: Callable[[int, InventoryItem], float] = lambda _, inv_item: self.items[inv_item.item_id].item_type == ItemType.EQUIPABLE and inv_item.equipped
 
-    equipped_inventory_equipables: dict[int, InventoryItem] = filter_dictionary(self.inventory_items, is_character_equipped_inventory_equipable)
+    equipped_inventory_equipables: dict[int, InventoryItem] = filter_dictionary(self.join_stored([Character, InventoryItem], [active_character_id]), is_equipped_inventory_equipable)
     equipped_equipable_identifiers: list[int] = []
     for equipped_inventory_equipable in equipped_inventory_equipables.values():
-      item_id: int = equipped_inventory_equipable.item_id
-      is_selected_weapon: Callable[[int, Equipable], bool] = lambda _, equipable: equipable.item_id == item_id
-      equipable_item: dict[int, Weapon] = filter_dictionary(self.equipables, is_selected_weapon)
-      if len(equipable_item) > 1: raise BufferError(f"Multiple values found for {equipable_item=} with {item_id=}.")
-      equipable_id: int = list(equipable_item.keys())[0]
-      equipped_equipable_identifiers.append(equipable_id)
+      equipped_equipable_identifiers.append(self.get_equipable_id_from_item_id(equipped_inventory_equipable.item_id))
     return equipped_equipable_identifiers
   
   def load_active_character_equipped_weapon_identifiers(self) -> None:
@@ -706,19 +915,29 @@ class GameData(Loggable):
       weapon_display_names.append(self.get_equipped_weapon_display_name(weapon_identifier, weapon_name, is_for_inventory))
     return weapon_display_names
   
+  # reverse lookups from an `ItemID`, using the `ItemID` indexes of each storage (see `create_storage_indexes`)
+
   def get_weapon_id_from_item_id(self, item_id: int) -> int:
-    is_weapon_item: Callable[[int, Weapon], bool] = lambda _, weapon: weapon.item_id == item_id
-    selected_weapons: dict[int, Weapon] = filter_dictionary(self.weapons.data, is_weapon_item)
-    if len(selected_weapons) > 1: raise MultipleWeaponsFoundError(item_id, selected_weapons)
-    elif len(selected_weapons) == 0: raise NoWeaponsFoundError(item_id)
-    return list(selected_weapons.keys())[0]
+    weapon_identifiers: list[int] = self.weapons.get_identifiers_where_equal("ItemID", item_id)
+    if len(weapon_identifiers) > 1: raise MultipleWeaponsFoundError(item_id, {identifier: self.weapons[identifier] for identifier in weapon_identifiers})
+    elif len(weapon_identifiers) == 0: raise NoWeaponsFoundError(item_id)
+    return weapon_identifiers[0]
+
+  def get_equipable_id_from_item_id(self, item_id: int) -> int:
+    equipable_identifiers: list[int] = self.equipables.get_identifiers_where_equal("ItemID", item_id)
+    if len(equipable_identifiers) != 1: raise LookupError(f"Expected `1` equipable for {item_id=}; instead found {equipable_identifiers=}.")
+    return equipable_identifiers[0]
+
+  def get_ability_identifiers_from_item_id(self, item_id: int) -> list[int]:
+    item_ability_identifiers: list[int] = self.item_abilities.get_identifiers_where_equal("ItemID", item_id)
+    return self.item_abilities.get_index_keys("AbilityID", item_ability_identifiers)
   
   # abilities
 
   def get_statistic_abilities_dict(self, ability_id: int) -> dict[int, StatisticAbility]:
     ability_type: AbilityTypeName = self.abilities[ability_id].ability_type
-    is_specific_statistic_ability: Callable[[int, StatisticAbility], bool] = lambda _, statistic_ability: statistic_ability.ability_type == ability_type and statistic_ability.ability_id == ability_id
-    return filter_dictionary(self.statistic_abilities, is_specific_statistic_ability)
+    is_specific_statistic_ability: Callable[[int, StatisticAbility], bool] = lambda _, statistic_ability: statistic_ability.ability_type == ability_type
+    return filter_dictionary(self.join_stored([Ability, StatisticAbility], [ability_id]), is_specific_statistic_ability)
   
   def get_statistic_abilities_list(self, ability_id: int) -> list[StatisticAbility]:
     return list(self.get_statistic_abilities_dict(ability_id).values())
@@ -732,27 +951,56 @@ class GameData(Loggable):
     statistic_ability: StatisticAbility = self.get_action_statistic_ability(ability_id)
     return statistic_ability.is_unique
   
-  def get_ability_action(self, ability_id: int, ability: Ability) -> AbilityAction:
+  def resolve_ability_action(self, ability_id: int, ability: Ability) -> AbilityAction:
+    """Builds the `AbilityAction` of an ability from the ability tables. Use `get_ability_action` instead, which only looks up actions that have already been resolved."""
     match ability.ability_type:
       case AbilityTypeName.IGNITE:
         return IgniteAction() # type: ignore
       case AbilityTypeName.HEAL:
         heal_ability = self.get_action_statistic_ability(ability_id)
-        is_unique: bool = self.is_statistic_ability_unique(ability_id)
-        return HealAction(initial_duration=heal_ability.initial_duration, is_unique=is_unique, heal_amount=heal_ability.amount)
+        return HealAction(initial_duration=heal_ability.initial_duration, is_unique=heal_ability.is_unique, heal_amount=heal_ability.amount)
       case AbilityTypeName.DEFEND:
         defend_ability = self.get_action_statistic_ability(ability_id)
-        is_unique: bool = self.is_statistic_ability_unique(ability_id)
-        return DefendAction(initial_duration=defend_ability.initial_duration, is_unique=is_unique, resistance=defend_ability.amount)
+        return DefendAction(initial_duration=defend_ability.initial_duration, is_unique=defend_ability.is_unique, resistance=defend_ability.amount)
       case AbilityTypeName.WEAKEN:
         weaken_ability = self.get_action_statistic_ability(ability_id)
-        is_unique: bool = self.is_statistic_ability_unique(ability_id)
-        return WeakenAction(initial_duration=weaken_ability.initial_duration, is_unique=is_unique, vulnerability=weaken_ability.amount)
+        return WeakenAction(initial_duration=weaken_ability.initial_duration, is_unique=weaken_ability.is_unique, vulnerability=weaken_ability.amount)
       case AbilityTypeName.PIERCE:
         return PierceAction()
       case AbilityTypeName.PARRY:
-        raise Exception(f"Invalid method of obtaining a parry ability action ({ability_id=}, {ability=}).")
+        parry_abilities: list[ParryAbility] = list(self.join_stored([Ability, ParryAbility], [ability_id]).values())
+        if len(parry_abilities) != 1: raise ValueError(f"Multiple or no parry abilities ({parry_abilities=}) found for {ability_id=}.")
+        return parry_abilities[0].get_ability_action()
       case _: raise ValueError(f"{ability.ability_type=} not recognised.")
+
+  def create_ability_actions(self) -> Mapping[int, AbilityAction]:
+    """Resolves the action of every ability at once. Abilities which can't be resolved (e.g. missing their statistic ability) are left out, so that looking them up raises the same error as resolving them."""
+    ability_actions: dict[int, AbilityAction] = {}
+    for (ability_id, ability) in self.abilities.items():
+      try:
+        ability_actions[ability_id] = self.resolve_ability_action(ability_id, ability)
+      except (ValueError, BufferError):
+        continue
+    return MappingProxyType(ability_actions)
+
+  def get_ability_actions(self) -> Mapping[int, AbilityAction]:
+    """A read-only table from ability identifiers to their actions. Built on first use rather than when loading, so the ability tables are only read once they're needed, and kept until the static tables change (see `invalidate_ability_actions`)."""
+    if self.__ability_actions == None: self.__ability_actions = self.create_ability_actions()
+    return self.__ability_actions
+
+  def invalidate_ability_actions(self) -> None:
+    """Also invalidates the enemy profiles, which hold ability actions."""
+    self.__ability_actions = None
+    self.__enemy_profiles = None
+
+  def get_ability_action_by_identifier(self, ability_id: int) -> AbilityAction:
+    ability_action: Optional[AbilityAction] = self.get_ability_actions().get(ability_id)
+    if ability_action == None: return self.resolve_ability_action(ability_id, self.abilities[ability_id]) # raises the reason it couldn't be resolved
+    return ability_action
+
+  def get_ability_action(self, ability_id: int, ability: Ability) -> AbilityAction:
+    if ability.ability_type == AbilityTypeName.PARRY: raise Exception(f"Invalid method of obtaining a parry ability action ({ability_id=}, {ability=}).")
+    return self.get_ability_action_by_identifier(ability_id)
   
   # character methods
   
@@ -811,7 +1059,7 @@ class GameData(Loggable):
   
   def get_enemy_abilities_for_attacking(self, enemy_id: int) -> dict[int, Ability]:
     """Assumes enemy has only one ability used in an attack."""
-    enemy_attack_abilities_dict: dict[int, EnemyAbility] = filter_dictionary(self.enemy_abilities, lambda _, enemy_ability: enemy_ability.enemy_id == enemy_id and enemy_ability.is_used_in_attack)
+    enemy_attack_abilities_dict: dict[int, EnemyAbility] = filter_dictionary(self.join_stored([Enemy, EnemyAbility], [enemy_id]), lambda _, enemy_ability: enemy_ability.is_used_in_attack)
 
     if len(enemy_attack_abilities_dict) == 0: return {}
 
@@ -826,12 +1074,8 @@ class GameData(Loggable):
   def get_enemy_ability_for_heal(self, enemy_id: int) -> Optional[tuple[int, Ability]]:
     """Gets the enemy's healing ability."""
     is_heal_ability: Callable[[int, StatisticAbility], bool] = lambda _, statistic_ability: statistic_ability.ability_type == AbilityTypeName.HEAL
-    heal_statistic_abilities: dict[int, StatisticAbility] = filter_dictionary(self.statistic_abilities, is_heal_ability)
-    heal_ability_identifiers: list[int] = []
-    for (_, heal_statistic_ability) in heal_statistic_abilities.items():
-      heal_ability_identifiers.append(heal_statistic_ability.ability_id)
-    is_enemy_heal_ability: Callable[[int, EnemyAbility], bool] = lambda _, enemy_ability: enemy_ability.enemy_id == enemy_id and enemy_ability.ability_id in heal_ability_identifiers and not enemy_ability.is_used_in_attack
-    enemy_heal_abilities_dict: dict[int, EnemyAbility] = filter_dictionary(self.enemy_abilities, is_enemy_heal_ability)
+    is_enemy_heal_ability: Callable[[int, EnemyAbility], bool] = lambda _, enemy_ability: not enemy_ability.is_used_in_attack and len(filter_dictionary(self.join_stored([Ability, StatisticAbility], [enemy_ability.ability_id]), is_heal_ability)) > 0
+    enemy_heal_abilities_dict: dict[int, EnemyAbility] = filter_dictionary(self.join_stored([Enemy, EnemyAbility], [enemy_id]), is_enemy_heal_ability)
 
     if len(enemy_heal_abilities_dict) == 0: return None
     if len(enemy_heal_abilities_dict) > 1: raise BufferError(f"{enemy_heal_abilities_dict=}; expected a dictionary of length `1`.")
@@ -845,8 +1089,7 @@ class GameData(Loggable):
 
   def get_character_inventory_items(self, character_id: Optional[int] = None) -> dict[int, InventoryItem]:
     if character_id == None: character_id = self.active_character_id
-    filter_expression: Callable[[int, InventoryItem], bool] = lambda _, inv_item: inv_item.character_id == character_id
-    return filter_dictionary(self.inventory_items, filter_expression)
+    return self.join_stored([Character, InventoryItem], [character_id])
   
   def set_inventory_item_equipped(self, inventory_item_id: int, being_equipped: bool) -> None:
     """Equips or unequips an inventory item depending on the \'being_equipped\' parameter."""
@@ -857,10 +1100,21 @@ class GameData(Loggable):
     self.set_inventory_item_equipped(inventory_item_id, being_equipped)
   
   def get_relevant_storage_items(self, storage_id: int) -> dict[int, StorageItem]:
-    filter_expression: Callable[[int, StorageItem], bool] = lambda _, storage_item: storage_item.storage_id == storage_id
-    return filter_dictionary(self.storage_items, filter_expression)
+    return self.join_stored([Storage, StorageItem], [storage_id])
   
+  def move_items(self, inventory_item_ids: list[int], storage_item_ids: list[int], storage_id: int) -> None:
+    """Moves the given inventory items to a storage, and the given storage items to the active character's inventory, in a single transaction. If any move fails, none of the items are moved."""
+    with self.transaction([InventoryItem, StorageItem]):
+      for inventory_item_id in inventory_item_ids:
+        self.move_inventory_item_to_storage(inventory_item_id, storage_id)
+      for storage_item_id in storage_item_ids:
+        self.move_storage_item_to_inventory(storage_item_id)
+
   def move_inventory_item_to_storage(self, inventory_item_id: int, storage_id: int) -> None:
+    with self.transaction([InventoryItem, StorageItem]):
+      self.__move_inventory_item_to_storage(inventory_item_id, storage_id)
+
+  def __move_inventory_item_to_storage(self, inventory_item_id: int, storage_id: int) -> None:
     # get inventory item data
     inventory_item: InventoryItem = self.inventory_items[inventory_item_id]
     item_id: int = inventory_item.item_id
@@ -868,25 +1122,25 @@ class GameData(Loggable):
     if inventory_item.equipped: raise Exception("Cannot move an equipped item to storage.")
     raw_storage_item_data: list[Any] = [storage_id, item_id, stack_size]
     
-    same_item: Callable[[int, StorageItem], bool] = lambda _, storage_item: storage_id == storage_item.storage_id and item_id == storage_item.item_id
-    matching_items: dict[int, StorageItem] = filter_dictionary(self.storage_items, same_item)
+    same_item: Callable[[int, StorageItem], bool] = lambda _, storage_item: item_id == storage_item.item_id
+    matching_items: dict[int, StorageItem] = filter_dictionary(self.get_relevant_storage_items(storage_id), same_item)
     matching_items_quantity: int = len(matching_items)
 
     if matching_items_quantity == 0: # if there are no items of the same type (in the target storage)
       self.insert_stored(StorageItem, raw_storage_item_data, StorageAttrName.STORAGE_ITEMS)
     elif matching_items_quantity == 1: # if there is one instance of same-type items (in the target storage)
-      matched_item_id: int = list(matching_items.keys())[0] # there will always be an item at index 0
-      matched_item: StorageItem = list(matching_items.values())[0] 
-      new_stack_size: int = stack_size + matched_item.stack_size # update stack size
-      raw_storage_item_data[2] = new_stack_size
-      self.update_database_record(StorageItem.get_table_name(), matched_item_id, raw_storage_item_data)
-      self.storage_items[matched_item_id].stack_size = new_stack_size
+      matched_item: StorageItem = list(matching_items.values())[0] # there will always be an item at index 0
+      matched_item.stack_size += stack_size # written to the database on the next save
     else: # erroneous case where there are 2 or more matches
       raise Exception(f"{matching_items_quantity=} greater than `1` ({matching_items=}).")
     
     self.delete_stored(InventoryItem, inventory_item_id, StorageAttrName.INVENTORY_ITEMS)
 
   def move_storage_item_to_inventory(self, storage_item_id: int) -> None:
+    with self.transaction([InventoryItem, StorageItem]):
+      self.__move_storage_item_to_inventory(storage_item_id)
+
+  def __move_storage_item_to_inventory(self, storage_item_id: int) -> None:
     character_id: int = unpack_optional(self.active_character_id) # 'unpack_optional' should never throw an exception here
     storage_item: StorageItem = self.storage_items[storage_item_id]
     item_id: int = storage_item.item_id
@@ -894,19 +1148,15 @@ class GameData(Loggable):
     equipped: bool = False # items should only equip when the player requests to
     raw_inventory_item_data: list[Any] = [character_id, item_id, stack_size, equipped]
 
-    same_item: Callable[[int, InventoryItem], bool] = lambda _,inv_item: character_id == inv_item.character_id and item_id == inv_item.item_id
-    matching_items: dict[int, InventoryItem] = filter_dictionary(self.inventory_items, same_item)
+    same_item: Callable[[int, InventoryItem], bool] = lambda _,inv_item: item_id == inv_item.item_id
+    matching_items: dict[int, InventoryItem] = filter_dictionary(self.get_character_inventory_items(character_id), same_item)
     matching_items_quantity: int = len(matching_items)
 
     if matching_items_quantity == 0: # if there are no items of the same type in the target storage
       self.insert_stored(InventoryItem, raw_inventory_item_data, StorageAttrName.INVENTORY_ITEMS)
     elif matching_items_quantity == 1: # if there is one instance of items of the same type in the target storage
-      matched_item_id: int = list(matching_items.keys())[0]
       matched_item: InventoryItem = list(matching_items.values())[0] # there will always be an item at index 0
-      new_stack_size: int = stack_size + matched_item.stack_size
-      raw_inventory_item_data[2] = new_stack_size
-      self.update_database_record(InventoryItem.get_table_name(), matched_item_id, raw_inventory_item_data)
-      self.inventory_items[matched_item_id].stack_size = new_stack_size
+      matched_item.stack_size += stack_size # written to the database on the next save
     else: # erroneous case where there are 2 or more matches
       raise Exception(f"{matching_items_quantity=} greater than `1` ({matching_items=}).")
     
@@ -942,9 +1192,7 @@ class GameData(Loggable):
     return [enemy_id] + self.get_multiple_random_enemy_identifiers(n-1, get_boss) # recursive call
   
   def add_fighting_enemy_to_grid_at_random_position(self, fighting_enemy_id: int) -> None:
-    position: Position = get_random_position(self.fighting_enemy_graph.dimensions)
-    if self.get_fighting_enemy_at(position) != None:
-      return self.add_fighting_enemy_to_grid_at_random_position(fighting_enemy_id) # recursive call
+    position: Position = self.fighting_enemy_graph.get_random_free_position() # picked from the free positions, so it never has to be retried
     return self.set_fighting_enemy_at(position, fighting_enemy_id)
   
   def generate_fighting_enemies(self) -> None:
@@ -952,7 +1200,11 @@ class GameData(Loggable):
     enemy_count: int = 1
     if not self.is_boss_encounter:
       enemy_count = generate_enemy_count()
-    enemy_identifiers: Queue[int] = Queue(self.get_multiple_random_enemy_identifiers(enemy_count, self.is_boss_encounter))
+    self.add_fighting_enemies(self.get_multiple_random_enemy_identifiers(enemy_count, self.is_boss_encounter))
+
+  def add_fighting_enemies(self, enemy_ids: list[int]) -> None:
+    """Creates a fighting enemy for each `EnemyID` (which may repeat), placing each at a random free position on the grid."""
+    enemy_identifiers: Queue[int] = Queue(enemy_ids)
     while not enemy_identifiers.empty():
       enemy_id: int = enemy_identifiers.get()
       enemy: Enemy = self.enemies[enemy_id]
@@ -960,38 +1212,48 @@ class GameData(Loggable):
       fighting_enemy = FightingEnemy(enemy_id, enemy.name, enemy.max_health, enemy.max_health, enemy.attack_damage, enemy.intelligence)
       self.set_fighting_enemy_abilities(fighting_enemy)
       # inserting into storage
-      fighting_enemy_id: int = get_next_available_identifier(self.fighting_enemies)
+      fighting_enemy_id: int = self.fighting_enemies.get_next_available_identifier()
       self.insert_into_storage(StorageAttrName.FIGHTING_ENEMIES, fighting_enemy_id, fighting_enemy)
       self.add_fighting_enemy_to_grid_at_random_position(fighting_enemy_id)
 
   def set_fighting_enemy_abilities(self, fighting_enemy: FightingEnemy) -> None:
-    """Sets the attack and heal abilities for a given fighting enemy. Having no attack ability means the enemy has only a standard attack. Having no heal ability means the enemy cannot heal."""
-    enemy_id: int = fighting_enemy.enemy_id
-    # attack abilities
-    attack_ability_ids: list[int] = []
-    attack_actions: list[AbilityAction] = []
-    attack_data: dict[int, Ability] = self.get_enemy_abilities_for_attacking(enemy_id)
-    if attack_data != None:
-      attack_ability_ids = list(attack_data.keys())
-      for (attack_ability_id, attack_ability) in attack_data.items():
-        attack_actions.append(self.get_ability_action(attack_ability_id, attack_ability))
-    # heal ability
-    heal_ability_id: Optional[int] = None
-    heal_action: list[AbilityAction] = []
-    heal_data: Optional[tuple[int, Ability]] = self.get_enemy_ability_for_heal(enemy_id)
-    if heal_data != None:
-      heal_ability_id = heal_data[0]
-      heal_action = [self.get_ability_action(heal_ability_id, heal_data[1])]
-
-    fighting_enemy.set_action_identifiers(attack_ability_ids, heal_ability_id)
-    fighting_enemy.calculate_action_offensiveness_value(ActionName.ATTACK, attack_actions)
-    fighting_enemy.calculate_action_offensiveness_value(ActionName.HEAL, heal_action)
+    """Sets the attack and heal abilities for a given fighting enemy from the profile of its enemy. Having no attack ability means the enemy has only a standard attack. Having no heal ability means the enemy cannot heal."""
+    fighting_enemy.apply_profile(self.get_enemy_profiles()[fighting_enemy.enemy_id])
+
+  def create_enemy_profiles(self) -> Mapping[int, EnemyProfile]:
+    """Works out the profile of every enemy at once, with a single pass over each of the ability tables rather than searching them for each enemy."""
+    heal_ability_ids: set[int] = {statistic_ability.ability_id for statistic_ability in self.statistic_abilities.values() if statistic_ability.ability_type == AbilityTypeName.HEAL}
+    attack_ability_ids: dict[int, list[int]] = {}
+    enemy_heal_ability_ids: dict[int, list[int]] = {}
+    for enemy_ability in self.enemy_abilities.values():
+      if enemy_ability.is_used_in_attack: attack_ability_ids.setdefault(enemy_ability.enemy_id, []).append(enemy_ability.ability_id)
+      elif enemy_ability.ability_id in heal_ability_ids: enemy_heal_ability_ids.setdefault(enemy_ability.enemy_id, []).append(enemy_ability.ability_id)
+
+    enemy_profiles: dict[int, EnemyProfile] = {}
+    for (enemy_id, enemy) in self.enemies.items():
+      # attack abilities
+      enemy_attack_ability_ids: tuple[int, ...] = tuple(attack_ability_ids.get(enemy_id, []))
+      attack_actions: tuple[AbilityAction, ...] = tuple(self.get_ability_action(ability_id, self.abilities[ability_id]) for ability_id in enemy_attack_ability_ids)
+      action_offensiveness_table: dict[ActionName, float] = {ActionName.ATTACK: unpack_optional(calculate_action_offensiveness(ActionName.ATTACK, list(attack_actions)))}
+      # heal ability
+      heal_ability_id: Optional[int] = None
+      heal_action: Optional[AbilityAction] = None
+      enemy_heal_ability_id_list: list[int] = enemy_heal_ability_ids.get(enemy_id, [])
+      if len(enemy_heal_ability_id_list) > 1: raise BufferError(f"{enemy_heal_ability_id_list=}; expected at most one healing ability for {enemy_id=}.")
+      if len(enemy_heal_ability_id_list) == 1:
+        heal_ability_id = enemy_heal_ability_id_list[0]
+        heal_action = self.get_ability_action(heal_ability_id, self.abilities[heal_ability_id])
+        action_offensiveness_table[ActionName.HEAL] = unpack_optional(calculate_action_offensiveness(ActionName.HEAL, [heal_action]))
+      enemy_profiles[enemy_id] = EnemyProfile(enemy_attack_ability_ids, heal_ability_id, attack_actions, heal_action, MappingProxyType(action_offensiveness_table), get_decision_error_bound(enemy.intelligence))
+    return MappingProxyType(enemy_profiles)
+
+  def get_enemy_profiles(self) -> Mapping[int, EnemyProfile]:
+    """A read-only table from each `EnemyID` to its profile. Like `get_ability_actions`, it is built on first use and kept until the static tables change, so spawning a fighting enemy doesn't read any tables."""
+    if self.__enemy_profiles == None: self.__enemy_profiles = self.create_enemy_profiles()
+    return self.__enemy_profiles
   
   def finish_combat_encounter(self) -> None:
-    for i in range(len(self.fighting_enemy_graph)):
-      p: Position = self.fighting_enemy_graph.length_to_point(i)
-      fighting_enemy_id: Optional[int] = self.fighting_enemy_graph[p]
-      if fighting_enemy_id == None: continue
+    for (_, fighting_enemy_id) in self.fighting_enemy_graph.items():
       del self.fighting_enemies[fighting_enemy_id]
     self.fighting_enemy_graph.clear_graph()
   
@@ -1018,21 +1280,16 @@ class GameData(Loggable):
     item_count: int = generate_structure_item_count()
     away_storage_id: Optional[int] = self.away_storage
     if away_storage_id == None: raise TypeError(f"{self.away_storage=} cannot be `None` when encountering a structure.")
-    item_identifiers: Queue[int] = Queue(self.get_multiple_unique_random_item_identifiers(item_count))
-    while not item_identifiers.empty():
-      item_id: int = item_identifiers.get()
-      self.insert_stored(StorageItem, [away_storage_id, item_id, 1], StorageAttrName.STORAGE_ITEMS)
+    item_identifiers: list[int] = self.get_multiple_unique_random_item_identifiers(item_count)
+    storage_item_data: list[list[Any]] = [[away_storage_id, item_id, 1] for item_id in item_identifiers]
+    self.insert_many_stored(StorageItem, storage_item_data, StorageAttrName.STORAGE_ITEMS)
   
   def finish_structure_encounter(self) -> None:
     """Deletes items in the structure after it has been accessed."""
     away_storage_id: Optional[int] = self.away_storage
     if away_storage_id == None: raise TypeError(f"{self.away_storage=} cannot be `None` when finishing a structure encounter.")
-    item_in_selected_storage: Callable[[int, StorageItem], bool] = lambda _, storage_item: storage_item.storage_id == away_storage_id
-    selected_storage_items: dict[int, StorageItem] = filter_dictionary(self.storage_items, item_in_selected_storage)
-    storage_item_identifiers: Queue[int] = Queue(list(selected_storage_items.keys()))
-    while not storage_item_identifiers.empty():
-      storage_item_identifier: int = storage_item_identifiers.get()
-      self.delete_stored(StorageItem, storage_item_identifier, StorageAttrName.STORAGE_ITEMS)
+    selected_storage_items: dict[int, StorageItem] = self.get_relevant_storage_items(away_storage_id)
+    self.delete_many_stored(StorageItem, selected_storage_items.keys(), StorageAttrName.STORAGE_ITEMS)
 
   def is_all_fighting_enemies_dead(self) -> bool:
     fighting_enemies: list[FightingEnemy] = list(self.fighting_enemies.values())
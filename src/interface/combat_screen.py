@@ -20,7 +20,6 @@ from game_data import GameData
 from stored.items.weapon import Weapon
 from stored.items.inventory_item import InventoryItem
 
-from stored.abilities.item_ability import ItemAbility
 from stored.abilities.ability import Ability
 from stored.abilities.parry_ability import ParryAbility
 
@@ -163,12 +162,10 @@ class CombatScreen(AbstractScreen):
     if not inventory_item.equipped: raise ValueError(f"Expected `{inventory_item.equipped=}` for `{inventory_item}` (`{inventory_item_id=}`) to be `True`; got `{inventory_item.equipped}` instead.")
 
     item_id: int = inventory_item.item_id
-    selected_item_abilities_dict: dict[int, ItemAbility] = filter_dictionary(self.game_data.item_abilities, lambda _, item_ability: item_ability.item_id == item_id)
-    selected_item_abilities: list[ItemAbility] = list(selected_item_abilities_dict.values())
+    ability_identifiers: list[int] = self.game_data.get_ability_identifiers_from_item_id(item_id)
 
     ability_texts: list[str] = []
-    for item_ability in selected_item_abilities:
-      ability_id: int = item_ability.ability_id
+    for ability_id in ability_identifiers:
       ability: Ability = self.game_data.abilities[ability_id]
       ability_text: str = ability.text
       ability_texts.append(ability_text)
@@ -504,12 +501,13 @@ class CombatScreen(AbstractScreen):
   
   def display_enemy_info_on_grid(self) -> None:
     fighting_enemy_graph_dimensions: Position = self.game_data.fighting_enemy_graph.dimensions
+    fighting_enemy_ids: dict[Position, int] = dict(self.game_data.fighting_enemy_graph.items()) # every cell is redrawn, but only the occupied ones are looked up
     for i in range(len(self.game_data.fighting_enemy_graph)):
       button_display: str = "-"
       damage_str: str = "-"
       heal_str: str = "-"
       position: Position = length_to_point(i, fighting_enemy_graph_dimensions)
-      fighting_enemy_id: Optional[int] = self.game_data.fighting_enemy_graph[position]
+      fighting_enemy_id: Optional[int] = fighting_enemy_ids.get(position)
       text_variables: EnemyInterfaceTextVariables = unpack_optional(self.enemy_name_variables[position])
       enemy_interface_widgets: EnemyInterfaceWidgets = unpack_optional(self.enemy_interface_widgets[position])
       enemy_interface_widgets[1].config(bg=Constants.DISABLED_COLOUR)
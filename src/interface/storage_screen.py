@@ -109,12 +109,10 @@ class StorageScreen(AbstractScreen):
     inventory_items_to_move: list[int] = list(activated_inventory_move_buttons.keys())
     storage_items_to_move: list[int] = list(activated_storage_move_buttons.keys())
 
+    self.game_data.move_items(inventory_items_to_move, storage_items_to_move, storage_id) # moves every item in one transaction, so a failed move leaves the items where they were
     for inventory_item_id in inventory_items_to_move:
-      self.game_data.move_inventory_item_to_storage(inventory_item_id, storage_id)
       del self.inventory_item_swap_buttons[inventory_item_id]
-
     for storage_item_id in storage_items_to_move:
-      self.game_data.move_storage_item_to_inventory(storage_item_id)
       del self.storage_item_swap_buttons[storage_item_id]
 
     self.load(**kwargs) # reloads buttons at the end
@@ -0,0 +1,16 @@
+import sys
+import colorama as cr
+
+from database.migration import migrate_database
+
+def main() -> None:
+  """Usage: `python src/migrate.py <toml|sqlite>` (from the same directory as `python src/main.py`)."""
+  if len(sys.argv) != 2:
+    print(f"{cr.Fore.RED}Usage: python src/migrate.py <toml|sqlite>{cr.Fore.RESET}")
+    quit(1)
+  target_backend_name: str = sys.argv[1]
+  print(f"{cr.Fore.YELLOW}Migrating to `{target_backend_name}`...{cr.Fore.RESET}")
+  table_names: list[str] = migrate_database(target_backend_name)
+  print(f"{cr.Fore.GREEN}Migrated {len(table_names)} tables{cr.Fore.RESET}")
+
+if __name__ == "__main__": main()
@@ -0,0 +1,27 @@
+import argparse
+import time
+import colorama as cr
+
+import app # imported first, so that the game's modules (which import each other) are loaded in the same order as in `main.py`
+from combat_management.balance_simulation import create_simulation_game_data, get_loadouts, run_simulation, write_statistics
+
+def main() -> None:
+  """Usage: `python src/simulate.py [options]` (from the same directory as `python src/main.py`). Simulates combats with every loadout of one weapon and at most one equipable, writing the statistics of each loadout to a CSV or JSON Lines file."""
+  parser = argparse.ArgumentParser(description="Simulates combats with each loadout to compare their balance.")
+  parser.add_argument("--combats", type=int, default=1000, help="the number of combats simulated with each loadout")
+  parser.add_argument("--workers", type=int, default=None, help="the number of processes (defaults to one for each CPU)")
+  parser.add_argument("--seed", type=int, default=0)
+  parser.add_argument("--max-rounds", type=int, default=100, help="the number of rounds after which a combat is counted as a loss")
+  parser.add_argument("--enemies", type=int, nargs="+", action="append", default=None, help="the `EnemyID` of each enemy in a composition to fight (may be repeated; defaults to random encounters)")
+  parser.add_argument("--output", default="simulation.csv", help="ends with `.json` or `.jsonl` for JSON Lines, and otherwise is written as CSV")
+  arguments = parser.parse_args()
+
+  enemy_compositions = [None] if arguments.enemies == None else [tuple(enemy_ids) for enemy_ids in arguments.enemies]
+  loadouts = get_loadouts(create_simulation_game_data(), enemy_compositions)
+  print(f"{cr.Fore.YELLOW}Simulating {arguments.combats} combats with each of {len(loadouts)} loadouts...{cr.Fore.RESET}")
+  start_time: float = time.perf_counter()
+  loadout_count: int = write_statistics(run_simulation(loadouts, arguments.combats, arguments.seed, arguments.workers, max_rounds=arguments.max_rounds), arguments.output)
+  elapsed_time: float = time.perf_counter() - start_time
+  print(f"{cr.Fore.GREEN}Wrote {loadout_count} loadouts to `{arguments.output}` in {elapsed_time:.1f}s{cr.Fore.RESET}")
+
+if __name__ == "__main__": main()
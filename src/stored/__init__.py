@@ -1,5 +1,6 @@
-__all__ = ["stored", "user", "world"]
+__all__ = ["row_view", "stored", "user", "world"]
 
+from . import row_view
 from . import stored
 from . import user
 from . import world
@@ -1,7 +1,7 @@
 from tools.typing_tools import *
 from tools.ability_names import *
 
-from database.condition import Condition
+from database.condition import *
 
 from stored.stored import *
 
@@ -14,24 +14,24 @@ class Ability(Stored):
   :param ability_type: The ability type table which the ability data can be found in.
   :type ability_type: AbilityTypeName
   """
+  __slots__ = ("text", "ability_type")
+  FIELD_NAMES: tuple[str, ...] = ("text", "ability_type")
+
   def __init__(self, text: str, ability_type: AbilityTypeName, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.text = text
-    self.ability_type = ability_type
+    object.__setattr__(self, "text", text)
+    object.__setattr__(self, "ability_type", ability_type)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.ABILITY
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.text, self.ability_type]
-  
   @staticmethod
   def instantiate(ability_data: list[Any], loaded: bool = True):
     return instantiate_ability(ability_data, loaded)
   
   @staticmethod
   def identical_condition(stored_row: list[Any]) -> Condition:
-    return lambda _identifier, row: stored_row[0] == row[0] and stored_row[1] == row[1]
+    return Eq("Text", stored_row[0]) & Eq("Type", stored_row[1])
   
   # built-in methods
 
@@ -1,31 +1,31 @@
 from tools.typing_tools import *
 from tools.custom_exceptions import AbstractMethodCallError
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 from ability_action import AbilityAction
 
 class AbstractAbility(Stored):
+  __slots__ = ("ability_id",)
+  FIELD_NAMES: tuple[str, ...] = ("ability_id",)
+
   def __init__(self, ability_id: int, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.ability_id: int = ability_id
+    object.__setattr__(self, "ability_id", ability_id)
 
   # `Stored` methods
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.NONE
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.ability_id]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_abstract_ability(data, loaded)
   
   @staticmethod
   def identical_condition(abstract_ability_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
   
   # offensiveness and decision-making methods
 
@@ -1,6 +1,6 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 class ItemAbility(Stored):
@@ -10,26 +10,26 @@ class ItemAbility(Stored):
   :param ability_id: The ability which this links to.
   :type ability_id: int
   """
+  __slots__ = ("item_id", "ability_id")
+  FIELD_NAMES: tuple[str, ...] = ("item_id", "ability_id")
+
   def __init__(self, item_id: int, ability_id: int, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.item_id = item_id
-    self.ability_id = ability_id
+    object.__setattr__(self, "item_id", item_id)
+    object.__setattr__(self, "ability_id", ability_id)
 
   # `Stored` methods
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.ITEM_ABILITY
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.item_id, self.ability_id]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_item_ability(data, loaded)
   
   @staticmethod
   def identical_condition(item_ability_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
   
   # built-in methods
 
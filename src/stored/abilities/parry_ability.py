@@ -2,30 +2,30 @@ from math import exp2, sqrt
 
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.abilities.abstract_ability import *
 from ability_action import *
 
 class ParryAbility(AbstractAbility):
+  __slots__ = ("damage_threshold", "reflection_proportion")
+  FIELD_NAMES: tuple[str, ...] = ("ability_id", "damage_threshold", "reflection_proportion")
+
   def __init__(self, ability_id: int, damage_threshold: float, reflection_proportion: float, loaded: bool = True) -> None:
     #"ParryAbilityID", "AbilityID", "DamageThreshold", "ReflectionProportion"
     super().__init__(ability_id, loaded)
-    self.damage_threshold = damage_threshold
-    self.reflection_proportion = reflection_proportion
+    object.__setattr__(self, "damage_threshold", damage_threshold)
+    object.__setattr__(self, "reflection_proportion", reflection_proportion)
   
   @staticmethod
   def get_table_name() -> TableName: return TableName.PARRY_ABILITY
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.damage_threshold, self.reflection_proportion]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_parry_ability(data, loaded)
   
   @staticmethod
   def identical_condition(parry_ability_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
   
   # built-in methods
 
@@ -2,32 +2,32 @@ from tools.typing_tools import *
 from tools.constants import Constants, DecisionMakingConstants
 from tools.ability_names import AbilityTypeName
 
-from database.condition import Condition
+from database.condition import *
 from stored.abilities.abstract_ability import *
 
 from ability_action import *
 
 class StatisticAbility(AbstractAbility):
+  __slots__ = ("ability_type", "amount", "initial_duration", "is_unique")
+  FIELD_NAMES: tuple[str, ...] = ("ability_id", "ability_type", "amount", "initial_duration", "is_unique")
+
   def __init__(self, ability_id: int, ability_type: AbilityTypeName, amount: float, initial_duration: Optional[int], is_unique: bool, loaded: bool = True) -> None:
     super().__init__(ability_id, loaded)
-    self.ability_type: AbilityTypeName = ability_type
-    self.amount: float = amount
-    self.initial_duration: Optional[int] = initial_duration
-    self.is_unique: bool = is_unique
+    object.__setattr__(self, "ability_type", ability_type)
+    object.__setattr__(self, "amount", amount)
+    object.__setattr__(self, "initial_duration", initial_duration)
+    object.__setattr__(self, "is_unique", is_unique)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.STATISTIC_ABILITY
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.ability_type, self.amount, self.initial_duration, self.is_unique]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_statistic_ability(data, loaded)
   
   @staticmethod
   def identical_condition(statistic_ability_row: list[Any]) -> Condition:
-    return lambda _, row: statistic_ability_row[0] == row[0]
+    return Eq("AbilityID", statistic_ability_row[0])
   
   # offensiveness and decision-making methods
 
@@ -2,9 +2,11 @@ from tools.typing_tools import *
 from tools.decision_tools import *
 
 from stored.entities.fighting_entity import *
-from database.condition import Condition
+from database.condition import *
 
 class Character(FightingEntity):
+  FIELD_NAMES: tuple[str, ...] = ("user_id", "name", "health", "max_health")
+
   def __init__(self, user_id: int, name: str, health: float, max_health: float, loaded: bool = False, is_logging_enabled: bool = False, label: Optional[str] = None, include_call_stack: bool = False) -> None:
     """
     :param user_id: User who the `Character` object is attatched to.
@@ -15,21 +17,18 @@ class Character(FightingEntity):
     :type health: float
     """
     super().__init__(name, health, max_health, loaded, is_logging_enabled, label, include_call_stack)
-    self.user_id = user_id
+    object.__setattr__(self, "user_id", user_id)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.CHARACTER
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.user_id, self.name, self.health, self.max_health]
-  
   @staticmethod
   def instantiate(character_data: list[Any], loaded: bool = True):
     return instantiate_character(character_data, loaded)
   
   @staticmethod
   def identical_condition(entity_row: list[Any]) -> Condition:
-    return lambda _, row: entity_row[0] == row[0] and entity_row[1] == row[1]
+    return Eq("UserID", entity_row[0]) & Eq("Name", entity_row[1])
   
   @staticmethod
   def get_default_max_health() -> float: return 100
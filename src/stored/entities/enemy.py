@@ -3,20 +3,20 @@ from tools.typing_tools import *
 from stored.stored import *
 
 class Enemy(Stored):
+  __slots__ = ("name", "max_health", "attack_damage", "intelligence", "is_boss")
+  FIELD_NAMES: tuple[str, ...] = ("name", "max_health", "attack_damage", "intelligence", "is_boss")
+
   def __init__(self, name: str, max_health: float, attack_damage: float, intelligence: float, is_boss: bool, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.name = name
-    self.max_health = max_health
-    self.attack_damage = attack_damage
-    self.intelligence = intelligence
-    self.is_boss = is_boss
+    object.__setattr__(self, "name", name)
+    object.__setattr__(self, "max_health", max_health)
+    object.__setattr__(self, "attack_damage", attack_damage)
+    object.__setattr__(self, "intelligence", intelligence)
+    object.__setattr__(self, "is_boss", is_boss)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.ENEMY
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.name, self.max_health, self.attack_damage, self.intelligence, self.is_boss]
-  
   @staticmethod
   def instantiate(enemy_data: list[Any], loaded: bool = True):
     return instantiate_enemy(enemy_data, loaded)
@@ -1,13 +1,15 @@
 from tools.typing_tools import *
 from tools.decision_tools import *
+from tools.batch_decision_tools import NO_ACTION_OFFENSIVENESS, generate_decision_errors, calculate_aggressiveness_values, choose_action_indexes
 from tools.constants import *
 
 from stored.entities.fighting_entity import *
 from stored.abilities.abstract_ability import AbstractAbility
 
-from database.condition import Condition
+from database.condition import *
 
 from ability_action import *
+from data_structures.enemy_profile import EnemyProfile
 
 def validate_action_name[FightingEnemyType: FightingEnemy, ReturnType](func: Callable[Concatenate[FightingEnemyType, ...], ReturnType]) -> Callable[Concatenate[FightingEnemyType, ...], ReturnType]:
   def wrapper(self: FightingEnemyType, action_name: ActionName, *args, **kwargs) -> ReturnType:
@@ -16,13 +18,15 @@ def validate_action_name[FightingEnemyType: FightingEnemy, ReturnType](func: Cal
   return wrapper
 
 class FightingEnemy(FightingEntity):
+  FIELD_NAMES: tuple[str, ...] = ("enemy_id", "name", "health", "max_health", "attack_damage", "intelligence")
+
   def __init__(self, enemy_id: int, name: str, health: float, max_health: float, attack_damage: float, intelligence: float, loaded: bool = True, is_logging_enabled: bool = True, label: Optional[str] = None, include_call_stack: bool = False) -> None:
     super().__init__(name, health, max_health, loaded, is_logging_enabled, label, include_call_stack)
-    self.enemy_id: int = enemy_id
-    self.attack_damage: float = attack_damage
+    object.__setattr__(self, "enemy_id", enemy_id)
+    object.__setattr__(self, "attack_damage", attack_damage)
     # decision-making attributes
     ## scalar values
-    self.intelligence: float = intelligence
+    object.__setattr__(self, "intelligence", intelligence)
     self.decision_error_bound: float = get_decision_error_bound(self.intelligence)
     ## tables
     self.__action_offensiveness_table: dict[ActionName, float] = {
@@ -42,22 +46,23 @@ class FightingEnemy(FightingEntity):
   @staticmethod
   def get_table_name() -> TableName: return TableName.NONE
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.enemy_id] + super().get_raw_data() + [self.attack_damage, self.intelligence]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_fighting_enemy(data, loaded)
   
   @staticmethod
   def identical_condition(fighting_enemy_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
   # getter and setter methods
 
   def get_action_names(self) -> list[ActionName]:
     return list(self.__action_offensiveness_table.keys())
   
+  def get_action_offensiveness(self, action_name: ActionName) -> Optional[float]:
+    """`None` if the fighting enemy can't take the action."""
+    return self.__action_offensiveness_table.get(action_name)
+
   @validate_action_name
   def set_action_offensiveness(self, action_name: ActionName, offensiveness: float) -> None:
     self.__action_offensiveness_table[action_name] = offensiveness
@@ -81,18 +86,18 @@ class FightingEnemy(FightingEntity):
     :param store_result: Whether the result should be stored in `self`. Defaults to `True`.
     :type store_result: bool
     """
-    offensiveness_total: float = DecisionMakingConstants.DEFAULT_ATTACK_OFFENSIVENESS if action_name == ActionName.ATTACK else DecisionMakingConstants.DEFAULT_HEAL_OFFENSIVENESS
-    n: float = 1
-    if actions != []: 
-      for ability in actions:
-        offensiveness_total += ability.calculate_offensiveness()
-        n += 1
-    elif action_name == ActionName.HEAL:
-      return None
-    average_offensiveness = offensiveness_total/n
+    average_offensiveness: Optional[float] = calculate_action_offensiveness(action_name, actions)
+    if average_offensiveness == None: return None
     if store_result: self.set_action_offensiveness(action_name, average_offensiveness)
     return average_offensiveness
-      
+
+  def apply_profile(self, profile: EnemyProfile) -> None:
+    """Sets the abilities, action offensiveness and decision error bound from the profile of the fighting enemy's `Enemy`, instead of working them out again. The profile itself is shared, so only its tables are copied."""
+    self.ability_id_table = {ActionName.ATTACK: list(profile.attack_ability_ids)}
+    if profile.heal_ability_id != None: self.ability_id_table[ActionName.HEAL] = profile.heal_ability_id
+    self.__action_offensiveness_table = dict(profile.action_offensiveness_table)
+    self.decision_error_bound = profile.decision_error_bound
+
   ## aggressiveness calculations
   def generate_decision_error(self) -> float:
     return generate_decision_error(self.decision_error_bound)
@@ -122,6 +127,54 @@ class FightingEnemy(FightingEntity):
     if chosen_action == None: raise ValueError(f"{chosen_action=} must not be `None` by this point.")
     return chosen_action[0]
 
+def calculate_action_offensiveness(action_name: ActionName, actions: list[AbilityAction]) -> Optional[float]:
+  """
+  The average offensiveness of an action and its abilities, or `None` for a heal without any abilities.
+
+  :param actions: The list of abilities associated with this action. Being empty denotes no abilities.
+  :type actions: list[AbilityAction]
+  """
+  offensiveness_total: float = DecisionMakingConstants.DEFAULT_ATTACK_OFFENSIVENESS if action_name == ActionName.ATTACK else DecisionMakingConstants.DEFAULT_HEAL_OFFENSIVENESS
+  n: float = 1
+  if actions != []:
+    for ability in actions:
+      offensiveness_total += ability.calculate_offensiveness()
+      n += 1
+  elif action_name == ActionName.HEAL:
+    return None
+  return offensiveness_total/n
+
+def choose_wave_action_names(fighting_enemies: list[FightingEnemy], remaining_ignition_durations: list[Optional[int]], damage_threshold: Optional[float], reflection_proportion: Optional[float], negative_character_value: float) -> list[ActionName]:
+  """
+  Decides the action of every fighting enemy in a wave at once (see `batch_decision_tools`), which is equivalent to calling `calculate_aggressiveness` and then `choose_action_name` for each fighting enemy in turn. The `aggressiveness` of each fighting enemy is set as it would be by `calculate_aggressiveness`.
+
+  :param remaining_ignition_durations: The remaining ignition duration of each fighting enemy, in the same order as `fighting_enemies`.
+  :type remaining_ignition_durations: list[Optional[int]]
+  :return: The name of the action chosen by each fighting enemy, in the same order as `fighting_enemies`.
+  :rtype: list[ActionName]
+  """
+  error_bounds: list[float] = [fighting_enemy.decision_error_bound for fighting_enemy in fighting_enemies]
+  decision_errors: list[float] = generate_decision_errors(error_bounds)
+  aggressiveness_values: list[float] = calculate_aggressiveness_values(
+    [fighting_enemy.health for fighting_enemy in fighting_enemies],
+    [fighting_enemy.max_health for fighting_enemy in fighting_enemies],
+    remaining_ignition_durations,
+    [fighting_enemy.damage_resistance for fighting_enemy in fighting_enemies],
+    [fighting_enemy.is_pierced for fighting_enemy in fighting_enemies],
+    calculate_parry_aggressiveness(damage_threshold, reflection_proportion),
+    negative_character_value,
+    decision_errors,
+    error_bounds
+  )
+  action_names: list[ActionName] = [ActionName.ATTACK, ActionName.HEAL] # the order of `__action_offensiveness_table`, so that ties are broken in the same way as by `choose_action_name`
+  offensiveness_table: list[list[float]] = []
+  for fighting_enemy in fighting_enemies:
+    offensiveness_values: list[Optional[float]] = [fighting_enemy.get_action_offensiveness(action_name) for action_name in action_names]
+    offensiveness_table.append([NO_ACTION_OFFENSIVENESS if offensiveness == None else offensiveness for offensiveness in offensiveness_values])
+  for (fighting_enemy, aggressiveness) in zip(fighting_enemies, aggressiveness_values):
+    fighting_enemy.aggressiveness = aggressiveness
+  return [action_names[action_index] for action_index in choose_action_indexes(aggressiveness_values, offensiveness_table)]
+
 def instantiate_fighting_enemy(fighting_enemy_data: list[Any] = [], loaded: bool = True) -> FightingEnemy:
   enemy_id: int = fighting_enemy_data[0]
   name: str = fighting_enemy_data[1]
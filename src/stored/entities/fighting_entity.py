@@ -76,12 +76,14 @@ def append_message_info[FightingEntityType: FightingEntity](attribute_tag: Union
 # class
 
 class FightingEntity(Stored):
+  FIELD_NAMES: tuple[str, ...] = ("name", "health", "max_health")
+
   def __init__(self, name: str, health: float, max_health: float, loaded: bool = True, is_logging_enabled: bool = False, label: Optional[str] = None, include_call_stack: bool = False) -> None:
-    self.name = name
+    object.__setattr__(self, "name", name)
     if label == None: label = self.name
     super().__init__(loaded, is_logging_enabled, label, include_call_stack)
-    self.health = health
-    self.max_health = max_health
+    object.__setattr__(self, "health", health)
+    object.__setattr__(self, "max_health", max_health)
     # attributes not stored in the database, but which are still important
     self.__damage_resistance: float = 0
     self.is_ignited: bool = False
@@ -103,9 +105,6 @@ class FightingEntity(Stored):
   @staticmethod
   def get_table_name() -> TableName: return TableName.NONE
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.name, self.health, self.max_health]
-  
   @staticmethod
   def instantiate(fighting_entity_data: list[Any], loaded: bool = True):
     return instantiate_fighting_entity(fighting_entity_data, loaded)
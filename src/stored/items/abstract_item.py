@@ -1,21 +1,22 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 class AbstractItem(Stored):
+  __slots__ = ()
+  FIELD_NAMES: tuple[str, ...] = ()
+
   def __init__(self, loaded: bool = True) -> None:
     super().__init__(loaded)
 
-  def get_raw_data(self) -> list[Any]: return []
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_abstract_item(data, loaded)
   
   @staticmethod
   def identical_condition(abstract_item_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
 def instantiate_abstract_item(abstract_item_data: list[Any] = [], loaded: bool = True) -> AbstractItem:
   return AbstractItem()
\ No newline at end of file
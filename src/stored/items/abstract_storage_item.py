@@ -1,16 +1,16 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 class AbstractStorageItem(Stored):
+  __slots__ = ("item_id", "stack_size")
+  FIELD_NAMES: tuple[str, ...] = ("item_id", "stack_size")
+
   def __init__(self, item_id: int, stack_size: int, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.item_id = item_id
-    self.stack_size = stack_size
-
-  def get_raw_data(self) -> list[Any]:
-    return [self.item_id, self.stack_size]
+    object.__setattr__(self, "item_id", item_id)
+    object.__setattr__(self, "stack_size", stack_size)
 
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
@@ -18,7 +18,7 @@ class AbstractStorageItem(Stored):
   
   @staticmethod
   def identical_condition(abstract_storage_item_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
 def instantiate_abstract_storage_item(abstract_storage_item_data: list[Any] = [], loaded: bool = True) -> AbstractStorageItem:
   item_id: int = abstract_storage_item_data[0]
@@ -1,28 +1,28 @@
-from database.condition import Condition
+from database.condition import *
 from tools.typing_tools import *
 
 from stored.items.abstract_item import *
 
 class Equipable(AbstractItem):
+  __slots__ = ("item_id",)
+  FIELD_NAMES: tuple[str, ...] = ("item_id",)
+
   def __init__(self, item_id: int, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.item_id = item_id
+    object.__setattr__(self, "item_id", item_id)
 
   # stored methods
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.EQUIPABLE
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.item_id]
-  
   @staticmethod
   def instantiate(equipable_data: list[Any], loaded: bool = True):
     return instantiate_equipable(equipable_data, loaded)
   
   @staticmethod
   def identical_condition(equipable_row: list[Any]) -> Condition:
-    return lambda _, row: row[0] == equipable_row[0]
+    return Eq("ItemID", equipable_row[0])
 
 def instantiate_equipable(equipable_data: list[Any], loaded: bool = True) -> Equipable:
   item_id: int = equipable_data[0]
@@ -1,6 +1,6 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.items.abstract_storage_item import *
 
 class InventoryItem(AbstractStorageItem):
@@ -18,24 +18,24 @@ class InventoryItem(AbstractStorageItem):
   :param loaded: Whether the object has been loaded into memory or not. Defaults to `True`.
   :type loaded: bool
   """
+  __slots__ = ("character_id", "equipped")
+  FIELD_NAMES: tuple[str, ...] = ("character_id", "item_id", "stack_size", "equipped")
+
   def __init__(self, character_id: int, item_id: int, stack_size: int = 1, equipped: bool = False, loaded: bool = True) -> None:
     super().__init__(item_id, stack_size, loaded)
-    self.character_id = character_id
-    self.equipped = equipped
+    object.__setattr__(self, "character_id", character_id)
+    object.__setattr__(self, "equipped", equipped)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.INVENTORY_ITEM
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.character_id] + super().get_raw_data() + [self.equipped]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_inventory_item(data, loaded)
   
   @staticmethod
   def identical_condition(inventory_item_row: list[Any]) -> Condition:
-    return lambda _, row: row[0] == inventory_item_row[0] and row[1] == inventory_item_row[1]
+    return Eq("CharacterID", inventory_item_row[0]) & Eq("ItemID", inventory_item_row[1])
   
   # built-in methods
   
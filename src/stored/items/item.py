@@ -4,19 +4,19 @@ from stored.stored import *
 from tools.constants import ItemType
 
 class Item(Stored):
+  __slots__ = ("item_type", "name")
+  FIELD_NAMES: tuple[str, ...] = ("item_type", "name")
+
   def __init__(self, item_type: ItemType, name: str, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.item_type = item_type
-    self.name = name
+    object.__setattr__(self, "item_type", item_type)
+    object.__setattr__(self, "name", name)
 
   # stored methods
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.ITEM
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.item_type, self.name]
-  
   @staticmethod
   def instantiate(item_data: list[Any], loaded: bool = True):
     return instantiate_item(item_data, loaded)
@@ -1,28 +1,28 @@
 from tools.typing_tools import *
 from tools.constants import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 class Storage(Stored):
+  __slots__ = ("world_id", "storage_type")
+  FIELD_NAMES: tuple[str, ...] = ("world_id", "storage_type")
+
   def __init__(self, world_id: int, storage_type: StorageType, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.world_id = world_id
-    self.storage_type = storage_type
+    object.__setattr__(self, "world_id", world_id)
+    object.__setattr__(self, "storage_type", storage_type)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.STORAGE
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.world_id, self.storage_type]
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_storage(data, loaded)
   
   @staticmethod
   def identical_condition(storage_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
 def instantiate_storage(storage_data: list[Any] = [], loaded: bool = True) -> Storage:
   world_id: int = storage_data[0]
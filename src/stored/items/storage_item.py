@@ -1,6 +1,6 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.items.abstract_storage_item import *
 
 class StorageItem(AbstractStorageItem):
@@ -16,23 +16,23 @@ class StorageItem(AbstractStorageItem):
   :param loaded: Whether the object has been loaded into memory or not. Defaults to \'True\'.
   :type loaded: bool
   """
+  __slots__ = ("storage_id",)
+  FIELD_NAMES: tuple[str, ...] = ("storage_id", "item_id", "stack_size")
+
   def __init__(self, storage_id: int, item_id: int, stack_size: int = 1, loaded: bool = True) -> None:
     super().__init__(item_id, stack_size, loaded)
-    self.storage_id = storage_id
+    object.__setattr__(self, "storage_id", storage_id)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.STORAGE_ITEM
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.storage_id] + super().get_raw_data()
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_storage_item(data, loaded)
   
   @staticmethod
   def identical_condition(storage_item_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
 def instantiate_storage_item(storage_item_data: list[Any] = [], loaded: bool = True) -> StorageItem:
   storage_id: int = storage_item_data[0]
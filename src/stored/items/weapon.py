@@ -1,27 +1,27 @@
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.items.abstract_item import *
 
 class Weapon(AbstractItem):
+  __slots__ = ("item_id", "damage")
+  FIELD_NAMES: tuple[str, ...] = ("item_id", "damage")
+
   def __init__(self, item_id: int, damage: float, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.item_id = item_id
-    self.damage = damage
+    object.__setattr__(self, "item_id", item_id)
+    object.__setattr__(self, "damage", damage)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.WEAPON
 
-  def get_raw_data(self) -> list[Any]:
-    return [self.item_id, self.damage]
-
   @staticmethod
   def instantiate(weapon_data: list[Any], loaded: bool = True):
     return instantiate_weapon(weapon_data, loaded)
   
   @staticmethod
   def identical_condition(weapon_row: list[Any]) -> Condition:
-    return lambda _, row: weapon_row[0] == row[0]
+    return Eq("ItemID", weapon_row[0])
   
   # built-in methods
 
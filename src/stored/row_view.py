@@ -0,0 +1,42 @@
+from collections.abc import Sequence
+
+from tools.typing_tools import *
+
+class RowView(Sequence):
+  """
+  Read-only view of a `Stored` object as the row it is saved as (without the identifier). Fields are read from the object's attributes when they are indexed, so no list is built, and the view always reflects the object's current state.
+
+  A single view can be moved between objects of the same type with `point_to`, so that a predicate can be evaluated over a whole storage attribute without allocating anything per object.
+
+  :param field_names: The names of the attributes holding each field, in column order (see `Stored.FIELD_NAMES`).
+  :type field_names: tuple[str, ...]
+  :param stored: The object being viewed. Defaults to `None`, in which case `point_to` must be called before the view is read.
+  :type stored: Optional[Any]
+  """
+  __slots__ = ("field_names", "stored")
+
+  def __init__(self, field_names: tuple[str, ...], stored: Optional[Any] = None) -> None:
+    self.field_names: tuple[str, ...] = field_names
+    self.stored: Optional[Any] = stored
+
+  def point_to(self, stored: Any) -> Self:
+    self.stored = stored
+    return self
+
+  # sequence methods
+
+  def __getitem__(self, position: Any) -> Any:
+    if isinstance(position, slice): return [getattr(self.stored, field_name) for field_name in self.field_names[position]]
+    return getattr(self.stored, self.field_names[position])
+
+  def __len__(self) -> int: return len(self.field_names)
+
+  def __iter__(self) -> Iterator[Any]:
+    for field_name in self.field_names:
+      yield getattr(self.stored, field_name)
+
+  def __eq__(self, other: object) -> bool:
+    if not isinstance(other, Sequence) or isinstance(other, str): return False
+    return len(self) == len(other) and all(field == other_field for (field, other_field) in zip(self, other))
+
+  def __repr__(self) -> str: return f"RowView({list(self)})"
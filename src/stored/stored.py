@@ -2,7 +2,8 @@ from tools.typing_tools import *
 from tools.constants import TableName
 from tools.logging_tools import * # required for `Loggable`
 
-from database.condition import Condition
+from database.condition import *
+from stored.row_view import RowView
 
 class Stored(Loggable):
   """
@@ -10,18 +11,64 @@ class Stored(Loggable):
   
   When a new subclass is defined, the following methods must be defined for it:
   * `get_table_name() -> str` *(static method)* - gets the name of the table which the objects will be stored and loaded from.
-  * `get_raw_data(self) -> list[Any]` - gets the data of the object in the form it is stored in the `Database` object.
+  * `FIELD_NAMES: tuple[str, ...]` *(class attribute)* - the names of the attributes holding each non-identifier column of the table, in column order. Used by `get_raw_data`, `get_field` and `get_row_view` to read the object as the row it is saved as.
   * `instantiate(data: list[Any], loaded: bool = True) -> object` *(static method)* - calls an instantiation function defined outside of the function itself, providing a secondary constructor when being created using the raw data of the object. 
   * `identical_condition(_stored_row: list[Any]) -> Condition` *(static method)* - creates a `Condition` which defines what makes two objects identical.
+
+  Assigning to any attribute in `FIELD_NAMES` marks the object as changed (`is_changed`), so that `GameData.save_stored` only writes objects which differ from their row in the database. Constructors set their fields with `object.__setattr__`, which skips this check: new objects start as changed anyway, and loaded objects are marked as saved once they have been built, so checking every field of every object built would only slow down loading.
+
+  There is one object for every row of a table, so subclasses should declare `__slots__` with the names of their attributes, meaning objects don't each carry a `__dict__`. The logging configuration of slotted subclasses is shared by the whole class (see `configure_logging`). Subclasses which don't declare `__slots__` (e.g. `FightingEntity`) keep their own configuration per object.
   """
+  __slots__ = ("loaded", "is_changed")
+  FIELD_NAMES: tuple[str, ...] = ()
+  # class-level defaults of the `Loggable` attributes
+  is_logging_enabled: bool = False
+  label: Optional[str] = None
+  include_call_stack: bool = False
+  undo_log: Optional[dict[int, tuple["Stored", list[Any], bool]]] = None # set on a subclass by `GameData.transaction`, mapping the `id` of each object of it whose fields have been changed to the object, its raw data and `is_changed` from before the first change
+
   def __init__(self, loaded: bool = True, is_logging_enabled: bool = False, label: Optional[str] = None, include_call_stack: bool = False) -> None:
-    super().__init__(is_logging_enabled, label, include_call_stack)
-    self.loaded = loaded
+    if hasattr(self, "__dict__"): super().__init__(is_logging_enabled, label, include_call_stack)
+    object.__setattr__(self, "loaded", loaded)
+    object.__setattr__(self, "is_changed", True) # new objects haven't been saved; see `mark_saved`
+
+  def __setattr__(self, name: str, value: Any) -> None:
+    if name in self.FIELD_NAMES:
+      undo_log: Optional[dict[int, tuple[Stored, list[Any], bool]]] = self.undo_log
+      if undo_log != None and not id(self) in undo_log: undo_log[id(self)] = (self, self.get_raw_data(), self.is_changed)
+      object.__setattr__(self, "is_changed", True)
+    object.__setattr__(self, name, value)
+
+  def mark_saved(self) -> None:
+    """Called once the object's raw data has been written to (or read from) the database, until one of its fields is next changed."""
+    object.__setattr__(self, "is_changed", False)
+
+  def restore(self, raw_data: list[Any], is_changed: bool) -> None:
+    """Sets every field back to `raw_data` (as returned by `get_raw_data`) along with `is_changed`, e.g. when a `GameData.transaction` is rolled back."""
+    for (field_name, field) in zip(self.FIELD_NAMES, raw_data):
+      object.__setattr__(self, field_name, field)
+    object.__setattr__(self, "is_changed", is_changed)
+
+  @classmethod
+  def configure_logging(cls, is_logging_enabled: bool, label: Optional[str] = None, include_call_stack: bool = False) -> None:
+    """Sets the logging configuration of every object of `cls`, and of its subclasses unless they have been configured separately."""
+    cls.is_logging_enabled = is_logging_enabled
+    cls.label = label
+    cls.include_call_stack = include_call_stack
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.NONE
 
-  def get_raw_data(self) -> list[Any]: return []
+  def get_raw_data(self) -> list[Any]:
+    """Gets the data of the object in the form it is stored in the `Database` object. Builds a new list; use `get_field` or `get_row_view` to read fields without one."""
+    return [getattr(self, field_name) for field_name in self.FIELD_NAMES]
+
+  def get_field(self, position: int) -> Any:
+    """The field at `position` in the object's raw data."""
+    return getattr(self, self.FIELD_NAMES[position])
+
+  def get_row_view(self) -> RowView:
+    return RowView(self.FIELD_NAMES, self)
 
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
@@ -29,7 +76,7 @@ class Stored(Loggable):
   
   @staticmethod
   def identical_condition(_stored_row: list[Any]) -> Condition:
-    return lambda _, _row: False
+    return nothing()
 
 def instantiate_stored(_stored_data: list[Any] = [], loaded: bool = True) -> Stored:
   return Stored()
@@ -39,27 +86,29 @@ Subclass template:
 
 from tools.typing_tools import *
 
-from database.condition import Condition
+from database.condition import *
 from stored.stored import *
 
 class SUBCLASS(Stored):
+  __slots__ = ()
+  FIELD_NAMES: tuple[str, ...] = ()
+
   def __init__(self, loaded: bool = True) -> None:
     super().__init__(loaded)
+    # each field is set with `object.__setattr__(self, "field_name", field)`
 
   # `Stored` methods
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.
 
-  def get_raw_data(self) -> list[Any]: return []
-
   @staticmethod
   def instantiate(data: list[Any], loaded: bool = True):
     return instantiate_sub_class(data, loaded)
   
   @staticmethod
   def identical_condition(sub_class_row: list[Any]) -> Condition:
-    return lambda _, row: False
+    return nothing()
 
 def instantiate_sub_class(sub_class_data: list[Any] = [], loaded: bool = True) -> SUBCLASS:
   return SUBCLASS()
@@ -12,17 +12,17 @@ class World(Stored):
   :param name: The unique name of the world.
   :type name: str
   """
+  __slots__ = ("user_id", "name")
+  FIELD_NAMES: tuple[str, ...] = ("user_id", "name")
+
   def __init__(self, user_id: int, name: str, loaded: bool = True) -> None:
     super().__init__(loaded)
-    self.user_id = user_id
-    self.name = name
+    object.__setattr__(self, "user_id", user_id)
+    object.__setattr__(self, "name", name)
 
   @staticmethod
   def get_table_name() -> TableName: return TableName.WORLD
 
-  def get_raw_data(self) -> list[Any]:
-    return super().get_raw_data() + [self.user_id, self.name]
-  
   @staticmethod
   def instantiate(world_data: list[Any], loaded: bool = True):
     return instantiate_world(world_data, loaded)
@@ -0,0 +1,97 @@
+from math import inf
+
+from tools.typing_tools import *
+from tools.generation_tools import random
+from tools.constants import Constants, DecisionMakingConstants
+from tools.decision_tools import clip, calculate_health_aggressiveness, calculate_ignited_aggressiveness, calculate_damage_resistance_aggressiveness
+
+try:
+  import numpy as np
+except ImportError: # NumPy is optional; without it, every wave is decided in pure Python
+  np = None
+
+NO_ACTION_OFFENSIVENESS: float = inf
+"Used in an offensiveness table for an action which a fighting enemy can't take, so that it is never chosen."
+
+def is_vectorised(wave_size: int) -> bool:
+  """
+  Whether a wave of fighting enemies is decided with NumPy arrays, which is only the case for waves of at least `Constants.MIN_VECTORISED_WAVE_SIZE` if NumPy is installed. Smaller waves are faster to decide in pure Python, which gives exactly the same results as deciding for one fighting enemy at a time.
+  """
+  return np != None and wave_size >= Constants.MIN_VECTORISED_WAVE_SIZE
+
+# decision error
+
+def generate_decision_errors(error_bounds: list[float]) -> list[float]:
+  """Generates the decision error of each fighting enemy, drawing from the random state in the same order (and with the same rounding) as `generate_decision_error` would for each in turn."""
+  return [round(random.uniform(-1*error_bound, error_bound), Constants.DEFAULT_ROUNDING_ACCURACY) for error_bound in error_bounds]
+
+# aggressiveness calculations
+
+def calculate_aggressiveness_values(healths: list[float], max_healths: list[float], remaining_ignition_durations: list[Optional[int]], damage_resistances: list[float], is_pierced: list[bool], parry_aggressiveness: float, negative_character_value: float, decision_errors: list[float], error_bounds: list[float]) -> list[float]:
+  """
+  The equivalent of `FightingEnemy.calculate_aggressiveness` for a whole wave of fighting enemies at once. Each list holds one item for each fighting enemy, in the same order.
+
+  :param parry_aggressiveness: The aggressiveness from the character's parry (see `calculate_parry_aggressiveness`), which is the same for every fighting enemy.
+  :type parry_aggressiveness: float
+  :param negative_character_value: The negated aggressiveness of the character, which is the same for every fighting enemy.
+  :type negative_character_value: float
+  :return: The aggressiveness of each fighting enemy, with its decision error added and clipped to its error bound.
+  :rtype: list[float]
+  """
+  if is_vectorised(len(healths)): return calculate_aggressiveness_values_vectorised(healths, max_healths, remaining_ignition_durations, damage_resistances, is_pierced, parry_aggressiveness, negative_character_value, decision_errors, error_bounds)
+  n: float = DecisionMakingConstants.HEALTH_WEIGHT+DecisionMakingConstants.IGNITED_WEIGHT+DecisionMakingConstants.DAMAGE_RESISTANCE_WEIGHT+DecisionMakingConstants.PARRY_WEIGHT+DecisionMakingConstants.PLAYER_WEIGHT
+  aggressiveness_values: list[float] = []
+  for i in range(len(healths)):
+    (health, max_health) = (healths[i], max_healths[i])
+    total: float = 0
+    total += calculate_health_aggressiveness(health, max_health)*DecisionMakingConstants.HEALTH_WEIGHT
+    total += calculate_ignited_aggressiveness(health, max_health, remaining_ignition_durations[i])*DecisionMakingConstants.IGNITED_WEIGHT
+    total += calculate_damage_resistance_aggressiveness(damage_resistances[i], is_pierced[i])*DecisionMakingConstants.DAMAGE_RESISTANCE_WEIGHT
+    total += parry_aggressiveness*DecisionMakingConstants.PARRY_WEIGHT
+    total += negative_character_value * DecisionMakingConstants.PLAYER_WEIGHT
+    error_bound: float = error_bounds[i]
+    aggressiveness_values.append(clip(total / n + decision_errors[i], -error_bound, error_bound))
+  return aggressiveness_values
+
+def calculate_aggressiveness_values_vectorised(healths: list[float], max_healths: list[float], remaining_ignition_durations: list[Optional[int]], damage_resistances: list[float], is_pierced: list[bool], parry_aggressiveness: float, negative_character_value: float, decision_errors: list[float], error_bounds: list[float]) -> list[float]:
+  """The NumPy version of `calculate_aggressiveness_values`, with the same arguments. Agrees with it to within floating point rounding."""
+  n: float = DecisionMakingConstants.HEALTH_WEIGHT+DecisionMakingConstants.IGNITED_WEIGHT+DecisionMakingConstants.DAMAGE_RESISTANCE_WEIGHT+DecisionMakingConstants.PARRY_WEIGHT+DecisionMakingConstants.PLAYER_WEIGHT
+  health_array = np.array(healths, dtype=float)
+  max_health_array = np.array(max_healths, dtype=float)
+  duration_array = np.array([np.nan if duration == None else duration for duration in remaining_ignition_durations], dtype=float)
+  bound_array = np.array(error_bounds, dtype=float)
+  # the same expressions as in `decision_tools`, applied to every fighting enemy at once
+  health_aggressiveness = health_array * (2 / max_health_array) - 1
+  ignited_m = (1 / 2*max_health_array) * (duration_array / Constants.IGNITE_DURATION - (1 / 5*max_health_array))
+  ignited_c = - (duration_array / 2*Constants.IGNITE_DURATION)
+  ignited_aggressiveness = np.where(np.isnan(duration_array), 0.1, ignited_m*health_array + ignited_c)
+  damage_resistance_aggressiveness = np.where(np.array(is_pierced, dtype=bool), DecisionMakingConstants.PIERCE_OFFENSIVENESS, np.exp2(np.array(damage_resistances, dtype=float))-1)
+  total = health_aggressiveness*DecisionMakingConstants.HEALTH_WEIGHT
+  total += ignited_aggressiveness*DecisionMakingConstants.IGNITED_WEIGHT
+  total += damage_resistance_aggressiveness*DecisionMakingConstants.DAMAGE_RESISTANCE_WEIGHT
+  total += parry_aggressiveness*DecisionMakingConstants.PARRY_WEIGHT
+  total += negative_character_value * DecisionMakingConstants.PLAYER_WEIGHT
+  aggressiveness = np.clip(total / n + np.array(decision_errors, dtype=float), -bound_array, bound_array)
+  return aggressiveness.tolist()
+
+# choosing actions
+
+def choose_action_indexes(aggressiveness_values: list[float], offensiveness_table: list[list[float]]) -> list[int]:
+  """
+  The equivalent of `FightingEnemy.choose_action_name` for each fighting enemy: the index of the action whose offensiveness is closest to the fighting enemy's aggressiveness, with the earliest action chosen in a tie.
+
+  :param offensiveness_table: The offensiveness of each action for each fighting enemy, with every row in the same order of actions. An action a fighting enemy can't take has an offensiveness of `NO_ACTION_OFFENSIVENESS`.
+  :type offensiveness_table: list[list[float]]
+  """
+  if is_vectorised(len(aggressiveness_values)):
+    deviations = np.square(np.array(aggressiveness_values, dtype=float)[:, np.newaxis] - np.array(offensiveness_table, dtype=float))
+    return np.argmin(deviations, axis=1).tolist()
+  action_indexes: list[int] = []
+  for (aggressiveness, offensiveness_row) in zip(aggressiveness_values, offensiveness_table):
+    chosen_index: int = 0
+    chosen_deviation: float = pow(aggressiveness - offensiveness_row[0], 2)
+    for i in range(1, len(offensiveness_row)):
+      deviation: float = pow(aggressiveness - offensiveness_row[i], 2)
+      if deviation < chosen_deviation: (chosen_index, chosen_deviation) = (i, deviation)
+    action_indexes.append(chosen_index)
+  return action_indexes
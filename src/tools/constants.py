@@ -70,6 +70,7 @@ class Constants:
   STRUCTURE_ENCOUNTER_PROBABILITY: float = 0.55
   MIN_STRUCTURE_ITEM_COUNT: int = 1
   MAX_STRUCTURE_ITEM_COUNT: int = 2
+  MIN_VECTORISED_WAVE_SIZE: int = 256 # the fewest fighting enemies whose actions are decided with NumPy (if installed) rather than in pure Python. The enemy grid (`GRID_WIDTH` by `GRID_HEIGHT`) holds at most 9, so in the game every wave is decided in pure Python; NumPy is only used for larger waves, e.g. from callers with larger grids
   # misc
   DEFAULT_ROUNDING_ACCURACY: int = 2
   INTERFACE_ROUNDING_ACCURACY: int = 1
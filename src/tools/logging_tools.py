@@ -117,6 +117,8 @@ def format_iterable(iterable: Iterable, start_character: str = "[", end_characte
 # classes
 
 class Loggable():
+  __slots__ = () # allows subclasses to be slotted (see `Stored`)
+
   def __init__(self, is_logging_enabled: bool, label: Optional[str] = None, include_call_stack: bool = False) -> None:
     self.is_logging_enabled: bool = is_logging_enabled
     self.label: Optional[str] = label